@@ -46,7 +46,7 @@ class BlogPostAdmin(admin.ModelAdmin):
     ]
     list_editable = ['is_featured', 'is_published']
     prepopulated_fields = {'slug': ('title',)}
-    readonly_fields = ['created_at', 'updated_at', 'view_count', 'preview_image']
+    readonly_fields = ['created_at', 'updated_at', 'view_count', 'word_count', 'reading_time', 'preview_image']
     date_hierarchy = 'published_date'
     
     fieldsets = (
@@ -70,7 +70,7 @@ class BlogPostAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
         ('Engagement', {
-            'fields': ('view_count',),
+            'fields': ('view_count', 'word_count', 'reading_time'),
             'classes': ('collapse',)
         }),
         ('Timestamps', {
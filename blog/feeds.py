@@ -1,52 +1,189 @@
 """
-RSS feed for blog posts.
+RSS and Atom feeds for blog posts.
 
-This module provides RSS feed functionality for blog posts.
+This module provides the RSS feed (excerpts), a full-content Atom feed and
+per-category variants of both.
+
+Feed readers poll constantly, so feeds are served through cached_feed():
+the XML is rendered once and stored in the shared cache until a blog post
+changes (the ``blogpost:list`` or ``feed`` page-cache tag is purged), and responses
+carry ETag and Last-Modified headers so unchanged polls get a 304.
 """
 
+import hashlib
+import time
+from functools import wraps
+
 from django.contrib.syndication.views import Feed
-from django.urls import reverse
-from .models import BlogPost
+from django.http import Http404, HttpResponse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date
+from core.cache import CacheNamespace, get_ttl
+from core.page_cache import get_tag_versions, tags_are_current
+from core.publishing import cap_timeout
+from .models import BlogPost, CATEGORIES
+
+
+feed_cache = CacheNamespace('feeds', timeout=None)
+
+# Page-cache tags a feed depends on; purging any re-renders the feed
+FEED_TAGS = ['blogpost:list', 'feed']
+
+# Entries per feed
+FEED_SIZE = 20
 
 
 class LatestBlogPostsFeed(Feed):
     """
     RSS feed for latest blog posts.
-    
+
     Provides RSS feed of published blog posts for subscribers and aggregators.
+    Pass a ``category`` URL argument to limit the feed to one category.
     """
-    title = 'Tawi Meridian Insights & Blog'
-    link = '/insights/'
     description = 'Latest insights, analysis, and thought leadership from Tawi Meridian.'
-    
-    def items(self):
+
+    def get_object(self, request, category=None):
+        """Return the category (value, label) the feed is limited to, if any."""
+        if category is None:
+            return None
+        labels = dict(CATEGORIES)
+        if category not in labels:
+            raise Http404('Unknown blog category.')
+        return (category, labels[category])
+
+    def title(self, obj):
+        """Return feed title, with the category when limited to one."""
+        if obj:
+            return f'Tawi Meridian Insights & Blog: {obj[1]}'
+        return 'Tawi Meridian Insights & Blog'
+
+    def link(self, obj):
+        """Return the blog list URL for the feed."""
+        if obj:
+            return f'/insights/?category={obj[0]}'
+        return '/insights/'
+
+    def items(self, obj):
         """Return published blog posts."""
-        return BlogPost.objects.filter(
+        queryset = BlogPost.objects.filter(
             is_published=True,
             published_date__lte=timezone.now()
-        ).order_by('-published_date')[:20]
-    
+        )
+        if obj:
+            queryset = queryset.filter(category=obj[0])
+        return queryset.order_by('-published_date')[:FEED_SIZE]
+
     def item_title(self, item):
         """Return post title."""
         return item.title
-    
+
     def item_description(self, item):
         """Return post excerpt."""
         return item.excerpt
-    
+
     def item_pubdate(self, item):
         """Return publication date."""
         return item.published_date
-    
+
+    def item_updateddate(self, item):
+        """Return last modification date."""
+        return item.updated_at
+
     def item_author_name(self, item):
         """Return author name."""
         return item.author
-    
+
     def item_link(self, item):
         """Return absolute URL to post."""
         return item.get_absolute_url()
-    
+
     def item_categories(self, item):
         """Return post category as a list."""
         return [item.get_category_display()]
+
+
+class FullContentAtom1Feed(Atom1Feed):
+    """Atom feed generator writing each entry's full HTML as <content>."""
+
+    def add_item_elements(self, handler, item):
+        super().add_item_elements(handler, item)
+        if item.get('content'):
+            handler.addQuickElement('content', item['content'], {'type': 'html'})
+
+
+class FullContentAtomFeed(LatestBlogPostsFeed):
+    """
+    Atom feed carrying the full rendered content of each post.
+
+    Entries keep the excerpt as <summary> and add the post's stored
+    content_html as <content>.
+    """
+    feed_type = FullContentAtom1Feed
+
+    def subtitle(self, obj):
+        """Atom uses subtitle for the feed description."""
+        return self.description
+
+    def item_extra_kwargs(self, item):
+        """Pass the rendered post body to the generator."""
+        return {'content': item.content_html}
+
+
+def get_feed_cache_key(request, feed, kwargs):
+    """Return the cache key for a feed rendered for ``request``."""
+    return (
+        feed.__class__.__name__,
+        request.scheme,
+        request.get_host(),
+        tuple(sorted(kwargs.items())),
+    )
+
+
+def cached_feed(feed):
+    """
+    Wrap a Feed instance in a view serving stored XML with conditional GET.
+
+    Usage:
+        path('feed/', cached_feed(LatestBlogPostsFeed()), name='blog_feed')
+    """
+    @wraps(feed.__call__)
+    def view(request, *args, **kwargs):
+        key = get_feed_cache_key(request, feed, kwargs)
+        entry = feed_cache.get(key)
+
+        if entry is None or not tags_are_current(entry['tags']):
+            # Read tag versions first so a change during rendering is not lost
+            tags = get_tag_versions(FEED_TAGS)
+            response = feed(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            etag = '"{}"'.format(hashlib.sha256(response.content).hexdigest()[:32])
+            # Keep Last-Modified when re-rendering produced identical XML
+            if entry is not None and entry['etag'] == etag:
+                last_modified = entry['last_modified']
+            else:
+                last_modified = int(time.time())
+            entry = {
+                'content': response.content,
+                'content_type': response['Content-Type'],
+                'etag': etag,
+                'last_modified': last_modified,
+                'tags': tags,
+            }
+            feed_cache.set(key, entry, cap_timeout(None))
+
+        response = get_conditional_response(
+            request,
+            etag=entry['etag'],
+            last_modified=entry['last_modified'],
+        )
+        if response is None:
+            response = HttpResponse(entry['content'], content_type=entry['content_type'])
+        response['ETag'] = entry['etag']
+        response['Last-Modified'] = http_date(entry['last_modified'])
+        # Pollers must not keep the feed past the next scheduled post
+        patch_cache_control(response, public=True, max_age=cap_timeout(get_ttl('default')))
+        return response
+    return view
@@ -0,0 +1,17 @@
+"""
+Management command to recompute related posts for the whole blog.
+
+Usage: python manage.py rebuild_related_posts
+"""
+
+from django.core.management.base import BaseCommand
+from blog.related import rebuild_related_posts
+
+
+class Command(BaseCommand):
+    help = 'Recompute the TF-IDF related-post table for all blog posts'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Computing related posts...')
+        count = rebuild_related_posts()
+        self.stdout.write(self.style.SUCCESS(f'Stored {count} related-post links.'))
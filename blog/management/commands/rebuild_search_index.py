@@ -0,0 +1,25 @@
+"""
+Management command to rebuild the blog full-text search index.
+
+Usage: python manage.py rebuild_search_index
+"""
+
+from django.core.management.base import BaseCommand
+from blog.models import BlogPost
+from blog.search import get_backend, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for blog posts'
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        if backend is None:
+            self.stdout.write(self.style.WARNING(
+                'Full-text search is not supported on this database; searches use icontains.'
+            ))
+            return
+
+        self.stdout.write(f'Rebuilding {backend} search index...')
+        count = rebuild_index(BlogPost.objects.all().iterator())
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} blog posts.'))
@@ -0,0 +1,81 @@
+"""
+Management command to re-render stored blog post HTML.
+
+Run after changing the renderer (bump blog.rendering.RENDERER_VERSION).
+Rendering is CPU-bound, so posts are rendered in parallel across a process
+pool; results are written back from this process with bulk updates.
+
+Usage:
+    python manage.py render_blog_content
+    python manage.py render_blog_content --all --workers 8
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from blog.models import BlogPost
+from blog.rendering import RENDERED_FIELDS, RENDERER_VERSION, render_content
+from core.page_cache import purge_tags
+
+
+class Command(BaseCommand):
+    help = 'Re-render content_html for blog posts rendered with an older renderer'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Re-render every post, not only outdated ones'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Number of rendering processes (1 renders in this process)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Posts written per bulk update'
+        )
+
+    def handle(self, *args, **options):
+        queryset = BlogPost.objects.all()
+        if not options['all']:
+            queryset = queryset.exclude(rendered_version=RENDERER_VERSION)
+
+        rows = list(queryset.values_list('id', 'content'))
+        if not rows:
+            self.stdout.write(self.style.SUCCESS('All blog posts are up to date.'))
+            return
+
+        ids = [post_id for post_id, content in rows]
+        contents = [content for post_id, content in rows]
+        workers = max(1, options['workers'])
+        batch_size = options['batch_size']
+        self.stdout.write(f'Rendering {len(rows)} blog posts with {workers} worker(s)...')
+
+        if workers == 1:
+            results = map(render_content, contents)
+            self.save_results(ids, results, batch_size)
+        else:
+            chunksize = max(1, len(contents) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(render_content, contents, chunksize=chunksize)
+                self.save_results(ids, results, batch_size)
+
+        purge_tags('blogpost:list', *[f'blogpost:{post_id}' for post_id in ids])
+        self.stdout.write(self.style.SUCCESS(f'Rendered {len(ids)} blog posts.'))
+
+    def save_results(self, ids, results, batch_size):
+        """Write rendered fields back in batches as results arrive."""
+        batch = []
+        for post_id, rendered in zip(ids, results):
+            batch.append(BlogPost(id=post_id, **rendered))
+            if len(batch) >= batch_size:
+                BlogPost.objects.bulk_update(batch, RENDERED_FIELDS)
+                batch = []
+        if batch:
+            BlogPost.objects.bulk_update(batch, RENDERED_FIELDS)
@@ -0,0 +1,26 @@
+# Full-text search index for blog posts (see blog/search.py)
+
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    from blog.search import create_index_schema, rebuild_index
+    create_index_schema(schema_editor)
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    rebuild_index(BlogPost.objects.using(schema_editor.connection.alias).all())
+
+
+def drop_search_index(apps, schema_editor):
+    from blog.search import drop_index_schema
+    drop_index_schema(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
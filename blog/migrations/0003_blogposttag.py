@@ -0,0 +1,70 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0002_search_index"),
+        ("core", "0002_tag"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BlogPostTag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="post_tags",
+                        to="blog.blogpost",
+                    ),
+                ),
+                (
+                    "tag",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="post_tags",
+                        to="core.tag",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Blog Post Tag",
+                "verbose_name_plural": "Blog Post Tags",
+            },
+        ),
+        migrations.AddField(
+            model_name="blogpost",
+            name="normalized_tags",
+            field=models.ManyToManyField(
+                blank=True,
+                help_text="Tags parsed from the tags field (kept in sync on save)",
+                related_name="blog_posts",
+                through="blog.BlogPostTag",
+                to="core.tag",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="blogposttag",
+            index=models.Index(
+                fields=["tag", "post"], name="blog_blogpo_tag_id_bbb618_idx"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="blogposttag",
+            unique_together={("post", "tag")},
+        ),
+    ]
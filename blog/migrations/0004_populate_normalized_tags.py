@@ -0,0 +1,28 @@
+# Parse existing comma-separated tags into normalized Tag rows
+
+from django.db import migrations
+
+
+def populate_tags(apps, schema_editor):
+    from core.tags import parse_tags, get_or_create_tags
+    Tag = apps.get_model('core', 'Tag')
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    BlogPostTag = apps.get_model('blog', 'BlogPostTag')
+
+    links = []
+    for post in BlogPost.objects.exclude(tags='').only('id', 'tags'):
+        for tag in get_or_create_tags(Tag, parse_tags(post.tags)):
+            links.append(BlogPostTag(post_id=post.id, tag_id=tag.id))
+    BlogPostTag.objects.bulk_create(links, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0003_blogposttag"),
+        ("core", "0002_tag"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0004_populate_normalized_tags"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RelatedPost",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "score",
+                    models.FloatField(
+                        help_text="Cosine similarity between the two posts"
+                    ),
+                ),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_links",
+                        to="blog.blogpost",
+                    ),
+                ),
+                (
+                    "related",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="blog.blogpost",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Related Post",
+                "verbose_name_plural": "Related Posts",
+                "indexes": [
+                    models.Index(
+                        fields=["post", "-score"], name="blog_relate_post_id_890554_idx"
+                    )
+                ],
+                "unique_together": {("post", "related")},
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Compute the related-post table for existing posts
+
+from django.db import migrations
+
+
+def populate_related(apps, schema_editor):
+    from blog.related import rebuild_related_posts
+    rebuild_related_posts(
+        apps.get_model('blog', 'BlogPost'),
+        apps.get_model('blog', 'RelatedPost'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0005_relatedpost"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_related, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0006_populate_related_posts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blogpost",
+            name="content_html",
+            field=models.TextField(
+                blank=True,
+                editable=False,
+                help_text="Sanitized HTML rendered from content",
+            ),
+        ),
+        migrations.AddField(
+            model_name="blogpost",
+            name="reading_time",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, help_text="Estimated reading time in minutes"
+            ),
+        ),
+        migrations.AddField(
+            model_name="blogpost",
+            name="rendered_version",
+            field=models.PositiveSmallIntegerField(
+                default=0,
+                editable=False,
+                help_text="Renderer version used for content_html",
+            ),
+        ),
+        migrations.AddField(
+            model_name="blogpost",
+            name="toc_html",
+            field=models.TextField(
+                blank=True,
+                editable=False,
+                help_text="Table of contents linking to heading anchors",
+            ),
+        ),
+        migrations.AddField(
+            model_name="blogpost",
+            name="word_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Number of words in the rendered content",
+            ),
+        ),
+    ]
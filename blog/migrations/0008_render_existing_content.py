@@ -0,0 +1,25 @@
+# Render stored HTML for existing posts
+
+from django.db import migrations
+
+
+def render_existing(apps, schema_editor):
+    from blog.rendering import RENDERED_FIELDS, render_content
+    BlogPost = apps.get_model('blog', 'BlogPost')
+
+    posts = list(BlogPost.objects.only('id', 'content'))
+    for post in posts:
+        for field, value in render_content(post.content).items():
+            setattr(post, field, value)
+    BlogPost.objects.bulk_update(posts, RENDERED_FIELDS, batch_size=200)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0007_rendered_content"),
+    ]
+
+    operations = [
+        migrations.RunPython(render_existing, migrations.RunPython.noop),
+    ]
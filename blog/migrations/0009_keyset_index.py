@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0008_render_existing_content"),
+        ("core", "0002_tag"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="blogpost",
+            index=models.Index(
+                fields=["is_published", "-published_date", "-id"],
+                name="blog_blogpo_is_publ_aa98b3_idx",
+            ),
+        ),
+    ]
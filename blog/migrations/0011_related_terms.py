@@ -0,0 +1,85 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0010_image_renditions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BlogTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=100, unique=True)),
+                (
+                    "document_count",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Number of posts containing the term"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Blog Term",
+                "verbose_name_plural": "Blog Terms",
+            },
+        ),
+        migrations.CreateModel(
+            name="BlogPostTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=100)),
+                (
+                    "count",
+                    models.PositiveIntegerField(
+                        help_text="Field-weighted occurrences in the post"
+                    ),
+                ),
+                (
+                    "weight",
+                    models.FloatField(
+                        default=0,
+                        help_text="Normalized TF-IDF weight in the post vector",
+                    ),
+                ),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="terms",
+                        to="blog.blogpost",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Blog Post Term",
+                "verbose_name_plural": "Blog Post Terms",
+                "indexes": [
+                    models.Index(
+                        fields=["term", "post"], name="blog_blogpo_term_657e17_idx"
+                    )
+                ],
+                "unique_together": {("post", "term")},
+            },
+        ),
+    ]
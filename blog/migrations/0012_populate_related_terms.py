@@ -0,0 +1,24 @@
+# Store term counts and document frequencies for existing posts
+
+from django.db import migrations
+
+
+def populate_terms(apps, schema_editor):
+    from blog.related import rebuild_related_posts
+    rebuild_related_posts(
+        apps.get_model('blog', 'BlogPost'),
+        apps.get_model('blog', 'RelatedPost'),
+        apps.get_model('blog', 'BlogTerm'),
+        apps.get_model('blog', 'BlogPostTerm'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0011_related_terms"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_terms, migrations.RunPython.noop),
+    ]
@@ -8,6 +8,8 @@ from django.db import models
 from django.urls import reverse
 from django.utils.text import slugify
 from django.contrib.contenttypes.fields import GenericRelation
+from core.tags import sync_tags
+from .rendering import RENDERED_FIELDS, render_content
 
 
 # Blog categories
@@ -58,6 +60,33 @@ class BlogPost(models.Model):
         help_text='Full post content (supports markdown or HTML)'
     )
     
+    # Rendered content (built from content on save by blog.rendering)
+    content_html = models.TextField(
+        blank=True,
+        editable=False,
+        help_text='Sanitized HTML rendered from content'
+    )
+    toc_html = models.TextField(
+        blank=True,
+        editable=False,
+        help_text='Table of contents linking to heading anchors'
+    )
+    word_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text='Number of words in the rendered content'
+    )
+    reading_time = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text='Estimated reading time in minutes'
+    )
+    rendered_version = models.PositiveSmallIntegerField(
+        default=0,
+        editable=False,
+        help_text='Renderer version used for content_html'
+    )
+    
     # Categorization
     category = models.CharField(
         max_length=50,
@@ -70,6 +99,13 @@ class BlogPost(models.Model):
         blank=True,
         help_text='Comma-separated tags (e.g., "renewable energy, climate, Kenya")'
     )
+    normalized_tags = models.ManyToManyField(
+        'core.Tag',
+        through='BlogPostTag',
+        related_name='blog_posts',
+        blank=True,
+        help_text='Tags parsed from the tags field (kept in sync on save)'
+    )
     
     # Visual Elements
     featured_image = models.ImageField(
@@ -78,6 +114,12 @@ class BlogPost(models.Model):
         null=True,
         help_text='Featured image for post'
     )
+    renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text='Responsive image derivatives by image field (maintained by core.images)'
+    )
     
     # Status & Display
     is_published = models.BooleanField(
@@ -123,16 +165,29 @@ class BlogPost(models.Model):
             models.Index(fields=['category', 'is_published']),
             models.Index(fields=['is_featured', 'is_published']),
             models.Index(fields=['published_date', 'is_published']),
+            models.Index(fields=['is_published', '-published_date', '-id']),
         ]
 
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
-        """Auto-generate slug if not provided."""
+        """Auto-generate slug, render content and sync normalized tags."""
         if not self.slug:
             self.slug = slugify(self.title)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content' in update_fields:
+            self.render_content()
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | set(RENDERED_FIELDS)
         super().save(*args, **kwargs)
+        if update_fields is None or 'tags' in update_fields:
+            sync_tags(self, self.tags)
+
+    def render_content(self):
+        """Rebuild content_html, toc_html, word_count and reading_time from content."""
+        for field, value in render_content(self.content).items():
+            setattr(self, field, value)
 
     def get_absolute_url(self):
         """Return URL to blog post detail page."""
@@ -156,9 +211,14 @@ class BlogPost(models.Model):
         return []
 
     def increment_view_count(self):
-        """Increment view count (for analytics)."""
-        self.view_count += 1
-        self.save(update_fields=['view_count'])
+        """
+        Count a view (for analytics).
+
+        Views are buffered in the worker and added to view_count in
+        batches by core.counters.
+        """
+        from core.counters import record_view
+        record_view(self)
 
 
 class BlogImage(models.Model):
@@ -173,6 +233,12 @@ class BlogImage(models.Model):
         related_name='images'
     )
     image = models.ImageField(upload_to='blog/images/')
+    renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text='Responsive image derivatives by image field (maintained by core.images)'
+    )
     caption = models.CharField(max_length=200, blank=True)
     alt_text = models.CharField(
         max_length=200,
@@ -196,3 +262,90 @@ class BlogImage(models.Model):
         elif not self.alt_text:
             self.alt_text = f'{self.blog_post.title} - Image {self.display_order}'
         super().save(*args, **kwargs)
+
+
+class BlogPostTag(models.Model):
+    """
+    Through-table linking blog posts to normalized tags.
+
+    Indexed on (tag, post) for tag filters and related-post lookups.
+    """
+    post = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='post_tags')
+    tag = models.ForeignKey('core.Tag', on_delete=models.CASCADE, related_name='post_tags')
+
+    class Meta:
+        verbose_name = 'Blog Post Tag'
+        verbose_name_plural = 'Blog Post Tags'
+        unique_together = ['post', 'tag']
+        indexes = [
+            models.Index(fields=['tag', 'post']),
+        ]
+
+    def __str__(self):
+        return f'{self.post.title} - {self.tag.name}'
+
+
+class RelatedPost(models.Model):
+    """
+    Precomputed related-post link with its TF-IDF cosine similarity.
+
+    Rows are maintained by blog.related; indexed on (post, -score) so a
+    detail page reads its best matches with one query.
+    """
+    post = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='related_links')
+    related = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField(help_text='Cosine similarity between the two posts')
+
+    class Meta:
+        verbose_name = 'Related Post'
+        verbose_name_plural = 'Related Posts'
+        unique_together = ['post', 'related']
+        indexes = [
+            models.Index(fields=['post', '-score']),
+        ]
+
+    def __str__(self):
+        return f'{self.post.title} -> {self.related.title} ({self.score:.3f})'
+
+
+class BlogTerm(models.Model):
+    """
+    Document frequency of one term across all blog posts.
+
+    Maintained by blog.related alongside BlogPostTerm, so saving a post can
+    weigh its terms without re-reading the rest of the corpus.
+    """
+    term = models.CharField(max_length=100, unique=True)
+    document_count = models.PositiveIntegerField(default=0, help_text='Number of posts containing the term')
+
+    class Meta:
+        verbose_name = 'Blog Term'
+        verbose_name_plural = 'Blog Terms'
+
+    def __str__(self):
+        return f'{self.term} ({self.document_count})'
+
+
+class BlogPostTerm(models.Model):
+    """
+    One term of a post with its weighted count and TF-IDF vector weight.
+
+    Every term of the post is stored (for document frequencies); ``weight``
+    is zero for terms outside the post's vector. Indexed on (term, post) so
+    the posts sharing a term are found without scanning the corpus.
+    """
+    post = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='terms')
+    term = models.CharField(max_length=100)
+    count = models.PositiveIntegerField(help_text='Field-weighted occurrences in the post')
+    weight = models.FloatField(default=0, help_text='Normalized TF-IDF weight in the post vector')
+
+    class Meta:
+        verbose_name = 'Blog Post Term'
+        verbose_name_plural = 'Blog Post Terms'
+        unique_together = ['post', 'term']
+        indexes = [
+            models.Index(fields=['term', 'post']),
+        ]
+
+    def __str__(self):
+        return f'{self.post.title} - {self.term} ({self.weight:.3f})'
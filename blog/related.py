@@ -0,0 +1,316 @@
+"""
+Related-post index for the blog.
+
+Related posts are precomputed with TF-IDF cosine similarity over title,
+excerpt, content and tags, and stored in the RelatedPost table so a detail
+page loads them with one indexed query.
+
+Vectors are sparse term -> weight dicts; each document keeps only its
+highest-weighted terms. Every post's term counts and vector weights are
+stored in BlogPostTerm and the document frequency of each term in
+BlogTerm, so saving a post only tokenizes that post: its vector is
+weighed against the stored document frequencies and scored against the
+posts sharing one of its terms, found through the (term, post) index.
+
+Other posts keep the weights computed when they were last indexed, so
+their IDF drifts slowly as the corpus grows; rebuild_related_posts
+recomputes everything from scratch, scoring one post at a time against an
+in-memory inverted index of the vectors.
+
+- rebuild_related_posts() recomputes every row (manage.py rebuild_related_posts)
+- update_related_posts(post) refreshes the rows involving one post on save
+- remove_post_terms(post) updates document frequencies before a delete
+"""
+
+
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+
+from django.db import connection, transaction
+from django.db.models import F
+
+
+# Number of related posts stored per post
+RELATED_PER_POST = 6
+
+# Terms kept per document vector (highest TF-IDF weight first)
+MAX_TERMS_PER_DOCUMENT = 64
+
+# Longer tokens (hashes, URLs run together) are not indexed
+MAX_TERM_LENGTH = 100
+
+# Terms per query when looking up stored terms
+LOOKUP_BATCH_SIZE = 500
+
+# Rows per statement when a rebuild inserts every post's terms
+INSERT_BATCH_SIZE = 5000
+
+# How many times each field's terms are counted
+FIELD_WEIGHTS = {
+    'title': 3,
+    'tags': 3,
+    'excerpt': 2,
+    'content': 1,
+}
+
+STOP_WORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before
+being below between both but by can could did do does doing down during each few
+for from further had has have having he her here hers him his how i if in into is
+it its itself just me more most my no nor not now of off on once only or other our
+ours out over own same she should so some such than that the their theirs them then
+there these they this those through to too under until up very was we were what
+when where which while who whom why will with would you your yours
+""".split())
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def tokenize(text):
+    """Lowercase word tokens with stop words and single characters removed."""
+    text = _TAG_RE.sub(' ', (text or '').lower())
+    return [
+        token for token in _TOKEN_RE.findall(text)
+        if 1 < len(token) <= MAX_TERM_LENGTH and token not in STOP_WORDS
+    ]
+
+
+def term_counts(document):
+    """Weighted term counts for a document dict with the FIELD_WEIGHTS keys."""
+    counts = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for token in tokenize(document.get(field)):
+            counts[token] += weight
+    return counts
+
+
+def weigh(counts, document_frequency, total):
+    """
+    L2-normalized TF-IDF vector of one document's term counts.
+
+    Args:
+        counts: {term: weighted count} of the document
+        document_frequency: {term: number of documents containing it}
+        total: Number of documents in the corpus
+    """
+    weights = {
+        term: (1 + math.log(count)) * (math.log((1 + total) / (1 + document_frequency.get(term, 1))) + 1)
+        for term, count in counts.items()
+    }
+    top = sorted(weights.items(), key=lambda item: item[1], reverse=True)[:MAX_TERMS_PER_DOCUMENT]
+    norm = math.sqrt(sum(weight * weight for term, weight in top)) or 1.0
+    return {term: weight / norm for term, weight in top}
+
+
+def document_frequencies(counts):
+    """Number of documents containing each term, from {id: term counts}."""
+    document_frequency = Counter()
+    for terms in counts.values():
+        document_frequency.update(terms.keys())
+    return document_frequency
+
+
+def similarities(vectors):
+    """
+    Cosine similarity of each post with every post sharing at least one term.
+
+    Yields (post id, {other id: score}) one post at a time, so only one row
+    of scores is held in memory.
+    """
+    postings = defaultdict(list)
+    for post_id, vector in vectors.items():
+        for term, weight in vector.items():
+            postings[term].append((post_id, weight))
+    # Terms used by a single post can't relate it to another
+    postings = {term: entries for term, entries in postings.items() if len(entries) > 1}
+
+    for post_id, vector in vectors.items():
+        scores = {}
+        get = scores.get
+        for term, weight in vector.items():
+            for other_id, other_weight in postings.get(term, ()):
+                scores[other_id] = get(other_id, 0.0) + weight * other_weight
+        scores.pop(post_id, None)
+        yield post_id, scores
+
+
+def top_related(scores, limit=RELATED_PER_POST):
+    """Return the ``limit`` best (other id, score) pairs."""
+    if len(scores) > limit:
+        # Only scores tied with the limit-th best or above can make the list
+        cutoff = heapq.nlargest(limit, scores.values())[-1]
+        scores = {other_id: score for other_id, score in scores.items() if score >= cutoff}
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+
+def load_documents(post_model):
+    """Load the indexed fields of every post as plain dicts."""
+    return {
+        row['id']: row
+        for row in post_model.objects.values('id', *FIELD_WEIGHTS.keys())
+    }
+
+
+def _batches(items, size=LOOKUP_BATCH_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def post_term_rows(post_term_model, post_id, counts, vector):
+    """Unsaved BlogPostTerm rows for every term of one post."""
+    return [
+        post_term_model(post_id=post_id, term=term, count=count, weight=vector.get(term, 0.0))
+        for term, count in counts.items()
+    ]
+
+
+def insert_post_terms(post_term_model, rows):
+    """
+    Insert (post id, term, count, weight) tuples into the BlogPostTerm table.
+
+    A rebuild writes every term of every post; executemany skips building
+    a model instance per row.
+    """
+    quote = connection.ops.quote_name
+    columns = ', '.join(
+        quote(post_term_model._meta.get_field(name).column) for name in ('post', 'term', 'count', 'weight')
+    )
+    sql = f'INSERT INTO {quote(post_term_model._meta.db_table)} ({columns}) VALUES (%s, %s, %s, %s)'
+    with connection.cursor() as cursor:
+        for batch in _batches(rows, INSERT_BATCH_SIZE):
+            cursor.executemany(sql, batch)
+
+
+def rebuild_related_posts(post_model=None, related_model=None, term_model=None, post_term_model=None):
+    """
+    Recompute the related-post table, term counts and document frequencies
+    for the whole corpus.
+
+    The model arguments allow the function to run with historical models
+    inside migrations; without the term models only RelatedPost is
+    written. Returns the number of related-post rows written.
+    """
+    if post_model is None:
+        from .models import (
+            BlogPost as post_model, BlogPostTerm as post_term_model, BlogTerm as term_model,
+            RelatedPost as related_model,
+        )
+
+    counts = {post_id: term_counts(document) for post_id, document in load_documents(post_model).items()}
+    document_frequency = document_frequencies(counts)
+    vectors = {post_id: weigh(terms, document_frequency, len(counts)) for post_id, terms in counts.items()}
+
+    rows = []
+    for post_id, scores in similarities(vectors):
+        for related_id, score in top_related(scores):
+            rows.append(related_model(post_id=post_id, related_id=related_id, score=score))
+
+    with transaction.atomic():
+        related_model.objects.all().delete()
+        related_model.objects.bulk_create(rows, batch_size=1000)
+        if term_model is not None:
+            term_model.objects.all().delete()
+            term_model.objects.bulk_create(
+                [term_model(term=term, document_count=count) for term, count in document_frequency.items()],
+                batch_size=1000,
+            )
+            post_term_model.objects.all().delete()
+            insert_post_terms(post_term_model, (
+                (post_id, term, count, vectors[post_id].get(term, 0.0))
+                for post_id, terms in counts.items()
+                for term, count in terms.items()
+            ))
+    return len(rows)
+
+
+def adjust_document_frequencies(added=(), removed=()):
+    """Count a post's new terms in BlogTerm and uncount the ones it lost."""
+    from .models import BlogTerm
+
+    if added:
+        BlogTerm.objects.bulk_create([BlogTerm(term=term) for term in added], ignore_conflicts=True)
+        for terms in _batches(added):
+            BlogTerm.objects.filter(term__in=terms).update(document_count=F('document_count') + 1)
+    for terms in _batches(removed):
+        BlogTerm.objects.filter(term__in=terms).update(document_count=F('document_count') - 1)
+        BlogTerm.objects.filter(term__in=terms, document_count=0).delete()
+
+
+def remove_post_terms(post):
+    """Uncount the terms of a post about to be deleted."""
+    from .models import BlogPostTerm
+
+    with transaction.atomic():
+        adjust_document_frequencies(
+            removed=BlogPostTerm.objects.filter(post_id=post.pk).values_list('term', flat=True)
+        )
+
+
+def update_related_posts(post):
+    """
+    Refresh the stored terms of ``post`` and the related-post rows involving it.
+
+    Only the saved post is tokenized and weighed. Replaces the post's own
+    related list and inserts, updates or removes the post in the related
+    lists of the posts sharing a term with it or listing it before.
+    """
+    from .models import BlogPost, BlogPostTerm, BlogTerm, RelatedPost
+
+    counts = term_counts({field: getattr(post, field) for field in FIELD_WEIGHTS})
+
+    with transaction.atomic():
+        old_terms = set(BlogPostTerm.objects.filter(post_id=post.pk).values_list('term', flat=True))
+        adjust_document_frequencies(added=set(counts) - old_terms, removed=old_terms - set(counts))
+
+        document_frequency = {}
+        for terms in _batches(counts):
+            document_frequency.update(BlogTerm.objects.filter(term__in=terms).values_list('term', 'document_count'))
+        vector = weigh(counts, document_frequency, BlogPost.objects.count())
+
+        BlogPostTerm.objects.filter(post_id=post.pk).delete()
+        BlogPostTerm.objects.bulk_create(post_term_rows(BlogPostTerm, post.pk, counts, vector), batch_size=1000)
+
+        # Cosine similarity with the posts sharing one of the vector's terms
+        scores = defaultdict(float)
+        postings = (
+            BlogPostTerm.objects.filter(term__in=list(vector), weight__gt=0)
+            .exclude(post_id=post.pk)
+            .values_list('post_id', 'term', 'weight')
+        )
+        for other_id, term, weight in postings:
+            scores[other_id] += vector[term] * weight
+
+        # Posts that listed the saved post before
+        previously_listing = set(
+            RelatedPost.objects.filter(related_id=post.pk).exclude(post_id=post.pk).values_list('post_id', flat=True)
+        )
+
+        # Those posts' current lists, without the saved post
+        current = defaultdict(dict)
+        listed = RelatedPost.objects.filter(post_id__in=set(scores) | previously_listing).exclude(related_id=post.pk)
+        for row in listed.values('post_id', 'related_id', 'score'):
+            current[row['post_id']][row['related_id']] = row['score']
+
+        changed = {}
+        for other_id, score in scores.items():
+            candidates = dict(current[other_id])
+            candidates[post.pk] = score
+            best = top_related(candidates)
+            if post.pk in dict(best):
+                changed[other_id] = best
+        for other_id in previously_listing - set(changed):
+            changed[other_id] = top_related(current[other_id])
+
+        rows = [
+            RelatedPost(post_id=post.pk, related_id=related_id, score=score)
+            for related_id, score in top_related(scores)
+        ]
+        for other_id, best in changed.items():
+            rows.extend(RelatedPost(post_id=other_id, related_id=related_id, score=score) for related_id, score in best)
+
+        RelatedPost.objects.filter(post_id__in=[post.pk] + list(changed)).delete()
+        RelatedPost.objects.bulk_create(rows, batch_size=1000)
@@ -0,0 +1,87 @@
+"""
+Render-once HTML for blog post content.
+
+BlogPost.content is written in Markdown (raw HTML is allowed inline). It is
+converted once when the post is saved and stored in ``content_html``,
+together with a table of contents, word count and reading time, so the
+detail page outputs stored HTML without any per-request processing.
+
+The output is sanitized with nh3, so only a safe subset of HTML survives.
+Headings get stable ``id`` anchors, which the table of contents links to.
+
+render_content() is a pure function of the source text so that
+``manage.py render_blog_content`` can fan it out across a process pool.
+Bump RENDERER_VERSION whenever the output changes; the command re-renders
+every post stored with an older version.
+"""
+
+import math
+import re
+
+import markdown
+import nh3
+
+
+# Stored with each post; bump when render_content() output changes
+RENDERER_VERSION = 1
+
+WORDS_PER_MINUTE = 200
+
+# BlogPost fields written by render_content()
+RENDERED_FIELDS = ['content_html', 'toc_html', 'word_count', 'reading_time', 'rendered_version']
+
+MARKDOWN_EXTENSIONS = ['extra', 'sane_lists', 'toc']
+
+# Headings keep their anchors; code blocks keep language classes
+ALLOWED_TAGS = set(nh3.ALLOWED_TAGS)
+ALLOWED_ATTRIBUTES = {tag: set(attrs) for tag, attrs in nh3.ALLOWED_ATTRIBUTES.items()}
+for _heading in ('h1', 'h2', 'h3', 'h4', 'h5', 'h6'):
+    ALLOWED_ATTRIBUTES.setdefault(_heading, set()).add('id')
+ALLOWED_ATTRIBUTES['a'] = ALLOWED_ATTRIBUTES.get('a', set()) | {'title'}
+ALLOWED_ATTRIBUTES['img'] = ALLOWED_ATTRIBUTES.get('img', set()) | {'title'}
+ALLOWED_ATTRIBUTES['code'] = {'class'}
+ALLOWED_ATTRIBUTES['div'] = {'class'}
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def sanitize(html):
+    """Strip any markup outside the allowed tags and attributes."""
+    return nh3.clean(html, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES)
+
+
+def count_words(html):
+    """Count words in rendered HTML, ignoring markup."""
+    return len(_WORD_RE.findall(_TAG_RE.sub(' ', html)))
+
+
+def render_content(text):
+    """
+    Render post content.
+
+    Returns a dict with content_html, toc_html, word_count, reading_time
+    (minutes) and rendered_version, matching the BlogPost fields.
+    """
+    md = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+    html = sanitize(md.convert(text or ''))
+
+    # A table of contents is only useful with at least two headings
+    toc_html = ''
+    if sum(1 for token in _flatten(md.toc_tokens)) >= 2:
+        toc_html = sanitize(md.toc)
+
+    word_count = count_words(html)
+    return {
+        'content_html': html,
+        'toc_html': toc_html,
+        'word_count': word_count,
+        'reading_time': max(1, math.ceil(word_count / WORDS_PER_MINUTE)) if word_count else 0,
+        'rendered_version': RENDERER_VERSION,
+    }
+
+
+def _flatten(tokens):
+    for token in tokens:
+        yield token
+        yield from _flatten(token['children'])
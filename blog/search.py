@@ -0,0 +1,236 @@
+"""
+Full-text search for blog posts.
+
+Posts are indexed in a side table kept in sync on save and delete:
+
+- SQLite: an FTS5 virtual table ``blog_blogpost_fts`` ranked with bm25()
+- PostgreSQL: ``blog_blogpost_search`` holding a weighted tsvector with a
+  GIN index, ranked with ts_rank()
+
+Fields are weighted title > tags > excerpt > author > content. Other
+database backends fall back to the previous ``icontains`` filtering.
+
+The index is created by migration 0002; ``manage.py rebuild_search_index``
+repopulates it from scratch.
+"""
+
+import re
+
+from django.db import connection
+from django.db.models import Case, When, Value, IntegerField, Q
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+
+FTS_TABLE = 'blog_blogpost_fts'
+PG_TABLE = 'blog_blogpost_search'
+
+# Maximum number of ranked results returned for one query
+RESULT_LIMIT = 200
+
+# Column weights: title, excerpt, content, tags, author
+SQLITE_WEIGHTS = (10.0, 3.0, 1.0, 5.0, 2.0)
+PG_WEIGHTS = {'title': 'A', 'tags': 'B', 'excerpt': 'B', 'author': 'C', 'content': 'D'}
+
+# Placeholders marking matches inside snippets, replaced after escaping
+_MARK_START = '\x02'
+_MARK_END = '\x03'
+
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def get_backend():
+    """Return 'sqlite', 'postgresql' or None when full-text search is unavailable."""
+    if connection.vendor in ('sqlite', 'postgresql'):
+        return connection.vendor
+    return None
+
+
+# Schema
+
+def create_index_schema(schema_editor):
+    """Create the search index table for the connection's backend."""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+            f"USING fts5(title, excerpt, content, tags, author, tokenize='porter unicode61')"
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            f"CREATE TABLE IF NOT EXISTS {PG_TABLE} ("
+            f"post_id bigint PRIMARY KEY REFERENCES blog_blogpost(id) ON DELETE CASCADE "
+            f"DEFERRABLE INITIALLY DEFERRED, "
+            f"document tsvector NOT NULL)"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {PG_TABLE}_document_gin ON {PG_TABLE} USING GIN (document)"
+        )
+
+
+def drop_index_schema(schema_editor):
+    """Drop the search index table."""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+    elif vendor == 'postgresql':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {PG_TABLE}')
+
+
+# Indexing
+
+def _document(post):
+    return [post.title, post.excerpt, post.content, post.tags, post.author]
+
+
+def index_post(post):
+    """Add or replace ``post`` in the search index."""
+    backend = get_backend()
+    if backend is None:
+        return
+    with connection.cursor() as cursor:
+        if backend == 'sqlite':
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post.pk])
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, excerpt, content, tags, author) '
+                f'VALUES (%s, %s, %s, %s, %s, %s)',
+                [post.pk] + _document(post)
+            )
+        else:
+            vector = ' || '.join(
+                f"setweight(to_tsvector('english', coalesce(%s, '')), '{weight}')"
+                for weight in PG_WEIGHTS.values()
+            )
+            values = [getattr(post, field) for field in PG_WEIGHTS]
+            cursor.execute(
+                f'INSERT INTO {PG_TABLE} (post_id, document) VALUES (%s, {vector}) '
+                f'ON CONFLICT (post_id) DO UPDATE SET document = EXCLUDED.document',
+                [post.pk] + values
+            )
+
+
+def remove_post(post_id):
+    """Remove a post from the search index."""
+    backend = get_backend()
+    if backend == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_id])
+    elif backend == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {PG_TABLE} WHERE post_id = %s', [post_id])
+
+
+def rebuild_index(posts):
+    """
+    Replace the whole index with ``posts``.
+
+    Returns the number of posts indexed.
+    """
+    backend = get_backend()
+    if backend is None:
+        return 0
+    with connection.cursor() as cursor:
+        table = FTS_TABLE if backend == 'sqlite' else PG_TABLE
+        cursor.execute(f'DELETE FROM {table}')
+    count = 0
+    for post in posts:
+        index_post(post)
+        count += 1
+    return count
+
+
+# Querying
+
+def _sqlite_match_expression(query):
+    """Turn user input into a safe FTS5 expression: every term, prefix-matched."""
+    terms = _TERM_RE.findall(query)
+    return ' '.join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+
+
+def _format_snippet(raw):
+    """Escape a snippet and turn match placeholders into <mark> tags."""
+    text = escape(raw or '')
+    return mark_safe(text.replace(_MARK_START, '<mark>').replace(_MARK_END, '</mark>'))
+
+
+def ranked_matches(query, limit=None, candidates=None):
+    """
+    Run a ranked full-text query.
+
+    ``candidates`` is an optional BlogPost queryset (e.g. published posts
+    only) the matches are restricted to inside the ranked query, before
+    the limit applies, so drafts can't crowd visible posts out of the top
+    ``limit``.
+
+    Returns up to ``limit`` (default RESULT_LIMIT) (post_id, snippet)
+    tuples, best match first, or None if the database has no full-text
+    backend.
+    """
+    backend = get_backend()
+    if backend is None:
+        return None
+    limit = RESULT_LIMIT if limit is None else limit
+
+    restriction, restriction_params = '', []
+    if candidates is not None:
+        subquery, restriction_params = candidates.order_by().values('pk').query.sql_with_params()
+        column = 'rowid' if backend == 'sqlite' else 's.post_id'
+        restriction = f'AND {column} IN ({subquery}) '
+
+    with connection.cursor() as cursor:
+        if backend == 'sqlite':
+            expression = _sqlite_match_expression(query)
+            if not expression:
+                return []
+            weights = ', '.join(str(weight) for weight in SQLITE_WEIGHTS)
+            cursor.execute(
+                f"SELECT rowid, snippet({FTS_TABLE}, -1, %s, %s, '…', 24) "
+                f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s {restriction}"
+                f"ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT %s",
+                [_MARK_START, _MARK_END, expression, *restriction_params, limit]
+            )
+        else:
+            cursor.execute(
+                f"SELECT s.post_id, ts_headline('english', p.excerpt || ' ' || p.content, q, %s) "
+                f"FROM {PG_TABLE} s JOIN blog_blogpost p ON p.id = s.post_id, "
+                f"websearch_to_tsquery('english', %s) q "
+                f"WHERE s.document @@ q {restriction}"
+                f"ORDER BY ts_rank(s.document, q) DESC LIMIT %s",
+                [
+                    f'StartSel={_MARK_START}, StopSel={_MARK_END}, MaxFragments=1, MaxWords=30, MinWords=10',
+                    query,
+                    *restriction_params,
+                    limit,
+                ]
+            )
+        return [(post_id, _format_snippet(snippet)) for post_id, snippet in cursor.fetchall()]
+
+
+def search_posts(queryset, query):
+    """
+    Filter and order ``queryset`` by full-text relevance to ``query``.
+
+    The ranked query only considers rows of ``queryset``, so its filters
+    (published, tag, ...) apply before the result limit.
+
+    Returns (queryset, snippets) where snippets maps post id to a
+    highlighted, HTML-safe excerpt.
+    """
+    matches = ranked_matches(query, candidates=queryset)
+    if matches is None:
+        queryset = queryset.filter(
+            Q(title__icontains=query) |
+            Q(excerpt__icontains=query) |
+            Q(content__icontains=query) |
+            Q(tags__icontains=query) |
+            Q(author__icontains=query)
+        )
+        return queryset, {}
+
+    ids = [post_id for post_id, snippet in matches]
+    ranking = Case(
+        *[When(pk=post_id, then=Value(position)) for position, post_id in enumerate(ids)],
+        output_field=IntegerField(),
+    ) if ids else Value(0, output_field=IntegerField())
+    queryset = queryset.filter(pk__in=ids).annotate(search_rank=ranking).order_by('search_rank')
+    return queryset, dict(matches)
@@ -0,0 +1,44 @@
+"""
+Signal handlers for blog app.
+
+Keeps the full-text search index and the related-post table in sync
+with blog posts.
+"""
+
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from .models import BlogPost
+from .related import FIELD_WEIGHTS, remove_post_terms, update_related_posts
+from .search import index_post, remove_post
+
+
+@receiver(post_save, sender=BlogPost)
+def update_search_index(sender, instance, raw=False, **kwargs):
+    """Index the saved post."""
+    if raw:
+        # Skip fixture loading; run rebuild_search_index afterwards
+        return
+    index_post(instance)
+
+
+@receiver(post_save, sender=BlogPost)
+def update_related(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Recompute related posts involving the saved post when its text changed."""
+    if raw:
+        # Skip fixture loading; run rebuild_related_posts afterwards
+        return
+    if update_fields is not None and not set(update_fields) & set(FIELD_WEIGHTS):
+        return
+    update_related_posts(instance)
+
+
+@receiver(pre_delete, sender=BlogPost)
+def remove_related_terms(sender, instance, **kwargs):
+    """Uncount the deleted post's terms before its BlogPostTerm rows cascade."""
+    remove_post_terms(instance)
+
+
+@receiver(post_delete, sender=BlogPost)
+def remove_from_search_index(sender, instance, **kwargs):
+    """Remove the deleted post from the index."""
+    remove_post(instance.pk)
@@ -0,0 +1,358 @@
+"""
+Tests for the blog app.
+"""
+
+import random
+import time
+from datetime import timedelta
+from importlib import import_module
+from io import StringIO
+from unittest import mock
+
+from django.apps import apps
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core import counters
+from core.generic import QueryBudgetExceeded
+
+from .models import BlogImage, BlogPost, BlogPostTag, BlogPostTerm, BlogTerm, RelatedPost
+from .related import RELATED_PER_POST, rebuild_related_posts, update_related_posts
+from .rendering import RENDERER_VERSION, render_content
+from .search import ranked_matches, search_posts
+from .views import BlogPostDetailView
+
+
+def create_post(title, **kwargs):
+    kwargs.setdefault('excerpt', title)
+    kwargs.setdefault('content', f'{title} content')
+    kwargs.setdefault('is_published', True)
+    kwargs.setdefault('published_date', timezone.now())
+    return BlogPost.objects.create(title=title, **kwargs)
+
+
+@override_settings(QUERY_BUDGET_MODE='raise', PAGE_CACHE_ENABLED=False)
+class BlogPostDetailQueryTests(TestCase):
+    def setUp(self):
+        self.addCleanup(counters.take_pending_counts)
+        self.post = create_post(
+            'Watershed modeling for county planners',
+            content='Hydrology, watershed runoff and stormwater modeling.',
+            tags='hydrology, stormwater, modeling',
+        )
+        for order in range(3):
+            BlogImage.objects.create(blog_post=self.post, image=f'blog/images/figure-{order}.jpg', display_order=order)
+        for index in range(5):
+            create_post(
+                f'Stormwater study {index}',
+                content='Stormwater runoff and watershed hydrology.',
+                tags='hydrology, stormwater',
+            )
+
+    def test_detail_stays_within_query_budget(self):
+        response = self.client.get(self.post.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['images']), 3)
+        self.assertEqual(len(response.context['related_posts']), 3)
+        self.assertEqual(len(response.context['recent_posts']), 5)
+
+    def test_exceeding_budget_raises(self):
+        BlogPostDetailView.query_budget = 1
+        self.addCleanup(setattr, BlogPostDetailView, 'query_budget', 4)
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get(self.post.get_absolute_url())
+
+    def test_unpublished_post_is_not_found(self):
+        post = create_post('Draft', is_published=False)
+        self.assertEqual(self.client.get(post.get_absolute_url()).status_code, 404)
+
+
+class RelatedPostTests(TestCase):
+    def setUp(self):
+        self.hydrology = [
+            create_post(f'Stormwater study {index}', content='Stormwater runoff and watershed hydrology.')
+            for index in range(3)
+        ]
+        self.finance = create_post('Grant budgeting', content='Indirect cost rates for federal grants.')
+
+    def related_ids(self, post):
+        return set(RelatedPost.objects.filter(post=post).values_list('related_id', flat=True))
+
+    def document_counts(self):
+        return dict(BlogTerm.objects.values_list('term', 'document_count'))
+
+    def test_posts_sharing_terms_are_related(self):
+        first, second, third = self.hydrology
+        self.assertEqual(self.related_ids(first), {second.pk, third.pk})
+        self.assertEqual(self.related_ids(third), {first.pk, second.pk})
+        self.assertEqual(self.related_ids(self.finance), set())
+
+    def test_edit_moves_post_between_lists(self):
+        first, second, third = self.hydrology
+        third.title = third.excerpt = 'Grant budgeting for stormwater utilities'
+        third.content = 'Indirect cost rates for federal grants.'
+        third.save()
+        self.assertIn(third.pk, self.related_ids(self.finance))
+        self.assertIn(self.finance.pk, self.related_ids(third))
+
+        third.title = third.excerpt = 'Grant reporting'
+        third.save()
+        self.assertNotIn(third.pk, self.related_ids(first))
+        self.assertNotIn(third.pk, self.related_ids(second))
+
+    def test_document_frequencies_follow_edits_and_deletes(self):
+        first = self.hydrology[0]
+        self.assertEqual(self.document_counts()['stormwater'], 3)
+        first.content = 'Culvert sizing.'
+        first.title = first.excerpt = 'Culverts'
+        first.save()
+        self.assertEqual(self.document_counts()['stormwater'], 2)
+        self.assertEqual(self.document_counts()['culvert'], 1)
+        first.delete()
+        self.assertNotIn('culvert', self.document_counts())
+
+        incremental = self.document_counts()
+        rebuild_related_posts()
+        self.assertEqual(self.document_counts(), incremental)
+
+    def test_last_saved_vector_matches_rebuild(self):
+        # Earlier posts keep the weights of their own save until a rebuild
+        post = self.finance
+        stored = dict(BlogPostTerm.objects.filter(post=post).values_list('term', 'weight'))
+        rebuild_related_posts()
+        rebuilt = dict(BlogPostTerm.objects.filter(post=post).values_list('term', 'weight'))
+        self.assertEqual(stored.keys(), rebuilt.keys())
+        for term, weight in rebuilt.items():
+            self.assertAlmostEqual(stored[term], weight)
+
+    def test_update_does_not_read_whole_corpus(self):
+        post = self.hydrology[0]
+        with CaptureQueriesContext(connection) as small:
+            update_related_posts(post)
+        for index in range(20):
+            create_post(f'Unrelated {index}', content=f'Topic{index} only.')
+        with CaptureQueriesContext(connection) as large:
+            update_related_posts(post)
+        self.assertEqual(len(large), len(small))
+        self.assertFalse(any('"blog_blogpost"."content"' in query['sql'] for query in large))
+
+    def test_rebuild_scales_to_thousands_of_posts(self):
+        # Zipf-distributed vocabulary, plus a few words every post uses
+        rng = random.Random(0)
+        vocabulary = [f'word{rank}' for rank in range(5000)]
+        frequencies = [1 / (rank + 1) for rank in range(len(vocabulary))]
+        common = ' '.join(['engineering', 'project', 'water', 'design'])
+        now = timezone.now()
+        BlogPost.objects.bulk_create(
+            [
+                BlogPost(
+                    title=' '.join(rng.choices(vocabulary, frequencies, k=6)),
+                    slug=f'generated-{index}',
+                    excerpt=' '.join(rng.choices(vocabulary, frequencies, k=25)),
+                    content=f"{common} {' '.join(rng.choices(vocabulary, frequencies, k=400))}",
+                    is_published=True,
+                    published_date=now,
+                )
+                for index in range(3000)
+            ],
+            batch_size=500,
+        )
+        started = time.perf_counter()
+        rebuild_related_posts()
+        elapsed = time.perf_counter() - started
+        # Every generated post shares the common words with all the others
+        generated = BlogPost.objects.filter(slug__startswith='generated-')
+        self.assertEqual(
+            RelatedPost.objects.filter(post__in=generated).count(), generated.count() * RELATED_PER_POST
+        )
+        self.assertEqual(BlogTerm.objects.get(term='engineering').document_count, 3000)
+        self.assertLess(elapsed, 60)
+
+
+class BlogSearchTests(TestCase):
+    def setUp(self):
+        self.content_match = create_post('Field notes', content='We calibrated the groundwater model in March.')
+        self.title_match = create_post('Groundwater modeling in Kisumu', content='Notes from the field.')
+        self.other = create_post('Grant writing', content='Budgets and narratives.')
+
+    def search(self, query):
+        queryset, snippets = search_posts(BlogPost.objects.all(), query)
+        return list(queryset), snippets
+
+    def test_title_matches_rank_first(self):
+        posts, snippets = self.search('groundwater')
+        self.assertEqual(posts, [self.title_match, self.content_match])
+
+    def test_terms_are_stemmed_and_prefix_matched(self):
+        self.assertEqual(set(self.search('models')[0]), {self.title_match, self.content_match})
+        self.assertEqual(self.search('ground')[0][0], self.title_match)
+
+    def test_index_follows_edits_and_deletes(self):
+        self.other.content = 'Groundwater budgets.'
+        self.other.save()
+        self.assertIn(self.other, self.search('groundwater')[0])
+        self.other.delete()
+        self.assertEqual(len(self.search('groundwater')[0]), 2)
+
+    def test_snippets_are_escaped_and_highlighted(self):
+        post = create_post('Markup', content='<script>alert(1)</script> aquifer recharge')
+        posts, snippets = self.search('aquifer')
+        self.assertEqual(posts, [post])
+        self.assertIn('<mark>aquifer</mark>', snippets[post.pk])
+        self.assertNotIn('<script>', snippets[post.pk])
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.assertEqual(self.search('"groundwater OR ( NEAR')[0], [])
+        self.assertEqual(self.search('***')[0], [])
+
+    def test_drafts_do_not_crowd_out_published_matches(self):
+        for index in range(3):
+            create_post(f'Groundwater draft {index}', is_published=False)
+        create_post('Groundwater upcoming', published_date=timezone.now() + timedelta(days=1))
+        visible = BlogPost.objects.filter(is_published=True, published_date__lte=timezone.now())
+        # Unrestricted, the unpublished title matches fill the top results
+        self.assertNotIn(self.title_match.pk, [post_id for post_id, snippet in ranked_matches('groundwater', limit=2)])
+        matches = ranked_matches('groundwater', limit=2, candidates=visible)
+        self.assertEqual([post_id for post_id, snippet in matches], [self.title_match.pk, self.content_match.pk])
+        with mock.patch('blog.search.RESULT_LIMIT', 2):
+            response = self.client.get('/insights/', {'search': 'groundwater'})
+        self.assertEqual(list(response.context['posts']), [self.title_match, self.content_match])
+
+    def test_list_view_orders_by_relevance(self):
+        response = self.client.get('/insights/', {'search': 'groundwater'})
+        self.assertEqual(list(response.context['posts']), [self.title_match, self.content_match])
+
+
+@override_settings(PAGE_CACHE_ENABLED=False)
+class CategoryFacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        create_post('Pipelines', category='engineering')
+        create_post('Bridges', category='engineering')
+        create_post('Models', category='data_science', content='Groundwater models.')
+
+    def category_counts(self, response):
+        return {option['value']: option['count'] for option in response.context['facets']['category']}
+
+    def test_counts_every_category(self):
+        response = self.client.get('/insights/', {'category': 'engineering'})
+        self.assertEqual(len(response.context['posts']), 2)
+        counts = self.category_counts(response)
+        self.assertEqual((counts['engineering'], counts['data_science'], counts['climate']), (2, 1, 0))
+
+    def test_counts_respect_search(self):
+        response = self.client.get('/insights/', {'search': 'groundwater'})
+        counts = self.category_counts(response)
+        self.assertEqual((counts['engineering'], counts['data_science']), (0, 1))
+
+
+class NormalizedTagTests(TestCase):
+    def setUp(self):
+        self.ai = create_post('Models', tags='AI, Machine Learning')
+        self.travel = create_post('Travel', tags='Kenya Air')
+
+    def test_tags_sync_on_save(self):
+        self.assertEqual(sorted(self.ai.normalized_tags.values_list('slug', flat=True)), ['ai', 'machine-learning'])
+        self.ai.tags = 'machine learning'
+        self.ai.save()
+        self.assertEqual(list(self.ai.normalized_tags.values_list('slug', flat=True)), ['machine-learning'])
+
+    def test_tag_filter_matches_whole_tags(self):
+        response = self.client.get('/insights/', {'tag': 'ai'})
+        self.assertEqual(list(response.context['posts']), [self.ai])
+        response = self.client.get('/insights/', {'tag': 'Machine learning'})
+        self.assertEqual(list(response.context['posts']), [self.ai])
+
+    def test_data_migration_links_existing_tags(self):
+        BlogPostTag.objects.all().delete()
+        migration = import_module('blog.migrations.0004_populate_normalized_tags')
+        migration.populate_tags(apps, None)
+        self.assertEqual(list(self.travel.normalized_tags.values_list('slug', flat=True)), ['kenya-air'])
+        self.assertEqual(BlogPostTag.objects.count(), 3)
+
+
+class ContentRenderingTests(TestCase):
+    def test_markdown_is_rendered_and_sanitized(self):
+        rendered = render_content('# Intro\n\nHello <script>alert(1)</script>*world*\n\n## Method\n\nText')
+        self.assertIn('<h1 id="intro">Intro</h1>', rendered['content_html'])
+        self.assertIn('<em>world</em>', rendered['content_html'])
+        self.assertNotIn('<script>', rendered['content_html'])
+        self.assertIn('href="#method"', rendered['toc_html'])
+        self.assertEqual(rendered['rendered_version'], RENDERER_VERSION)
+
+    def test_word_count_and_reading_time(self):
+        rendered = render_content('word ' * 450)
+        self.assertEqual(rendered['word_count'], 450)
+        self.assertEqual(rendered['reading_time'], 3)
+        self.assertEqual(render_content('')['reading_time'], 0)
+
+    def test_single_heading_has_no_toc(self):
+        self.assertEqual(render_content('# Only\n\nText')['toc_html'], '')
+
+    def test_stored_on_save(self):
+        post = create_post('Post', content='Some **bold** text')
+        self.assertIn('<strong>bold</strong>', post.content_html)
+        post.content = 'Plain'
+        post.save(update_fields=['content'])
+        post.refresh_from_db()
+        self.assertEqual(post.content_html, '<p>Plain</p>')
+        self.assertEqual(post.word_count, 1)
+
+    def test_command_rerenders_outdated_posts(self):
+        post = create_post('Post', content='Some **bold** text')
+        BlogPost.objects.filter(pk=post.pk).update(content_html='stale', rendered_version=0)
+        call_command('render_blog_content', workers=1, stdout=StringIO())
+        post.refresh_from_db()
+        self.assertIn('<strong>bold</strong>', post.content_html)
+        self.assertEqual(post.rendered_version, RENDERER_VERSION)
+
+    def test_data_migration_renders_existing_posts(self):
+        post = create_post('Post', content='Some **bold** text')
+        BlogPost.objects.filter(pk=post.pk).update(content_html='', word_count=0)
+        import_module('blog.migrations.0008_render_existing_content').render_existing(apps, None)
+        post.refresh_from_db()
+        self.assertIn('<strong>bold</strong>', post.content_html)
+        self.assertEqual(post.word_count, 3)
+
+
+class FeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.post = create_post('Climate finance', content='Full **content**', category='climate')
+        create_post('Bridge inspection', category='engineering')
+
+    def test_rss_and_atom(self):
+        rss = self.client.get('/insights/feed/')
+        self.assertEqual(rss.status_code, 200)
+        self.assertContains(rss, 'Climate finance')
+        atom = self.client.get('/insights/feed/atom/')
+        self.assertContains(atom, '&lt;strong&gt;content&lt;/strong&gt;')
+
+    def test_category_feeds(self):
+        response = self.client.get('/insights/feed/category/climate/')
+        self.assertContains(response, 'Climate finance')
+        self.assertNotContains(response, 'Bridge inspection')
+        self.assertEqual(self.client.get('/insights/feed/category/unknown/').status_code, 404)
+
+    def test_unchanged_feed_is_served_from_cache_with_304(self):
+        first = self.client.get('/insights/feed/')
+        with self.assertNumQueries(0):
+            cached = self.client.get('/insights/feed/')
+        self.assertEqual(cached.content, first.content)
+        not_modified = self.client.get('/insights/feed/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        not_modified = self.client.get('/insights/feed/', HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_post_change_rerenders_feed(self):
+        etag = self.client.get('/insights/feed/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.title = 'Climate finance in 2027'
+            self.post.save()
+        response = self.client.get('/insights/feed/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Climate finance in 2027')
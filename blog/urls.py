@@ -4,12 +4,17 @@ URL configuration for blog app.
 
 from django.urls import path
 from . import views
-from .feeds import LatestBlogPostsFeed
+from .feeds import LatestBlogPostsFeed, FullContentAtomFeed, cached_feed
 
 app_name = 'blog'
 
 urlpatterns = [
     path('', views.BlogListView.as_view(), name='blog_list'),
-    path('feed/', LatestBlogPostsFeed(), name='blog_feed'),
+    # Two segments, so it can't shadow a detail page's slug
+    path('cards/more/', views.BlogListMoreView.as_view(), name='blog_list_more'),
+    path('feed/', cached_feed(LatestBlogPostsFeed()), name='blog_feed'),
+    path('feed/atom/', cached_feed(FullContentAtomFeed()), name='blog_atom_feed'),
+    path('feed/category/<slug:category>/', cached_feed(LatestBlogPostsFeed()), name='blog_category_feed'),
+    path('feed/category/<slug:category>/atom/', cached_feed(FullContentAtomFeed()), name='blog_category_atom_feed'),
     path('<slug:slug>/', views.BlogPostDetailView.as_view(), name='blog_post_detail'),
 ]
@@ -4,22 +4,34 @@ Views for blog app.
 This module contains views for listing and displaying blog posts.
 """
 
-from django.views.generic import ListView, DetailView
-from django.db.models import Q
+from django.views.generic import ListView
+from django.db.models import Prefetch
 from django.utils import timezone
-from .models import BlogPost, CATEGORIES
+from core.facets import Facet, FacetSet
+from core.generic import PublicDetailView
+from core.page_cache import AnonymousPageCacheMixin
+from core.pagination import CursorPaginationMixin
+from core.tags import tag_slug
+from .models import BlogPost, BlogImage, RelatedPost, CATEGORIES
+from .search import search_posts
 
 
-class BlogListView(ListView):
+class BlogListView(CursorPaginationMixin, AnonymousPageCacheMixin, ListView):
     """
     List view for all published blog posts.
     
-    Supports filtering by category, tag, and search.
+    Supports filtering by category, tag, and search. Pages are addressed by
+    cursor (newest first); search results use numbered pages. The category
+    filter shows facet counts (see core.facets).
     """
     model = BlogPost
     template_name = 'blog/list.html'
     context_object_name = 'posts'
     paginate_by = 10
+    page_cache_tags = ['blogpost:list']
+    cursor_pagination = True
+    # Render only the post cards (HTMX "load more" requests)
+    fragment = False
     
     def get_queryset(self):
         """Filter blog posts based on query parameters."""
@@ -28,33 +40,31 @@ class BlogListView(ListView):
             published_date__lte=timezone.now()
         ).order_by('-published_date', '-created_at')
         
-        # Filter by category
-        category = self.request.GET.get('category')
-        if category:
-            queryset = queryset.filter(category=category)
-        
-        # Filter by tag
+        # Filter by tag (exact match on the normalized tag)
         tag = self.request.GET.get('tag')
         if tag:
-            queryset = queryset.filter(tags__icontains=tag)
+            queryset = queryset.filter(normalized_tags__slug=tag_slug(tag))
         
         # Filter by featured
         featured = self.request.GET.get('featured')
         if featured == 'true':
             queryset = queryset.filter(is_featured=True)
         
-        # Search functionality
+        # Search functionality (ranked full-text search)
+        self.search_snippets = {}
         search_query = self.request.GET.get('search')
         if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) |
-                Q(excerpt__icontains=search_query) |
-                Q(content__icontains=search_query) |
-                Q(tags__icontains=search_query) |
-                Q(author__icontains=search_query)
-            )
-        
-        return queryset
+            queryset, self.search_snippets = search_posts(queryset, search_query)
+        
+        # Filter by category (counted before filtering)
+        self.facets = FacetSet(
+            queryset,
+            [Facet('category', 'category', choices=CATEGORIES)],
+            self.request.GET,
+            cache_key='blog:blog_list',
+            tags=self.page_cache_tags,
+        )
+        return self.facets.apply(queryset)
     
     def get_context_data(self, **kwargs):
         """Add additional context for template."""
@@ -66,6 +76,18 @@ class BlogListView(ListView):
         context['selected_tag'] = self.request.GET.get('tag', '')
         context['search_query'] = self.request.GET.get('search', '')
         
+        # Attach highlighted search snippets to the posts on this page
+        if self.search_snippets:
+            for post in context['posts']:
+                post.search_snippet = self.search_snippets.get(post.pk)
+        
+        if self.fragment:
+            return context
+        
+        # Post counts for each category (one grouped query, cached)
+        context['facets'] = self.facets.counts()
+        context['facet_clear_queries'] = self.facets.clear_queries()
+        
         # Get featured posts for sidebar or header
         context['featured_posts'] = BlogPost.objects.filter(
             is_published=True,
@@ -88,7 +110,13 @@ class BlogListView(ListView):
         return context
 
 
-class BlogPostDetailView(DetailView):
+class BlogListMoreView(BlogListView):
+    """Next page of post cards for the blog list's "load more" button."""
+    template_name = 'blog/partials/post_cards.html'
+    fragment = True
+
+
+class BlogPostDetailView(PublicDetailView):
     """
     Detail view for individual blog posts.
     
@@ -97,8 +125,12 @@ class BlogPostDetailView(DetailView):
     model = BlogPost
     template_name = 'blog/detail.html'
     context_object_name = 'post'
-    slug_field = 'slug'
-    slug_url_kwarg = 'slug'
+    page_cache_tags = ['blogpost:list']
+    prefetch_related = [
+        Prefetch('images', queryset=BlogImage.objects.order_by('display_order')),
+    ]
+    # Post, images, related posts, recent posts
+    query_budget = 4
     
     def get_queryset(self):
         """Only show published posts."""
@@ -107,47 +139,22 @@ class BlogPostDetailView(DetailView):
             published_date__lte=timezone.now()
         )
     
-    def get_object(self, queryset=None):
-        """Get object and increment view count."""
-        obj = super().get_object(queryset)
-        # Increment view count (could be done asynchronously in production)
-        obj.increment_view_count()
-        return obj
-    
     def get_context_data(self, **kwargs):
         """Add additional context for template."""
         context = super().get_context_data(**kwargs)
-        post = self.get_object()
-        
-        # Get related images
-        context['images'] = post.images.all().order_by('display_order')
-        
-        # Get related posts (same category or shared tags)
-        related_queryset = BlogPost.objects.filter(
-            is_published=True,
-            published_date__lte=timezone.now()
-        ).exclude(id=post.id)
-        
-        # Prioritize same category, then shared tags
-        same_category = related_queryset.filter(category=post.category)
-        
-        # Get posts with shared tags
-        shared_tags = []
-        if post.tags:
-            for tag in post.tags_list:
-                shared_tags.extend(related_queryset.filter(tags__icontains=tag))
-        
-        # Combine and deduplicate
-        related = list(same_category[:2]) + list(shared_tags[:2])
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_related = []
-        for item in related:
-            if item.id not in seen:
-                seen.add(item.id)
-                unique_related.append(item)
-        
-        context['related_posts'] = unique_related[:3]
+        post = self.object
+        
+        # Get related images (prefetched)
+        context['images'] = post.images.all()
+        
+        # Get related posts (precomputed by blog.related, one indexed query)
+        context['related_posts'] = [
+            link.related for link in RelatedPost.objects.filter(
+                post=post,
+                related__is_published=True,
+                related__published_date__lte=timezone.now()
+            ).select_related('related').order_by('-score')[:3]
+        ]
         
         # Get recent posts for sidebar
         context['recent_posts'] = BlogPost.objects.filter(
@@ -6,7 +6,10 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils import timezone
-from .models import ContactSubmission, CapabilityDownload
+from core.bulk import bulk_update, stamp_if_empty
+from core.exports import export_action
+from .models import ContactSubmission, CapabilityDownload, CapabilityDownloadDaily, OutboundEmail
+from .outbox import requeue
 
 
 @admin.register(ContactSubmission)
@@ -63,7 +66,14 @@ class ContactSubmissionAdmin(admin.ModelAdmin):
         }),
     )
     
-    actions = ['mark_as_read', 'mark_as_responded', 'mark_as_unread', 'mark_as_unresponded']
+    actions = [
+        'mark_as_read',
+        'mark_as_responded',
+        'mark_as_unread',
+        'mark_as_unresponded',
+        export_action('csv'),
+        export_action('jsonl', compress=True),
+    ]
     
     def action_buttons(self, obj):
         """Display action buttons in list view."""
@@ -80,29 +90,31 @@ class ContactSubmissionAdmin(admin.ModelAdmin):
     action_buttons.short_description = 'Quick Actions'
     
     def mark_as_read(self, request, queryset):
-        """Mark selected submissions as read."""
-        for submission in queryset:
-            submission.mark_as_read()
-        self.message_user(request, f'{queryset.count()} submissions marked as read.')
+        """Mark selected submissions as read (one UPDATE; existing read times are kept)."""
+        count = bulk_update(queryset, is_read=True, read_at=stamp_if_empty('read_at', timezone.now()))
+        self.message_user(request, f'{count} submissions marked as read.')
     mark_as_read.short_description = 'Mark selected as read'
     
     def mark_as_responded(self, request, queryset):
-        """Mark selected submissions as responded."""
-        for submission in queryset:
-            submission.mark_as_responded()
-        self.message_user(request, f'{queryset.count()} submissions marked as responded.')
+        """Mark selected submissions as responded (one UPDATE; existing response times are kept)."""
+        count = bulk_update(
+            queryset,
+            is_responded=True,
+            responded_at=stamp_if_empty('responded_at', timezone.now()),
+        )
+        self.message_user(request, f'{count} submissions marked as responded.')
     mark_as_responded.short_description = 'Mark selected as responded'
     
     def mark_as_unread(self, request, queryset):
         """Mark selected submissions as unread."""
-        queryset.update(is_read=False, read_at=None)
-        self.message_user(request, f'{queryset.count()} submissions marked as unread.')
+        count = bulk_update(queryset, is_read=False, read_at=None)
+        self.message_user(request, f'{count} submissions marked as unread.')
     mark_as_unread.short_description = 'Mark selected as unread'
     
     def mark_as_unresponded(self, request, queryset):
         """Mark selected submissions as unresponded."""
-        queryset.update(is_responded=False, responded_at=None)
-        self.message_user(request, f'{queryset.count()} submissions marked as unresponded.')
+        count = bulk_update(queryset, is_responded=False, responded_at=None)
+        self.message_user(request, f'{count} submissions marked as unresponded.')
     mark_as_unresponded.short_description = 'Mark selected as unresponded'
     
     def get_queryset(self, request):
@@ -121,8 +133,7 @@ class CapabilityDownloadAdmin(admin.ModelAdmin):
         'referer_short'
     ]
     list_filter = [
-        'document_type',
-        'downloaded_at'
+        'document_type'
     ]
     search_fields = [
         'ip_address',
@@ -136,7 +147,9 @@ class CapabilityDownloadAdmin(admin.ModelAdmin):
         'referer',
         'downloaded_at'
     ]
-    date_hierarchy = 'downloaded_at'
+    # Recent rows only (see CAPABILITY_DOWNLOAD_RETENTION_DAYS); browse
+    # history by date in Daily Capability Downloads instead
+    show_full_result_count = False
     
     fieldsets = (
         ('Download Information', {
@@ -162,3 +175,96 @@ class CapabilityDownloadAdmin(admin.ModelAdmin):
     def has_change_permission(self, request, obj=None):
         """Prevent editing of download records."""
         return False
+
+
+@admin.register(CapabilityDownloadDaily)
+class CapabilityDownloadDailyAdmin(admin.ModelAdmin):
+    """Admin interface for the daily capability download totals."""
+    list_display = [
+        'date',
+        'document_type',
+        'downloads',
+        'unique_ips'
+    ]
+    list_filter = [
+        'document_type'
+    ]
+    date_hierarchy = 'date'
+    fields = ['date', 'document_type', 'downloads', 'unique_ips']
+    readonly_fields = fields
+    
+    def has_add_permission(self, request):
+        """Totals are maintained as downloads are recorded."""
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        """Prevent editing of download totals."""
+        return False
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    """Admin interface for the transactional email outbox."""
+    list_display = [
+        'subject',
+        'recipients',
+        'status',
+        'attempts',
+        'next_attempt_at',
+        'created_at',
+        'sent_at'
+    ]
+    list_filter = [
+        'status',
+        'created_at'
+    ]
+    search_fields = [
+        'subject',
+        'to',
+        'last_error'
+    ]
+    readonly_fields = [
+        'subject',
+        'body',
+        'from_email',
+        'to',
+        'reply_to',
+        'submission',
+        'status',
+        'attempts',
+        'next_attempt_at',
+        'last_error',
+        'created_at',
+        'sent_at'
+    ]
+    date_hierarchy = 'created_at'
+    
+    fieldsets = (
+        ('Message', {
+            'fields': ('subject', 'from_email', 'to', 'reply_to', 'body', 'submission')
+        }),
+        ('Delivery', {
+            'fields': ('status', 'attempts', 'next_attempt_at', 'last_error', 'created_at', 'sent_at')
+        }),
+    )
+    
+    actions = ['retry_now']
+    
+    def recipients(self, obj):
+        """Display recipient addresses."""
+        return ', '.join(obj.to)
+    recipients.short_description = 'To'
+    
+    def retry_now(self, request, queryset):
+        """Queue selected unsent emails for immediate delivery."""
+        count = requeue(queryset)
+        self.message_user(request, f'{count} emails queued for delivery.')
+    retry_now.short_description = 'Retry selected now'
+    
+    def has_add_permission(self, request):
+        """Emails are queued by the application."""
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        """Prevent editing of queued emails."""
+        return False
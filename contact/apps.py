@@ -5,3 +5,7 @@ class ContactConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'contact'
     verbose_name = 'Contact'
+
+    def ready(self):
+        # Register signal handlers
+        from . import signals  # noqa: F401
@@ -0,0 +1,319 @@
+"""
+Generated capability statement PDFs.
+
+The general, federal and international capability statements are built
+with reportlab from live Service, Certification, OfficeLocation and
+CaseStudy data. Rendering takes far too long for a request, so statements
+are built ahead of time and served from disk:
+
+    CAPABILITY_STATEMENTS_DIR/generated/federal-3fa2c9e1b04d7a58.pdf
+
+The file name carries a hash of the data and the renderer version, so a
+statement is only re-rendered when something on it changed. A small
+manifest records the current file of each statement; downloads read the
+manifest and never render.
+
+Builds run in one place: the build_capability_statements command, run by
+deploy.sh and, with --watch, as a long-lived worker
+(deployment/tawimeridian-capabilities.service) that rebuilds statements
+whose data changed. Web workers never render unless
+CAPABILITY_STATEMENTS_BACKGROUND is off, in which case a save rebuilds
+the statements once its transaction commits. Each build holds an
+exclusive file lock from reading the data to recording the manifest and
+removing superseded files, so overlapping builds can't replace a newer
+statement with an older one.
+"""
+
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+
+logger = logging.getLogger('contact')
+
+# Bump to re-render every statement after changing the layout
+RENDERER_VERSION = 1
+
+GENERATED_DIR = 'generated'
+MANIFEST_NAME = 'manifest.json'
+LOCK_NAME = '.build.lock'
+
+# Document type -> title, and the client types whose case studies it cites
+# (None: featured case studies of any client type)
+DOCUMENT_TYPES = {
+    'general': {
+        'title': 'Capability Statement',
+        'client_types': None,
+    },
+    'federal': {
+        'title': 'Federal Capability Statement',
+        'client_types': ['federal', 'state'],
+    },
+    'international': {
+        'title': 'International Capability Statement',
+        'client_types': ['international', 'foundation'],
+    },
+}
+
+PAST_PERFORMANCE_LIMIT = 4
+
+# Models whose data appears on the statements
+SOURCE_MODELS = [
+    'services.Service',
+    'core.Certification',
+    'core.OfficeLocation',
+    'portfolio.CaseStudy',
+]
+
+
+def generated_dir():
+    return settings.CAPABILITY_STATEMENTS_DIR / GENERATED_DIR
+
+
+def _excerpt(text, length=240):
+    text = ' '.join((text or '').split())
+    return text if len(text) <= length else text[:length].rsplit(' ', 1)[0] + '...'
+
+
+def collect_data(doc_type):
+    """Return the JSON-serializable content of one statement."""
+    from core.models import Certification, OfficeLocation
+    from portfolio.models import CaseStudy
+    from services.models import Service
+
+    case_studies = CaseStudy.objects.filter(published=True)
+    client_types = DOCUMENT_TYPES[doc_type]['client_types']
+    if client_types is None:
+        case_studies = case_studies.order_by('-featured', '-published_date', '-id')
+    else:
+        case_studies = case_studies.filter(client_type__in=client_types).order_by('-published_date', '-id')
+
+    return {
+        'title': DOCUMENT_TYPES[doc_type]['title'],
+        'company': settings.SITE_NAME,
+        'tagline': settings.SITE_DESCRIPTION,
+        'email': settings.CONTACT_EMAIL,
+        'services': [
+            {'title': service.title, 'description': _excerpt(service.short_description, 200)}
+            for service in Service.objects.filter(is_active=True).order_by('display_order', 'title')
+        ],
+        'past_performance': [
+            {
+                'title': case_study.title,
+                'client': case_study.client_name,
+                'client_type': case_study.get_client_type_display(),
+                'results': _excerpt(case_study.results),
+            }
+            for case_study in case_studies[:PAST_PERFORMANCE_LIMIT]
+        ],
+        'certifications': [
+            {'name': cert.name, 'number': cert.certification_number}
+            for cert in Certification.objects.filter(status='active').order_by('display_order', 'name')
+        ],
+        'offices': [
+            {'name': office.name, 'address': office.get_full_address(), 'phone': office.phone, 'email': office.email}
+            for office in OfficeLocation.objects.order_by('-is_primary', 'display_order', 'name')
+        ],
+    }
+
+
+def content_hash(data):
+    """Hash of a statement's content and the renderer version."""
+    payload = json.dumps({'version': RENDERER_VERSION, 'data': data}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def render_pdf(data, path):
+    """Render a statement's data to a PDF file at ``path``."""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+    from xml.sax.saxutils import escape
+
+    brand = colors.HexColor('#1e3a5f')
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle('StatementTitle', parent=styles['Title'], textColor=brand, spaceAfter=4)
+    heading = ParagraphStyle('StatementHeading', parent=styles['Heading2'], textColor=brand, spaceBefore=12)
+    body = ParagraphStyle('StatementBody', parent=styles['BodyText'], fontSize=9.5, leading=12)
+    muted = ParagraphStyle('StatementMuted', parent=body, textColor=colors.HexColor('#555555'))
+
+    def p(text, style=body):
+        return Paragraph(escape(text or ''), style)
+
+    story = [
+        p(data['company'], title_style),
+        p(data['title'], ParagraphStyle('StatementSubtitle', parent=styles['Heading3'], alignment=1)),
+        p(data['tagline'], ParagraphStyle('StatementTagline', parent=muted, alignment=1)),
+        Spacer(1, 0.2 * inch),
+    ]
+
+    if data['services']:
+        story.append(p('Core Competencies', heading))
+        for service in data['services']:
+            story.append(Paragraph(f'<b>{escape(service["title"])}</b> - {escape(service["description"])}', body))
+            story.append(Spacer(1, 4))
+
+    if data['past_performance']:
+        story.append(p('Past Performance', heading))
+        for project in data['past_performance']:
+            story.append(Paragraph(
+                f'<b>{escape(project["title"])}</b> ({escape(project["client"])}, {escape(project["client_type"])})',
+                body,
+            ))
+            story.append(p(project['results'], muted))
+            story.append(Spacer(1, 4))
+
+    if data['certifications']:
+        story.append(p('Certifications', heading))
+        rows = [[p(cert['name']), p(cert['number'], muted)] for cert in data['certifications']]
+        table = Table(rows, colWidths=[4.5 * inch, 2.5 * inch])
+        table.setStyle(TableStyle([('LINEBELOW', (0, 0), (-1, -1), 0.25, colors.lightgrey)]))
+        story.append(table)
+
+    story.append(p('Contact', heading))
+    for office in data['offices']:
+        details = ' | '.join(part for part in [office['address'], office['phone'], office['email']] if part)
+        story.append(Paragraph(f'<b>{escape(office["name"])}</b> - {escape(details)}', body))
+    story.append(p(data['email']))
+
+    document = SimpleDocTemplate(
+        str(path),
+        pagesize=letter,
+        title=f'{data["company"]} {data["title"]}',
+        author=data['company'],
+        leftMargin=0.75 * inch,
+        rightMargin=0.75 * inch,
+        topMargin=0.75 * inch,
+        bottomMargin=0.75 * inch,
+    )
+    document.build(story)
+
+
+def read_manifest():
+    """Return {doc_type: file name relative to CAPABILITY_STATEMENTS_DIR}."""
+    try:
+        with open(generated_dir() / MANIFEST_NAME) as manifest:
+            return json.load(manifest)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_atomic(path, write):
+    """Write a file via a temporary file so readers never see it half-written."""
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    os.close(fd)
+    try:
+        write(temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _record(doc_type, name):
+    manifest = read_manifest()
+    manifest[doc_type] = name
+
+    def write(temp_path):
+        with open(temp_path, 'w') as handle:
+            json.dump(manifest, handle, indent=2, sort_keys=True)
+    _write_atomic(generated_dir() / MANIFEST_NAME, write)
+
+
+@contextmanager
+def build_lock():
+    """Hold the exclusive lock serializing statement builds across processes."""
+    directory = generated_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / LOCK_NAME, 'w') as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def build_statement(doc_type, force=False):
+    """
+    Make sure the statement matching the current data exists.
+
+    Returns (relative file name, rendered) where rendered is False when an
+    up-to-date file already existed. The data is read under the build lock,
+    so the last build to record a statement always used the newest data.
+    """
+    directory = generated_dir()
+    with build_lock():
+        data = collect_data(doc_type)
+        name = f'{doc_type}-{content_hash(data)}.pdf'
+        path = directory / name
+        rendered = force or not path.exists()
+        if rendered:
+            _write_atomic(path, lambda temp_path: render_pdf(data, temp_path))
+
+        relative = f'{GENERATED_DIR}/{name}'
+        if read_manifest().get(doc_type) != relative:
+            _record(doc_type, relative)
+            # Remove superseded versions of this statement
+            for old in directory.glob(f'{doc_type}-*.pdf'):
+                if old.name != name:
+                    old.unlink(missing_ok=True)
+    return relative, rendered
+
+
+def build_all(force=False):
+    """Build every statement; returns {doc_type: (file name, rendered)}."""
+    return {doc_type: build_statement(doc_type, force=force) for doc_type in DOCUMENT_TYPES}
+
+
+def statement_path(doc_type):
+    """
+    Return the path of the PDF to serve for ``doc_type``, or None.
+
+    Prefers the generated statement; falls back to a hand-made
+    ``<doc_type>_capability_statement.pdf`` in CAPABILITY_STATEMENTS_DIR.
+    """
+    name = read_manifest().get(doc_type)
+    if name and (settings.CAPABILITY_STATEMENTS_DIR / name).exists():
+        return settings.CAPABILITY_STATEMENTS_DIR / name
+    fallback = settings.CAPABILITY_STATEMENTS_DIR / f'{doc_type}_capability_statement.pdf'
+    if fallback.exists():
+        return fallback
+    return None
+
+
+def rebuild_changed():
+    """Rebuild statements whose data changed; returns the rendered doc types."""
+    started = timezone.now()
+    results = build_all()
+    rendered = [doc_type for doc_type, (name, was_rendered) in results.items() if was_rendered]
+    if rendered:
+        seconds = (timezone.now() - started).total_seconds()
+        logger.info(f'Rendered capability statements {", ".join(rendered)} in {seconds:.1f}s')
+    return rendered
+
+
+def schedule_rebuild():
+    """
+    Rebuild changed statements after the transaction commits, unless the
+    build worker is responsible for them (CAPABILITY_STATEMENTS_BACKGROUND).
+    """
+    if settings.CAPABILITY_STATEMENTS_BACKGROUND:
+        return
+
+    def rebuild():
+        try:
+            rebuild_changed()
+        except Exception as e:
+            logger.error(f'Failed to build capability statements: {e}')
+    transaction.on_commit(rebuild)
@@ -6,9 +6,9 @@ This module defines forms for contact submissions with spam protection.
 
 from django import forms
 from django.conf import settings
-from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from .models import ContactSubmission, PROJECT_TYPES, BUDGET_RANGES
+from .outbox import enqueue
 
 # Note: Honeypot protection is handled via middleware and template tag
 # No need to add HoneypotField directly to form if using honeypot app's middleware
@@ -110,9 +110,10 @@ class ContactForm(forms.ModelForm):
 
 def send_contact_notification(submission):
     """
-    Send email notification when contact form is submitted.
+    Queue email notification when contact form is submitted.
     
-    Sends notification to both co-founders: Eric Kvale and Sharon Memoi.
+    Notifies both co-founders: Eric Kvale and Sharon Memoi. The emails are
+    delivered by the send_queued_mail worker (see contact.outbox).
     """
     try:
         # Contact email recipients (both co-founders)
@@ -149,13 +150,13 @@ IP Address: {submission.ip_address or 'Not available'}
 View in admin: https://{settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else 'localhost'}/admin/contact/contactsubmission/{submission.id}/
 """
         
-        # Send email to all recipients
-        send_mail(
+        # Queue email to all recipients (replies go to the submitter)
+        enqueue(
             subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=contact_emails,
-            fail_silently=False,
+            body=message,
+            to=contact_emails,
+            reply_to=[submission.email],
+            submission=submission,
         )
         
         # Optional: Send auto-reply to submitter
@@ -165,12 +166,12 @@ View in admin: https://{settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else
         # Log error but don't fail the form submission
         import logging
         logger = logging.getLogger('contact')
-        logger.error(f'Failed to send contact notification: {e}')
+        logger.error(f'Failed to queue contact notification: {e}')
 
 
 def send_contact_auto_reply(submission):
     """
-    Send auto-reply email to contact form submitter.
+    Queue auto-reply email to contact form submitter.
     
     Provides acknowledgment and sets expectations for response time.
     """
@@ -197,16 +198,15 @@ Engineering Climate Solutions, Building Community Resilience
 Website: https://tawimeridian.com
 """
         
-        send_mail(
+        enqueue(
             subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[submission.email],
-            fail_silently=False,
+            body=message,
+            to=[submission.email],
+            submission=submission,
         )
         
     except Exception as e:
         # Log error but don't fail the form submission
         import logging
         logger = logging.getLogger('contact')
-        logger.error(f'Failed to send auto-reply: {e}')
+        logger.error(f'Failed to queue auto-reply: {e}')
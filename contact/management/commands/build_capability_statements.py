@@ -0,0 +1,61 @@
+"""
+Management command to build the capability statement PDFs.
+
+Statements whose data hasn't changed since they were last built are kept;
+--force renders every statement again. With --watch it runs as the
+long-lived build worker (deployment/tawimeridian-capabilities.service),
+checking every --interval seconds for statements whose data changed.
+
+Usage: python manage.py build_capability_statements [--force] [--watch [--interval 60]]
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from contact.capabilities import build_all, rebuild_changed
+
+
+class Command(BaseCommand):
+    help = 'Generate the capability statement PDFs from current site data'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Render every statement even if its data is unchanged',
+        )
+        parser.add_argument(
+            '--watch',
+            action='store_true',
+            help='Keep running and rebuild statements whenever their data changes',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=60,
+            help='Seconds between data checks with --watch (default: 60)',
+        )
+
+    def handle(self, *args, **options):
+        for doc_type, (name, rendered) in build_all(force=options['force']).items():
+            state = 'rendered' if rendered else 'up to date'
+            self.stdout.write(f'  {doc_type}: {name} ({state})')
+        self.stdout.write(self.style.SUCCESS('Capability statements are current.'))
+        if not options['watch']:
+            return
+
+        self.stdout.write('Watching for changes (Ctrl+C to stop)...')
+        try:
+            while True:
+                time.sleep(options['interval'])
+                close_old_connections()
+                try:
+                    rendered = rebuild_changed()
+                except Exception as e:
+                    self.stderr.write(f'Failed to build capability statements: {e}')
+                    continue
+                if rendered:
+                    self.stdout.write(f'Rendered {", ".join(rendered)}.')
+        except KeyboardInterrupt:
+            self.stdout.write('Stopped.')
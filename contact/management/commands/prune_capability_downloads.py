@@ -0,0 +1,32 @@
+"""
+Management command to delete old capability download rows.
+
+Raw download rows older than CAPABILITY_DOWNLOAD_RETENTION_DAYS are
+deleted; the per-day totals in CapabilityDownloadDaily are kept. Buffered
+downloads of this process are written first.
+
+Usage: python manage.py prune_capability_downloads [--days N]
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from contact.tracking import flush_downloads, prune_downloads
+
+
+class Command(BaseCommand):
+    help = 'Delete capability download rows older than the retention period'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.CAPABILITY_DOWNLOAD_RETENTION_DAYS,
+            help='Keep rows from the last N days (default: CAPABILITY_DOWNLOAD_RETENTION_DAYS)',
+        )
+
+    def handle(self, *args, **options):
+        flush_downloads()
+        deleted = prune_downloads(options['days'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {deleted} capability download(s) older than {options["days"]} days.'
+        ))
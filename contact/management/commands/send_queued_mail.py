@@ -0,0 +1,64 @@
+"""
+Management command delivering queued transactional email.
+
+Runs as a long-lived worker (deployment/tawimeridian-mail.service), polling
+the outbox every --interval seconds and sending due emails in batches over
+one SMTP connection. With --once it sends what is due and exits, for use
+from cron.
+
+Usage: python manage.py send_queued_mail [--once] [--batch-size 50] [--interval 5]
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from contact.outbox import deliver_due
+
+
+class Command(BaseCommand):
+    help = 'Send queued outbound email, retrying failures with exponential backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Send the emails currently due, then exit',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Emails sent per SMTP connection (default: 50)',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Seconds between outbox polls when idle (default: 5)',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if options['once']:
+            sent = failed = 0
+            while True:
+                batch_sent, batch_failed = deliver_due(batch_size)
+                sent += batch_sent
+                failed += batch_failed
+                if batch_sent + batch_failed < batch_size:
+                    break
+            self.stdout.write(self.style.SUCCESS(f'Sent {sent} email(s), {failed} failed.'))
+            return
+
+        self.stdout.write(self.style.SUCCESS('Delivering queued email (Ctrl+C to stop)...'))
+        try:
+            while True:
+                close_old_connections()
+                sent, failed = deliver_due(batch_size)
+                if sent or failed:
+                    self.stdout.write(f'Sent {sent} email(s), {failed} failed.')
+                if sent + failed < batch_size:
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Stopped.')
@@ -81,11 +81,18 @@ class Command(BaseCommand):
             
             self.stdout.write(f'Created test submission (ID: {test_submission.id})')
             
-            # Try sending notification
+            # Queue the notification and deliver it right away
             send_contact_notification(test_submission)
+            from contact.outbox import deliver_due
+            sent, failed = deliver_due()
             
-            self.stdout.write(self.style.SUCCESS('✓ Contact form notification email sent!'))
-            self.stdout.write('Check your configured contact emails for the notification.')
+            if failed:
+                self.stdout.write(self.style.WARNING(
+                    f'✗ {failed} queued email(s) failed; see Outbound Emails in the admin.'
+                ))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'✓ Contact form notification emails sent ({sent})!'))
+                self.stdout.write('Check your configured contact emails for the notification.')
             
             # Clean up test submission (optional)
             cleanup = input('\nDelete test submission? (y/N): ').strip().lower()
@@ -0,0 +1,82 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:06
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contact", "0002_outbound_email"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CapabilityDownloadDaily",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "date",
+                    models.DateField(help_text="Day of the downloads (site time zone)"),
+                ),
+                (
+                    "document_type",
+                    models.CharField(
+                        choices=[
+                            ("general", "General Capability Statement"),
+                            ("federal", "Federal Capability Statement"),
+                            ("international", "International Capability Statement"),
+                        ],
+                        help_text="Type of capability statement downloaded",
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "downloads",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Number of downloads"
+                    ),
+                ),
+                (
+                    "unique_ips",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Estimated number of distinct IP addresses"
+                    ),
+                ),
+                (
+                    "ip_sketch",
+                    models.BinaryField(
+                        help_text="HyperLogLog registers of the IP addresses (see core.hyperloglog)"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Daily Capability Downloads",
+                "verbose_name_plural": "Daily Capability Downloads",
+                "ordering": ["-date", "document_type"],
+            },
+        ),
+        migrations.AlterField(
+            model_name="capabilitydownload",
+            name="downloaded_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name="capabilitydownload",
+            index=models.Index(
+                fields=["downloaded_at"], name="contact_cap_downloa_09c6a1_idx"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="capabilitydownloaddaily",
+            unique_together={("date", "document_type")},
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Build the daily download rollup from existing CapabilityDownload rows
+
+from django.db import migrations
+
+
+BATCH_SIZE = 2000
+
+
+def populate_rollup(apps, schema_editor):
+    from contact.tracking import update_rollup
+    CapabilityDownload = apps.get_model('contact', 'CapabilityDownload')
+    CapabilityDownloadDaily = apps.get_model('contact', 'CapabilityDownloadDaily')
+
+    downloads = CapabilityDownload.objects.only('document_type', 'ip_address', 'downloaded_at')
+    batch = []
+    for download in downloads.order_by('id').iterator(chunk_size=BATCH_SIZE):
+        batch.append(download)
+        if len(batch) >= BATCH_SIZE:
+            update_rollup(batch, CapabilityDownloadDaily)
+            batch = []
+    if batch:
+        update_rollup(batch, CapabilityDownloadDaily)
+
+
+def clear_rollup(apps, schema_editor):
+    apps.get_model('contact', 'CapabilityDownloadDaily').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contact", "0003_capability_download_rollup"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_rollup, clear_rollup),
+    ]
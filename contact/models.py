@@ -126,20 +126,27 @@ class ContactSubmission(models.Model):
             self.save(update_fields=['is_responded', 'responded_at'])
 
 
+# Capability statement document types
+CAPABILITY_DOCUMENT_TYPES = [
+    ('general', 'General Capability Statement'),
+    ('federal', 'Federal Capability Statement'),
+    ('international', 'International Capability Statement'),
+]
+
+
 class CapabilityDownload(models.Model):
     """
     Track capability statement downloads.
     
-    Used to track downloads of capability statements for analytics.
+    Used to track downloads of capability statements for analytics. Rows
+    are written in batches by contact.tracking and pruned after
+    CAPABILITY_DOWNLOAD_RETENTION_DAYS; CapabilityDownloadDaily keeps the
+    totals.
     """
     # Document Information
     document_type = models.CharField(
         max_length=50,
-        choices=[
-            ('general', 'General Capability Statement'),
-            ('federal', 'Federal Capability Statement'),
-            ('international', 'International Capability Statement'),
-        ],
+        choices=CAPABILITY_DOCUMENT_TYPES,
         default='general',
         help_text='Type of capability statement downloaded'
     )
@@ -160,8 +167,8 @@ class CapabilityDownload(models.Model):
         help_text='Referring page URL'
     )
     
-    # Timestamp
-    downloaded_at = models.DateTimeField(auto_now_add=True)
+    # Timestamp (set when the download happened, not when the batch was written)
+    downloaded_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         verbose_name = 'Capability Download'
@@ -170,7 +177,102 @@ class CapabilityDownload(models.Model):
         indexes = [
             models.Index(fields=['document_type', 'downloaded_at']),
             models.Index(fields=['ip_address', 'downloaded_at']),
+            models.Index(fields=['downloaded_at']),
         ]
 
     def __str__(self):
         return f'{self.document_type} - {self.downloaded_at.strftime("%Y-%m-%d %H:%M")}'
+
+
+class CapabilityDownloadDaily(models.Model):
+    """
+    Capability statement downloads per day and document type.
+
+    Maintained incrementally as downloads are recorded (see
+    contact.tracking) and kept after the raw rows are pruned.
+    """
+    date = models.DateField(
+        help_text='Day of the downloads (site time zone)'
+    )
+    document_type = models.CharField(
+        max_length=50,
+        choices=CAPABILITY_DOCUMENT_TYPES,
+        help_text='Type of capability statement downloaded'
+    )
+    downloads = models.PositiveIntegerField(
+        default=0,
+        help_text='Number of downloads'
+    )
+    unique_ips = models.PositiveIntegerField(
+        default=0,
+        help_text='Estimated number of distinct IP addresses'
+    )
+    ip_sketch = models.BinaryField(
+        help_text='HyperLogLog registers of the IP addresses (see core.hyperloglog)'
+    )
+
+    class Meta:
+        verbose_name = 'Daily Capability Downloads'
+        verbose_name_plural = 'Daily Capability Downloads'
+        ordering = ['-date', 'document_type']
+        unique_together = ['date', 'document_type']
+
+    def __str__(self):
+        return f'{self.document_type} - {self.date}: {self.downloads}'
+
+
+# Outbound email statuses
+EMAIL_STATUSES = [
+    ('queued', 'Queued'),
+    ('sending', 'Sending'),
+    ('sent', 'Sent'),
+    ('dead', 'Failed permanently'),
+]
+
+
+class OutboundEmail(models.Model):
+    """
+    Transactional email waiting in (or delivered from) the outbox.
+
+    Requests only insert rows; the send_queued_mail worker delivers them
+    (see contact.outbox), retrying failures with exponential backoff until
+    EMAIL_OUTBOX_MAX_ATTEMPTS is reached and the email is marked dead.
+    """
+    # Message
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    to = models.JSONField(help_text='Recipient addresses')
+    reply_to = models.JSONField(default=list, blank=True, help_text='Reply-To addresses')
+    submission = models.ForeignKey(
+        ContactSubmission,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='emails',
+        help_text='Contact submission this email is about'
+    )
+    
+    # Delivery
+    status = models.CharField(max_length=20, choices=EMAIL_STATUSES, default='queued')
+    attempts = models.PositiveIntegerField(default=0, help_text='Delivery attempts made')
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        help_text='When the worker should next try (or reclaim) this email'
+    )
+    last_error = models.TextField(blank=True, help_text='Error from the last failed attempt')
+    
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = 'Outbound Email'
+        verbose_name_plural = 'Outbound Emails'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f'{self.subject} -> {", ".join(self.to)} ({self.status})'
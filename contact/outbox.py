@@ -0,0 +1,158 @@
+"""
+Transactional email outbox.
+
+Sending mail inside a request ties up a web worker for as long as the SMTP
+server takes to answer. Instead, ``enqueue`` stores the message as an
+OutboundEmail row and returns immediately; the send_queued_mail worker
+calls ``deliver_due`` to send everything due over a single SMTP
+connection.
+
+A failed send is retried after EMAIL_OUTBOX_RETRY_DELAY * 2^(attempts - 1)
+seconds, capped at EMAIL_OUTBOX_MAX_RETRY_DELAY. After
+EMAIL_OUTBOX_MAX_ATTEMPTS failures the email is marked dead and left for
+an administrator to inspect and requeue.
+
+Workers claim emails by switching them to 'sending' with a lease, which
+counts as an attempt; an email whose worker died mid-send becomes due
+again once the lease expires.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import F
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+
+logger = logging.getLogger('contact')
+
+# How long a claimed email stays reserved for the worker sending it
+SENDING_LEASE = timedelta(minutes=10)
+
+
+def enqueue(subject, body, to, from_email=None, reply_to=None, submission=None):
+    """Queue an email for background delivery and return its OutboundEmail."""
+    return OutboundEmail.objects.create(
+        subject=subject,
+        body=body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(to),
+        reply_to=list(reply_to or []),
+        submission=submission,
+    )
+
+
+def retry_delay(attempts):
+    """Seconds to wait before the next try after ``attempts`` failures."""
+    delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** max(attempts - 1, 0)
+    return min(delay, settings.EMAIL_OUTBOX_MAX_RETRY_DELAY)
+
+
+def claim_due(limit):
+    """
+    Reserve up to ``limit`` due emails for this worker.
+
+    Returns the claimed emails. The conditional UPDATE only succeeds for
+    rows still due, so concurrent workers never claim the same email. It
+    also counts the attempt, so an email whose worker keeps dying mid-send
+    still reaches EMAIL_OUTBOX_MAX_ATTEMPTS; such emails are marked dead
+    here once their last lease expires.
+    """
+    now = timezone.now()
+    OutboundEmail.objects.filter(
+        status='sending',
+        next_attempt_at__lte=now,
+        attempts__gte=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    ).update(status='dead', last_error='The worker stopped while sending this email.')
+
+    due = OutboundEmail.objects.filter(
+        status__in=['queued', 'sending'],
+        next_attempt_at__lte=now,
+    ).order_by('next_attempt_at')
+    ids = list(due.values_list('id', flat=True)[:limit])
+    if not ids:
+        return []
+
+    lease_end = now + SENDING_LEASE
+    OutboundEmail.objects.filter(
+        id__in=ids,
+        status__in=['queued', 'sending'],
+        next_attempt_at__lte=now,
+    ).update(status='sending', next_attempt_at=lease_end, attempts=F('attempts') + 1)
+    return list(
+        OutboundEmail.objects.filter(id__in=ids, status='sending', next_attempt_at=lease_end)
+        .order_by('next_attempt_at', 'id')
+    )
+
+
+def build_message(email, connection):
+    """Return the EmailMessage for an outbox row."""
+    return EmailMessage(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email,
+        to=email.to,
+        reply_to=email.reply_to or None,
+        connection=connection,
+    )
+
+
+def record_failure(email, error):
+    """Schedule a retry for a failed email, or mark it dead (claiming counted the attempt)."""
+    email.last_error = str(error)[:2000]
+    if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        email.status = 'dead'
+        logger.error(f'Giving up on email {email.pk} after {email.attempts} attempts: {error}')
+    else:
+        email.status = 'queued'
+        email.next_attempt_at = timezone.now() + timedelta(seconds=retry_delay(email.attempts))
+        logger.warning(f'Failed to send email {email.pk} (attempt {email.attempts}): {error}')
+    email.save(update_fields=['last_error', 'status', 'next_attempt_at'])
+
+
+def deliver_due(limit=50):
+    """
+    Send up to ``limit`` due emails over one SMTP connection.
+
+    Returns (sent, failed). A connection error drops the connection; it is
+    reopened for the next email.
+    """
+    emails = claim_due(limit)
+    if not emails:
+        return 0, 0
+
+    sent = failed = 0
+    connection = get_connection()
+    try:
+        for email in emails:
+            try:
+                connection.open()
+                build_message(email, connection).send()
+            except Exception as e:
+                failed += 1
+                record_failure(email, e)
+                connection.close()
+                continue
+
+            sent += 1
+            email.status = 'sent'
+            email.sent_at = timezone.now()
+            email.last_error = ''
+            email.save(update_fields=['status', 'sent_at', 'last_error'])
+    finally:
+        connection.close()
+    return sent, failed
+
+
+def requeue(queryset):
+    """Make emails (typically dead ones) due again with a fresh attempt count."""
+    return queryset.exclude(status='sent').update(
+        status='queued',
+        attempts=0,
+        next_attempt_at=timezone.now(),
+        last_error='',
+    )
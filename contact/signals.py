@@ -0,0 +1,27 @@
+"""
+Signal handlers for contact app.
+
+Queues a rebuild of the generated capability statements whenever data
+shown on them is saved or deleted, and writes buffered capability
+downloads after requests.
+"""
+
+from django.core.signals import request_finished
+from django.db.models.signals import post_save, post_delete
+from .capabilities import SOURCE_MODELS, schedule_rebuild
+from .tracking import flush_downloads_if_due
+
+
+def capability_data_changed(sender, raw=False, **kwargs):
+    """Rebuild statements whose content changed, in the background."""
+    if raw:
+        # Skip fixture loading; run build_capability_statements afterwards
+        return
+    schedule_rebuild()
+
+
+for model in SOURCE_MODELS:
+    post_save.connect(capability_data_changed, sender=model, dispatch_uid=f'capability_save_{model}')
+    post_delete.connect(capability_data_changed, sender=model, dispatch_uid=f'capability_delete_{model}')
+
+request_finished.connect(flush_downloads_if_due, dispatch_uid='flush_capability_downloads')
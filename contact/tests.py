@@ -0,0 +1,370 @@
+"""
+Tests for the contact app.
+"""
+
+import shutil
+import smtplib
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from importlib import import_module
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.management import call_command
+from django.db import DatabaseError, connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from services.models import Service
+
+from . import capabilities, outbox, tracking
+from .forms import send_contact_notification
+from .models import CapabilityDownload, CapabilityDownloadDaily, ContactSubmission, OutboundEmail
+
+
+class CapabilityStatementTests(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        override = override_settings(CAPABILITY_STATEMENTS_DIR=Path(directory), CAPABILITY_STATEMENTS_BACKGROUND=True)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.service = Service.objects.create(
+            title='Engineering', slug='engineering', short_description='Design', full_description='Design',
+        )
+
+    def generated_files(self):
+        return sorted(path.name for path in capabilities.generated_dir().glob('federal-*.pdf'))
+
+    def test_builds_once_per_data_version(self):
+        name, rendered = capabilities.build_statement('federal')
+        self.assertTrue(rendered)
+        self.assertEqual(capabilities.read_manifest()['federal'], name)
+        self.assertTrue(capabilities.statement_path('federal').read_bytes().startswith(b'%PDF'))
+        self.assertEqual(capabilities.build_statement('federal'), (name, False))
+
+    def test_changed_data_replaces_statement(self):
+        old_name, _ = capabilities.build_statement('federal')
+        Service.objects.filter(pk=self.service.pk).update(short_description='Design and build')
+        new_name, rendered = capabilities.build_statement('federal')
+        self.assertTrue(rendered)
+        self.assertNotEqual(new_name, old_name)
+        self.assertEqual(self.generated_files(), [new_name.split('/')[1]])
+
+    def test_builds_wait_for_the_lock(self):
+        # The thread can't read the test transaction's rows; hand it the data
+        data = capabilities.collect_data('federal')
+        self.enterContext(mock.patch.object(capabilities, 'collect_data', return_value=data))
+        finished = threading.Event()
+
+        def build():
+            capabilities.build_statement('federal')
+            finished.set()
+
+        with capabilities.build_lock():
+            thread = threading.Thread(target=build)
+            thread.start()
+            # Another build (here: another thread) can't read, render or record meanwhile
+            self.assertFalse(finished.wait(0.5))
+            self.assertEqual(capabilities.read_manifest(), {})
+        thread.join()
+        self.assertTrue(finished.is_set())
+        self.assertIn('federal', capabilities.read_manifest())
+
+    def test_web_workers_leave_builds_to_the_worker(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.service.title = 'Civil Engineering'
+            self.service.save()
+        self.assertFalse(any(callback.__module__ == capabilities.__name__ for callback in callbacks))
+
+    @override_settings(CAPABILITY_STATEMENTS_BACKGROUND=False)
+    def test_builds_after_commit_without_worker(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.service.save()
+            self.assertEqual(self.generated_files(), [])
+        self.assertTrue(any(callback.__module__ == capabilities.__name__ for callback in callbacks))
+        self.assertEqual(set(capabilities.read_manifest()), set(capabilities.DOCUMENT_TYPES))
+
+
+def failing_backend(error=smtplib.SMTPException('Connection refused')):
+    return mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=error)
+
+
+@override_settings(EMAIL_OUTBOX_MAX_ATTEMPTS=3, EMAIL_OUTBOX_RETRY_DELAY=60, EMAIL_OUTBOX_MAX_RETRY_DELAY=90)
+class OutboxTests(TestCase):
+    def queue(self, subject='Hello'):
+        return outbox.enqueue(subject, 'Body', ['team@example.com'], reply_to=['client@example.com'])
+
+    def test_contact_notification_is_queued_not_sent(self):
+        submission = ContactSubmission.objects.create(
+            name='Ada', email='ada@example.com', project_type='engineering', message='Need help',
+        )
+        send_contact_notification(submission)
+        self.assertEqual(mail.outbox, [])
+        emails = OutboundEmail.objects.order_by('id')
+        self.assertEqual(len(emails), 2)
+        self.assertEqual(emails[0].reply_to, ['ada@example.com'])
+        self.assertEqual(emails[0].submission, submission)
+        self.assertEqual(emails[1].to, ['ada@example.com'])
+        self.assertTrue(all(email.status == 'queued' for email in emails))
+
+    def test_due_emails_sent_in_one_batch(self):
+        self.queue('First')
+        self.queue('Second')
+        later = self.queue('Later')
+        OutboundEmail.objects.filter(pk=later.pk).update(next_attempt_at=timezone.now() + timedelta(hours=1))
+
+        self.assertEqual(outbox.deliver_due(), (2, 0))
+        self.assertEqual(sorted(message.subject for message in mail.outbox), ['First', 'Second'])
+        self.assertEqual(mail.outbox[0].reply_to, ['client@example.com'])
+        self.assertEqual(OutboundEmail.objects.filter(status='sent', sent_at__isnull=False).count(), 2)
+        self.assertEqual(outbox.deliver_due(), (0, 0))
+
+    def test_failures_back_off_exponentially_then_die(self):
+        email = self.queue()
+        delays = []
+        for attempt in range(3):
+            OutboundEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+            with failing_backend():
+                self.assertEqual(outbox.deliver_due(), (0, 1))
+            email.refresh_from_db()
+            delays.append(round((email.next_attempt_at - timezone.now()).total_seconds()))
+
+        self.assertEqual(delays[:2], [60, 90])
+        self.assertEqual(email.status, 'dead')
+        self.assertEqual(email.attempts, 3)
+        self.assertIn('Connection refused', email.last_error)
+        self.assertEqual(outbox.deliver_due(), (0, 0))
+
+        self.assertEqual(outbox.requeue(OutboundEmail.objects.all()), 1)
+        self.assertEqual(outbox.deliver_due(), (1, 0))
+
+    def test_failed_email_does_not_block_the_batch(self):
+        self.queue('First')
+        self.queue('Second')
+        with failing_backend([smtplib.SMTPException('Rejected'), 1]) as send:
+            self.assertEqual(outbox.deliver_due(), (1, 1))
+        self.assertEqual(send.call_count, 2)
+
+    def test_claimed_emails_leased_to_one_worker(self):
+        email = self.queue()
+        self.assertEqual(outbox.claim_due(10), [email])
+        # Another worker finds nothing while the lease holds
+        self.assertEqual(outbox.claim_due(10), [])
+        OutboundEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(outbox.claim_due(10), [email])
+
+    def test_worker_crashes_count_as_attempts(self):
+        email = self.queue()
+        for attempt in range(1, 4):
+            # The worker dies after claiming; the lease then runs out
+            self.assertEqual(outbox.claim_due(10), [email])
+            email.refresh_from_db()
+            self.assertEqual(email.attempts, attempt)
+            OutboundEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(outbox.claim_due(10), [])
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'dead')
+        self.assertEqual(email.attempts, 3)
+
+    def test_command_sends_everything_due(self):
+        for index in range(5):
+            self.queue(f'Email {index}')
+        output = StringIO()
+        call_command('send_queued_mail', once=True, batch_size=2, stdout=output)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertIn('Sent 5 email(s), 0 failed.', output.getvalue())
+
+
+@override_settings(RATELIMIT_ENABLE=True)
+class ContactRateLimitTests(TestCase):
+    def test_sixth_post_in_an_hour_is_limited(self):
+        for _ in range(5):
+            self.assertEqual(self.client.post('/contact/', {}).status_code, 200)
+        response = self.client.post('/contact/', {})
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        # Viewing the form isn't limited
+        self.assertEqual(self.client.get('/contact/').status_code, 200)
+
+    def test_limit_is_per_client(self):
+        for _ in range(5):
+            self.client.post('/contact/', {})
+        self.assertEqual(self.client.post('/contact/', {}, REMOTE_ADDR='10.0.0.2').status_code, 200)
+
+
+class CapabilityDownloadTests(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        override = override_settings(CAPABILITY_STATEMENTS_DIR=Path(directory), CAPABILITY_STATEMENTS_BACKGROUND=True)
+        override.enable()
+        self.addCleanup(override.disable)
+        # Downloads are buffered; write them before the test transaction is rolled back
+        self.addCleanup(tracking.flush_downloads)
+        (Path(directory) / 'federal_capability_statement.pdf').write_bytes(b'%PDF-1.4 statement')
+
+    @override_settings(CAPABILITY_ACCEL_REDIRECT='/internal/capabilities/')
+    def test_accel_redirect_hands_file_to_nginx(self):
+        response = self.client.get('/contact/capabilities/federal/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], '/internal/capabilities/federal_capability_statement.pdf')
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertIn('attachment; filename="tawi_meridian_federal_capability_statement.pdf"', response['Content-Disposition'])
+        self.assertEqual(response.content, b'')
+
+    @override_settings(CAPABILITY_ACCEL_REDIRECT='')
+    def test_streamed_without_nginx(self):
+        response = self.client.get('/contact/capabilities/federal/')
+        self.assertFalse(response.has_header('X-Accel-Redirect'))
+        self.assertEqual(b''.join(response.streaming_content), b'%PDF-1.4 statement')
+
+    @override_settings(RATELIMIT_ENABLE=True)
+    def test_download_writes_nothing_to_the_database(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/contact/capabilities/federal/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([query['sql'] for query in queries if not query['sql'].startswith('SELECT')], [])
+
+    def test_missing_statement_is_not_found(self):
+        self.assertEqual(self.client.get('/contact/capabilities/international/').status_code, 404)
+        self.assertEqual(self.client.get('/contact/capabilities/unknown/').status_code, 404)
+
+
+@override_settings(CAPABILITY_DOWNLOAD_BATCH_SIZE=3, CAPABILITY_DOWNLOAD_FLUSH_INTERVAL=60)
+class DownloadTrackingTests(TestCase):
+    def setUp(self):
+        tracking.flush_downloads()
+        self.addCleanup(tracking.flush_downloads)
+
+    def test_downloads_buffered_until_batch_is_full(self):
+        tracking.record_download('federal', '203.0.113.1')
+        tracking.record_download('federal', '203.0.113.2')
+        tracking.flush_downloads_if_due()
+        self.assertEqual(CapabilityDownload.objects.count(), 0)
+        tracking.record_download('general', '203.0.113.1')
+        with self.assertNumQueries(6):
+            # Savepoint, one insert, the rollup lookup, a rollup row per document type, release
+            tracking.flush_downloads_if_due()
+        self.assertEqual(CapabilityDownload.objects.count(), 3)
+
+    def test_old_buffer_flushed_by_time(self):
+        tracking.record_download('federal', '203.0.113.1')
+        with mock.patch('contact.tracking.time.monotonic', return_value=time.monotonic() + 61):
+            tracking.flush_downloads_if_due()
+        self.assertEqual(CapabilityDownload.objects.count(), 1)
+
+    def test_download_view_is_buffered(self):
+        directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        (directory / 'federal_capability_statement.pdf').write_bytes(b'%PDF-1.4 statement')
+        with override_settings(CAPABILITY_STATEMENTS_DIR=directory):
+            response = self.client.get('/contact/capabilities/federal/', HTTP_USER_AGENT='Browser')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(CapabilityDownload.objects.count(), 0)
+        self.assertEqual(tracking.flush_downloads(), 1)
+        download = CapabilityDownload.objects.get()
+        self.assertEqual((download.document_type, download.ip_address, download.user_agent), ('federal', '127.0.0.1', 'Browser'))
+
+    def test_failed_flush_keeps_events(self):
+        tracking.record_download('federal', '203.0.113.1')
+        with mock.patch.object(CapabilityDownload.objects, 'bulk_create', side_effect=DatabaseError('locked')):
+            self.assertEqual(tracking.flush_downloads(), 0)
+        self.assertEqual(tracking.flush_downloads(), 1)
+        self.assertEqual(CapabilityDownloadDaily.objects.get().downloads, 1)
+
+    def test_daily_rollup_counts_downloads_and_unique_ips(self):
+        for ip_address in ['203.0.113.1', '203.0.113.2', '203.0.113.1']:
+            tracking.record_download('federal', ip_address)
+        tracking.flush_downloads()
+        tracking.record_download('federal', '203.0.113.3')
+        tracking.record_download('general', '203.0.113.1')
+        tracking.flush_downloads()
+
+        federal = CapabilityDownloadDaily.objects.get(document_type='federal')
+        self.assertEqual((federal.date, federal.downloads, federal.unique_ips), (timezone.localdate(), 4, 3))
+        self.assertEqual(CapabilityDownloadDaily.objects.get(document_type='general').downloads, 1)
+        self.assertEqual(tracking.unique_ips(CapabilityDownloadDaily.objects.all()), 3)
+
+    def test_unique_ips_merged_across_days(self):
+        yesterday = timezone.now() - timedelta(days=1)
+        with transaction.atomic():
+            tracking.update_rollup([
+                {'document_type': 'federal', 'ip_address': f'10.0.0.{index}', 'downloaded_at': yesterday}
+                for index in range(100)
+            ])
+            tracking.update_rollup([
+                {'document_type': 'federal', 'ip_address': f'10.0.0.{index}', 'downloaded_at': timezone.now()}
+                for index in range(50, 150)
+            ])
+        self.assertEqual(CapabilityDownloadDaily.objects.count(), 2)
+        self.assertAlmostEqual(tracking.unique_ips(CapabilityDownloadDaily.objects.all()), 150, delta=10)
+
+    def test_prune_keeps_rollup(self):
+        old = timezone.now() - timedelta(days=100)
+        CapabilityDownload.objects.create(document_type='federal', ip_address='203.0.113.1', downloaded_at=old)
+        CapabilityDownload.objects.create(document_type='federal', ip_address='203.0.113.2')
+        with transaction.atomic():
+            tracking.update_rollup(CapabilityDownload.objects.all())
+
+        output = StringIO()
+        call_command('prune_capability_downloads', days=90, stdout=output)
+        self.assertIn('Deleted 1 capability download(s)', output.getvalue())
+        self.assertEqual(CapabilityDownload.objects.count(), 1)
+        self.assertEqual(sum(CapabilityDownloadDaily.objects.values_list('downloads', flat=True)), 2)
+
+    def test_data_migration_builds_rollup(self):
+        for index in range(3):
+            CapabilityDownload.objects.create(document_type='general', ip_address=f'203.0.113.{index % 2}')
+        import_module('contact.migrations.0004_populate_capability_download_rollup').populate_rollup(apps, None)
+        daily = CapabilityDownloadDaily.objects.get()
+        self.assertEqual((daily.downloads, daily.unique_ips), (3, 2))
+
+
+class SubmissionBulkActionTests(TestCase):
+    url = '/admin/contact/contactsubmission/'
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        self.earlier = timezone.now() - timedelta(days=2)
+        self.read = ContactSubmission.objects.create(
+            name='Read', email='read@example.com', project_type='other', message='Hi',
+            is_read=True, read_at=self.earlier,
+        )
+        self.unread = ContactSubmission.objects.create(
+            name='Unread', email='unread@example.com', project_type='other', message='Hi',
+        )
+
+    def run_action(self, action):
+        response = self.client.post(self.url, {
+            'action': action, '_selected_action': [self.read.pk, self.unread.pk],
+        }, follow=True)
+        self.read.refresh_from_db()
+        self.unread.refresh_from_db()
+        return [str(message) for message in response.context['messages']]
+
+    def test_mark_as_read_keeps_earlier_read_times(self):
+        self.assertEqual(self.run_action('mark_as_read'), ['2 submissions marked as read.'])
+        self.assertEqual(self.read.read_at, self.earlier)
+        self.assertTrue(self.unread.is_read)
+        self.assertIsNotNone(self.unread.read_at)
+
+    def test_mark_as_responded_and_back(self):
+        self.run_action('mark_as_responded')
+        self.assertTrue(self.read.is_responded and self.unread.is_responded)
+        self.assertIsNotNone(self.unread.responded_at)
+        self.assertEqual(self.run_action('mark_as_unresponded'), ['2 submissions marked as unresponded.'])
+        self.assertFalse(self.read.is_responded)
+        self.assertIsNone(self.read.responded_at)
+
+    def test_mark_as_unread(self):
+        self.run_action('mark_as_unread')
+        self.assertFalse(self.read.is_read)
+        self.assertIsNone(self.read.read_at)
@@ -0,0 +1,188 @@
+"""
+Buffered capability download tracking.
+
+Downloads used to INSERT a CapabilityDownload row before the file was
+sent. ``record_download`` now only appends the event to a buffer in the
+worker process; after the response has been sent, the buffer is written
+with one ``bulk_create`` once it holds CAPABILITY_DOWNLOAD_BATCH_SIZE
+events or its oldest event is CAPABILITY_DOWNLOAD_FLUSH_INTERVAL seconds
+old (and when the worker exits).
+
+The same transaction folds the events into CapabilityDownloadDaily, one
+row per day and document type holding the download count and a
+HyperLogLog sketch of the downloaders' IP addresses (see
+core.hyperloglog), from which the number of unique IPs is estimated.
+Reports and the admin read the rollup, so raw rows older than
+CAPABILITY_DOWNLOAD_RETENTION_DAYS can be pruned (see the
+prune_capability_downloads command) without losing the history.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.hyperloglog import HyperLogLog
+
+
+logger = logging.getLogger('contact')
+
+# Events kept while the database is unavailable; older ones are dropped
+MAX_BUFFERED = 10000
+
+PRUNE_BATCH_SIZE = 1000
+
+_buffer = {'events': [], 'oldest': None}
+_lock = threading.Lock()
+
+
+def record_download(doc_type, ip_address, user_agent='', referer=''):
+    """Buffer one download of the ``doc_type`` capability statement."""
+    event = {
+        'document_type': doc_type,
+        'ip_address': ip_address,
+        'user_agent': user_agent[:500],
+        'referer': referer[:200],
+        'downloaded_at': timezone.now(),
+    }
+    with _lock:
+        if not _buffer['events']:
+            _buffer['oldest'] = time.monotonic()
+        _buffer['events'].append(event)
+
+
+def flush_downloads_if_due(**kwargs):
+    """
+    Write buffered downloads if the batch is full or old enough.
+
+    Connected to request_finished, so the write happens after the response
+    has been sent.
+    """
+    with _lock:
+        count = len(_buffer['events'])
+        if not count:
+            return
+        age = time.monotonic() - _buffer['oldest']
+    if count >= settings.CAPABILITY_DOWNLOAD_BATCH_SIZE or age >= settings.CAPABILITY_DOWNLOAD_FLUSH_INTERVAL:
+        flush_downloads()
+
+
+def flush_downloads():
+    """
+    Write every buffered download and update the daily rollup.
+
+    Returns the number of downloads written. On failure the events go back
+    into the buffer and are retried with the next flush.
+    """
+    with _lock:
+        events = _buffer['events']
+        _buffer['events'] = []
+        _buffer['oldest'] = None
+    if not events:
+        return 0
+
+    CapabilityDownload = apps.get_model('contact', 'CapabilityDownload')
+    try:
+        with transaction.atomic():
+            CapabilityDownload.objects.bulk_create([CapabilityDownload(**event) for event in events])
+            update_rollup(events)
+    except Exception as e:
+        with _lock:
+            _buffer['events'] = (events + _buffer['events'])[-MAX_BUFFERED:]
+            _buffer['oldest'] = time.monotonic()
+        logger.error(f'Failed to record {len(events)} capability downloads: {e}')
+        return 0
+    return len(events)
+
+
+def update_rollup(events, daily_model=None):
+    """
+    Fold download events into the per-day, per-document-type rollup.
+
+    ``events`` are dicts or objects with document_type, ip_address and
+    downloaded_at. Call inside a transaction. The model argument lets data
+    migrations pass the historical model.
+    """
+    daily_model = daily_model or apps.get_model('contact', 'CapabilityDownloadDaily')
+
+    groups = defaultdict(list)
+    for event in events:
+        if isinstance(event, dict):
+            doc_type, ip_address, downloaded_at = event['document_type'], event['ip_address'], event['downloaded_at']
+        else:
+            doc_type, ip_address, downloaded_at = event.document_type, event.ip_address, event.downloaded_at
+        groups[(timezone.localdate(downloaded_at), doc_type)].append(ip_address)
+
+    dates = {date for date, doc_type in groups}
+    existing = {
+        (row.date, row.document_type): row
+        for row in daily_model.objects.select_for_update().filter(date__in=dates)
+    }
+
+    for (date, doc_type), ips in groups.items():
+        row = existing.get((date, doc_type))
+        sketch = HyperLogLog(row.ip_sketch if row else None)
+        for ip_address in ips:
+            if ip_address:
+                sketch.add(ip_address)
+
+        if row is None:
+            daily_model.objects.create(
+                date=date,
+                document_type=doc_type,
+                downloads=len(ips),
+                unique_ips=sketch.count(),
+                ip_sketch=bytes(sketch),
+            )
+        else:
+            daily_model.objects.filter(pk=row.pk).update(
+                downloads=F('downloads') + len(ips),
+                unique_ips=sketch.count(),
+                ip_sketch=bytes(sketch),
+            )
+
+
+def unique_ips(queryset):
+    """Estimate the unique IPs across several rollup rows (e.g. a month)."""
+    sketch = HyperLogLog()
+    for registers in queryset.values_list('ip_sketch', flat=True):
+        sketch.merge(HyperLogLog(registers))
+    return sketch.count()
+
+
+def prune_downloads(days=None):
+    """
+    Delete raw download rows older than ``days`` (default:
+    CAPABILITY_DOWNLOAD_RETENTION_DAYS). Returns the number deleted.
+
+    Rows are deleted in batches to keep each transaction short; their
+    counts live on in CapabilityDownloadDaily.
+    """
+    days = settings.CAPABILITY_DOWNLOAD_RETENTION_DAYS if days is None else days
+    CapabilityDownload = apps.get_model('contact', 'CapabilityDownload')
+    cutoff = timezone.now() - timedelta(days=days)
+
+    deleted = 0
+    while True:
+        ids = list(
+            CapabilityDownload.objects.filter(downloaded_at__lt=cutoff)
+            .values_list('id', flat=True)[:PRUNE_BATCH_SIZE]
+        )
+        if not ids:
+            return deleted
+        deleted += CapabilityDownload.objects.filter(id__in=ids).delete()[0]
+
+
+@atexit.register
+def _flush_at_exit():
+    # Gunicorn workers exit normally on restarts, so the buffer isn't lost
+    if _buffer['events']:
+        flush_downloads()
@@ -7,29 +7,28 @@ This module contains views for the contact form and capability statement downloa
 from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.conf import settings
-from django.http import FileResponse, Http404
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.http import content_disposition_header
+from urllib.parse import quote
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_protect
 from django.views.decorators.cache import never_cache
-from django_ratelimit.decorators import ratelimit
+from core.ratelimit import client_ip, rate_limit
+from .capabilities import DOCUMENT_TYPES, schedule_rebuild, statement_path
 from .forms import ContactForm, send_contact_notification
-from .models import ContactSubmission, CapabilityDownload
+from .models import ContactSubmission
+from .tracking import record_download
 
 
 def get_client_ip(request):
     """Get client IP address from request."""
-    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-    if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0]
-    else:
-        ip = request.META.get('REMOTE_ADDR')
-    return ip
+    return client_ip(request)
 
 
 @require_http_methods(["GET", "POST"])
 @csrf_protect
 @never_cache
-@ratelimit(key='ip', rate='5/h', method='POST')
+@rate_limit('contact', '5/h', method='POST')
 def contact(request):
     """
     Contact form view.
@@ -49,7 +48,7 @@ def contact(request):
             submission.user_agent = request.META.get('HTTP_USER_AGENT', '')[:500]
             submission.save()
             
-            # Send email notification
+            # Queue email notification (delivered by the send_queued_mail worker)
             try:
                 send_contact_notification(submission)
             except Exception as e:
@@ -100,45 +99,49 @@ def capability_download(request, doc_type='general'):
     """
     Handle capability statement downloads.
     
-    Tracks downloads for analytics and serves the appropriate PDF.
+    Tracks downloads for analytics and serves the appropriate PDF, as
+    generated ahead of time by contact.capabilities. Rate limited by nginx
+    (limit_req), so a download never writes to the database in the request.
     
     Args:
         doc_type: Type of capability statement ('general', 'federal', 'international')
     """
     # Validate document type
-    valid_types = ['general', 'federal', 'international']
-    if doc_type not in valid_types:
+    if doc_type not in DOCUMENT_TYPES:
         raise Http404('Invalid document type')
     
-    # Track download
-    try:
-        CapabilityDownload.objects.create(
-            document_type=doc_type,
-            ip_address=get_client_ip(request),
-            user_agent=request.META.get('HTTP_USER_AGENT', '')[:500],
-            referer=request.META.get('HTTP_REFERER', '')[:200]
-        )
-    except Exception as e:
-        # Log error but don't fail the download
-        import logging
-        logger = logging.getLogger('contact')
-        logger.error(f'Failed to track capability download: {e}')
-    
-    # Determine file path
-    # In production, this would likely be stored in S3 or similar
-    file_path = settings.BASE_DIR / 'static' / 'capabilities' / f'{doc_type}_capability_statement.pdf'
+    # Track download (buffered; written in batches after the response)
+    record_download(
+        doc_type,
+        ip_address=get_client_ip(request),
+        user_agent=request.META.get('HTTP_USER_AGENT', ''),
+        referer=request.META.get('HTTP_REFERER', ''),
+    )
     
-    # Check if file exists
-    if not file_path.exists():
-        # In production, this could fetch from S3
+    # Generated statement (or a hand-made fallback); never rendered here
+    file_path = statement_path(doc_type)
+    if file_path is None:
+        # Nothing built yet: queue a build so the next download succeeds
+        schedule_rebuild()
         raise Http404('Capability statement not found')
     
+    filename = f'tawi_meridian_{doc_type}_capability_statement.pdf'
+    
+    # Behind nginx: hand the transfer (including Range requests) to nginx so
+    # a slow client doesn't hold a gunicorn worker
+    if settings.CAPABILITY_ACCEL_REDIRECT:
+        response = HttpResponse(content_type='application/pdf')
+        relative_path = file_path.relative_to(settings.CAPABILITY_STATEMENTS_DIR).as_posix()
+        response['X-Accel-Redirect'] = settings.CAPABILITY_ACCEL_REDIRECT + quote(relative_path)
+        response['Content-Disposition'] = content_disposition_header(True, filename)
+        return response
+    
     # Serve file
     try:
         return FileResponse(
             open(file_path, 'rb'),
             content_type='application/pdf',
-            filename=f'tawi_meridian_{doc_type}_capability_statement.pdf',
+            filename=filename,
             as_attachment=True
         )
     except FileNotFoundError:
@@ -3,7 +3,7 @@ Admin configuration for core models.
 """
 
 from django.contrib import admin
-from .models import SiteSetting, OfficeLocation, Certification
+from .models import SiteSetting, OfficeLocation, Certification, Tag
 
 
 @admin.register(SiteSetting)
@@ -59,3 +59,10 @@ class CertificationAdmin(admin.ModelAdmin):
             'fields': ('is_featured', 'display_order')
         }),
     )
+
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    """Admin interface for normalized tags."""
+    list_display = ['name', 'slug']
+    search_fields = ['name', 'slug']
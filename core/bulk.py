@@ -0,0 +1,68 @@
+"""
+Set-based bulk updates for admin actions.
+
+Looping over a queryset and calling ``save()`` costs a query per row and
+fires post_save once per row, purging the same cache entries over and
+over. ``bulk_update`` applies the change with a single UPDATE and then
+invalidates what the rows feed in one go: the page cache tags of every
+updated object (see core.page_cache.PURGE_RULES) in one cache round trip,
+and the site context when the model appears in it.
+
+QuerySet.update() skips save() and its signals, so only use it for fields
+whose side effects are covered here; ``auto_now`` timestamps have to be
+passed explicitly.
+
+Usage:
+    count = bulk_update(queryset, status='active', updated_at=timezone.now())
+    self.message_user(request, f'{count} organizations updated.')
+"""
+
+from django.db.models import Case, F, Value, When
+
+from .context_processors import invalidate_site_context
+from .page_cache import PURGE_RULES, SITE_TAG, purge_tags
+
+
+def get_bulk_purge_tags(queryset):
+    """Return the page cache tags to purge after updating ``queryset``'s rows."""
+    rule = PURGE_RULES.get(queryset.model._meta.label)
+    if rule is None:
+        return []
+    prefix, parent_attname = rule
+    if parent_attname:
+        parent_ids = queryset.order_by().values_list(parent_attname, flat=True).distinct()
+        return [f'{prefix}:{parent_id}' for parent_id in parent_ids]
+    return [f'{prefix}:list'] + [f'{prefix}:{pk}' for pk in queryset.values_list('pk', flat=True)]
+
+
+def bulk_update(queryset, **values):
+    """
+    Update every row of ``queryset`` with one UPDATE statement.
+
+    Returns the number of rows updated. Cache invalidation for the affected
+    rows is collected before the update (the change may move rows out of a
+    filtered queryset) and fired once the transaction commits.
+    """
+    from .signals import SITE_CONTEXT_MODELS
+
+    tags = get_bulk_purge_tags(queryset)
+    count = queryset.update(**values)
+    if count:
+        if queryset.model._meta.label in SITE_CONTEXT_MODELS:
+            invalidate_site_context()
+            tags.append(SITE_TAG)
+        purge_tags(*tags)
+    return count
+
+
+def stamp_if_empty(field, now):
+    """
+    Expression setting a timestamp field to ``now`` only where it is NULL.
+
+    For actions such as "mark as read": rows stamped earlier keep their
+    original time.
+    """
+    return Case(
+        When(**{f'{field}__isnull': True}, then=Value(now)),
+        default=F(field),
+    )
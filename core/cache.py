@@ -0,0 +1,186 @@
+"""
+Shared cache helpers for Tawi Meridian.
+
+Thin layer over Django's cache framework that every app uses, so that views,
+rate limits and context processors agree on key names and storage format:
+
+- keys are namespaced (``<namespace>:<part>:<part>``) and hashed when they
+  would be too long or contain characters some backends reject;
+- values are pickled and zlib-compressed above a size threshold (integers
+  are stored as-is so that ``incr`` keeps working);
+- each namespace carries a default TTL from ``settings.CACHE_TTLS``.
+
+Example::
+
+    from core.cache import CacheNamespace
+
+    pages = CacheNamespace('pages', timeout='short')
+    html = pages.get(('home', 'en'))
+    if html is None:
+        html = render_home()
+        pages.set(('home', 'en'), html)
+"""
+
+import hashlib
+import pickle
+import re
+import uuid
+import zlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+# Values whose pickled form is at least this many bytes are compressed
+COMPRESS_MIN_LENGTH = 1024
+
+# Marker prefixes identifying packed values
+_RAW = b'P'
+_COMPRESSED = b'Z'
+
+# Sentinel meaning "use the namespace's default TTL"
+NAMESPACE_TIMEOUT = object()
+
+MAX_KEY_LENGTH = 200
+_UNSAFE_KEY_CHARS = re.compile(r'[^\w:.\-]')
+
+
+def get_ttl(timeout):
+    """
+    Resolve a timeout.
+
+    Accepts a number of seconds, None (never expire) or the name of an entry
+    in ``settings.CACHE_TTLS`` such as 'short', 'default' or 'long'.
+    """
+    if isinstance(timeout, str):
+        return settings.CACHE_TTLS[timeout]
+    return timeout
+
+
+def make_key(namespace, *parts):
+    """Build a namespaced cache key that is safe for every backend."""
+    key = ':'.join([namespace] + [str(part) for part in parts])
+    if len(key) > MAX_KEY_LENGTH or _UNSAFE_KEY_CHARS.search(key):
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        key = f'{namespace}:h:{digest}'
+    return key
+
+
+def pack(value):
+    """Serialize a value for storage, compressing large payloads."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(data) >= COMPRESS_MIN_LENGTH:
+        return _COMPRESSED + zlib.compress(data)
+    return _RAW + data
+
+
+def unpack(data):
+    """Reverse ``pack``. Values not produced by ``pack`` are returned as-is."""
+    if isinstance(data, bytes):
+        if data[:1] == _COMPRESSED:
+            return pickle.loads(zlib.decompress(data[1:]))
+        if data[:1] == _RAW:
+            return pickle.loads(data[1:])
+    return data
+
+
+class CacheNamespace:
+    """
+    A group of related cache entries sharing a key prefix and default TTL.
+
+    Key arguments may be a single value or a tuple of parts.
+    """
+
+    def __init__(self, name, timeout='default', alias='default'):
+        self.name = name
+        self.timeout = timeout
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def key(self, key):
+        """Return the full cache key for ``key``."""
+        if isinstance(key, tuple):
+            return make_key(self.name, *key)
+        return make_key(self.name, key)
+
+    def _timeout(self, timeout):
+        return get_ttl(self.timeout if timeout is NAMESPACE_TIMEOUT else timeout)
+
+    def get(self, key, default=None):
+        value = self.cache.get(self.key(key))
+        if value is None:
+            return default
+        return unpack(value)
+
+    def get_many(self, keys):
+        """Return a dict mapping each found key (as passed in) to its value."""
+        full_keys = {self.key(key): key for key in keys}
+        found = self.cache.get_many(list(full_keys))
+        return {full_keys[full_key]: unpack(value) for full_key, value in found.items()}
+
+    def set(self, key, value, timeout=NAMESPACE_TIMEOUT):
+        self.cache.set(self.key(key), pack(value), self._timeout(timeout))
+
+    def set_many(self, mapping, timeout=NAMESPACE_TIMEOUT):
+        data = {self.key(key): pack(value) for key, value in mapping.items()}
+        self.cache.set_many(data, self._timeout(timeout))
+
+    def add(self, key, value, timeout=NAMESPACE_TIMEOUT):
+        """Store ``value`` only if ``key`` is not already set. Returns True if stored."""
+        return self.cache.add(self.key(key), pack(value), self._timeout(timeout))
+
+    def get_or_set(self, key, default, timeout=NAMESPACE_TIMEOUT):
+        """Return the cached value, computing and storing ``default()`` on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = default() if callable(default) else default
+            if value is not None:
+                self.set(key, value, timeout)
+        return value
+
+    def delete(self, key):
+        self.cache.delete(self.key(key))
+
+    def delete_many(self, keys):
+        self.cache.delete_many([self.key(key) for key in keys])
+
+    def incr(self, key, delta=1, timeout=None):
+        """
+        Increment an integer counter, creating it if missing.
+
+        Atomic on Redis; best effort on backends without atomic increment.
+        """
+        full_key = self.key(key)
+        self.cache.add(full_key, 0, get_ttl(timeout))
+        try:
+            return self.cache.incr(full_key, delta)
+        except ValueError:
+            # Evicted between add() and incr()
+            self.cache.set(full_key, delta, get_ttl(timeout))
+            return delta
+
+    def version(self, key='version'):
+        """Return the version token stored under ``key``, creating one if missing."""
+        full_key = self.key(key)
+        token = self.cache.get(full_key)
+        if token is None:
+            self.cache.add(full_key, uuid.uuid4().hex, None)
+            token = self.cache.get(full_key)
+        return token
+
+    def bump(self, key='version'):
+        """Replace the version token under ``key``, invalidating dependent entries."""
+        token = uuid.uuid4().hex
+        self.cache.set(self.key(key), token, None)
+        return token
+
+    def bump_many(self, keys):
+        """Replace the version tokens under several keys in one cache round trip."""
+        tokens = {self.key(key): uuid.uuid4().hex for key in keys}
+        self.cache.set_many(tokens, None)
+        return tokens
@@ -1,15 +1,105 @@
 """
 Custom context processors for global template variables.
+
+The database-backed part of the context (office locations, certifications,
+site settings and navigation services) changes rarely, so it is built once
+per worker process and kept as an in-memory snapshot. The snapshot is tagged
+with a version token stored in the cache; ``core.signals`` replaces that token
+whenever a save or delete of one of the source models commits, and every worker
+rebuilds its snapshot on the next request that sees the new token.
 """
 
 from django.conf import settings
+from django.db import transaction
+from .cache import CacheNamespace
 from .models import OfficeLocation, Certification, SiteSetting
 
 
+site_context_cache = CacheNamespace('site_context')
+
+# Per-process snapshot of the database-backed context
+_snapshot = {
+    'version': None,
+    'data': None,
+}
+
+
+def get_site_context_version():
+    """Return the current shared version token, creating one if missing."""
+    return site_context_cache.version()
+
+
+def invalidate_site_context():
+    """
+    Publish a new version token once the current transaction commits.
+
+    Every worker compares its snapshot against this token on the next
+    request and rebuilds when it differs. Bumping before the commit would
+    let another worker rebuild from the old rows and keep them under the
+    new token.
+    """
+    transaction.on_commit(_bump_site_context)
+
+
+def _bump_site_context():
+    site_context_cache.bump()
+    _snapshot['version'] = None
+    _snapshot['data'] = None
+
+
+def build_site_context():
+    """
+    Query the database-backed part of the site context.
+
+    Querysets are evaluated into lists so templates never hit the database
+    when rendering the snapshot. Returns None if the tables don't exist yet,
+    so that an incomplete snapshot is never kept.
+    """
+    from services.models import Service
+
+    try:
+        office_locations = list(OfficeLocation.objects.all().order_by('display_order', 'name'))
+        featured_certifications = list(Certification.objects.filter(
+            is_featured=True,
+            status='active'
+        ).order_by('display_order'))
+        site_settings_dict = dict(SiteSetting.objects.values_list('key', 'value'))
+        services = list(Service.objects.filter(is_active=True).order_by('display_order')[:10])
+    except Exception:
+        # Handle case when database tables don't exist yet
+        return None
+
+    return {
+        'office_locations': office_locations,
+        'primary_location': next((loc for loc in office_locations if loc.is_primary), None),
+        'featured_certifications': featured_certifications,
+        'site_settings': site_settings_dict,
+        'services': services,
+    }
+
+
+def get_site_context():
+    """Return the current snapshot, rebuilding it if the version changed."""
+    version = get_site_context_version()
+    if _snapshot['data'] is None or _snapshot['version'] != version:
+        data = build_site_context()
+        if data is None:
+            return {
+                'office_locations': [],
+                'primary_location': None,
+                'featured_certifications': [],
+                'site_settings': {},
+                'services': [],
+            }
+        _snapshot['version'] = version
+        _snapshot['data'] = data
+    return _snapshot['data']
+
+
 def site_settings(request):
     """
     Add site-wide settings to template context.
-    
+
     This makes commonly used data available in all templates,
     reducing the need to pass it explicitly in every view.
     """
@@ -20,39 +110,5 @@ def site_settings(request):
         'social_links': settings.SOCIAL_LINKS,
         'impact_metrics': settings.IMPACT_METRICS,
     }
-    
-    # Add office locations
-    try:
-        context['office_locations'] = OfficeLocation.objects.all().order_by('display_order')
-        context['primary_location'] = OfficeLocation.objects.filter(is_primary=True).first()
-    except Exception:
-        # Handle case when database tables don't exist yet
-        context['office_locations'] = []
-        context['primary_location'] = None
-    
-    # Add featured certifications
-    try:
-        context['featured_certifications'] = Certification.objects.filter(
-            is_featured=True,
-            status='active'
-        ).order_by('display_order')
-    except Exception:
-        context['featured_certifications'] = []
-    
-    # Add site settings as a dictionary for easy access
-    try:
-        site_settings_dict = {}
-        for setting in SiteSetting.objects.all():
-            site_settings_dict[setting.key] = setting.value
-        context['site_settings'] = site_settings_dict
-    except Exception:
-        context['site_settings'] = {}
-    
-    # Add active services for navigation
-    try:
-        from services.models import Service
-        context['services'] = Service.objects.filter(is_active=True).order_by('display_order')[:10]
-    except Exception:
-        context['services'] = []
-    
+    context.update(get_site_context())
     return context
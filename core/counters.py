@@ -0,0 +1,151 @@
+"""
+Buffered view counters.
+
+Detail pages record a hit by incrementing an in-memory counter in the
+worker process instead of saving the row; the increment happens under a
+lock, so concurrent requests never lose hits. After the response has been
+sent, and at most once every VIEW_COUNT_FLUSH_INTERVAL seconds, each
+worker applies its counts to the database with ``F('view_count') + n``
+updates, batched per model and per increment size. The database column
+is the shared counter: every worker adds to it atomically, and only the
+objects viewed since the last flush are touched. Workers flush what is
+left when they exit, so restarts don't drop counts.
+
+Any model with an integer ``view_count`` field can be counted; list it in
+COUNTED_MODELS.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import F
+
+
+logger = logging.getLogger('core')
+
+COUNTED_MODELS = [
+    'blog.BlogPost',
+    'portfolio.CaseStudy',
+    'services.Service',
+]
+
+# (model label, pk) -> views recorded since the last flush
+_pending = defaultdict(int)
+_state = {'last_flush': time.monotonic()}
+_lock = threading.Lock()
+
+
+def record_view(instance):
+    """Count one view of ``instance``."""
+    record_view_by_pk(instance._meta.label, instance.pk)
+
+
+def record_view_by_pk(label, pk):
+    """Count one view of the object with primary key ``pk`` of model ``label``."""
+    with _lock:
+        _pending[(label, pk)] += 1
+
+
+def flush_view_counts_if_due(**kwargs):
+    """
+    Flush this worker's counts if VIEW_COUNT_FLUSH_INTERVAL has passed.
+
+    Connected to request_finished, so the flush runs after the response
+    has been sent and never counts against a view's query budget.
+    """
+    if not _pending:
+        return
+    if time.monotonic() - _state['last_flush'] < settings.VIEW_COUNT_FLUSH_INTERVAL:
+        return
+    try:
+        flush_view_counts()
+    except Exception as e:
+        logger.error(f'Failed to flush view counts: {e}')
+
+
+def take_pending_counts():
+    """Return and reset {label: {pk: views}} for everything viewed since the last flush."""
+    with _lock:
+        pending = dict(_pending)
+        _pending.clear()
+        _state['last_flush'] = time.monotonic()
+    by_label = defaultdict(dict)
+    for (label, pk), count in pending.items():
+        by_label[label][pk] = count
+    return by_label
+
+
+def _restore(by_label):
+    with _lock:
+        for label, counts in by_label.items():
+            for pk, count in counts.items():
+                _pending[(label, pk)] += count
+
+
+def flush_view_counts():
+    """
+    Apply this worker's buffered view counts to the database.
+
+    Returns the total number of views flushed. Counts that fail to apply
+    are put back and retried with the next flush.
+    """
+    by_label = take_pending_counts()
+    unapplied = {label: dict(pending) for label, pending in by_label.items()}
+    total = 0
+    try:
+        for label, pending in by_label.items():
+            model = apps.get_model(label)
+
+            # One UPDATE per distinct increment size
+            by_count = defaultdict(list)
+            for pk, count in pending.items():
+                by_count[count].append(pk)
+            for count, pks in by_count.items():
+                model.objects.filter(pk__in=pks).update(view_count=F('view_count') + count)
+                for pk in pks:
+                    del unapplied[label][pk]
+                total += count * len(pks)
+    except Exception:
+        _restore(unapplied)
+        raise
+    return total
+
+
+@atexit.register
+def _flush_at_exit():
+    # Gunicorn workers exit normally on restarts, so buffered views aren't lost
+    if _pending:
+        try:
+            flush_view_counts()
+        except Exception as e:
+            logger.error(f'Failed to flush view counts at exit: {e}')
+
+
+class CountViewsMixin:
+    """
+    Detail view mixin recording a buffered view for the displayed object.
+
+    Also counts views served from the anonymous page cache, using the primary
+    key stored with the cache entry.
+    """
+
+    def get(self, request, *args, **kwargs):
+        response = super().get(request, *args, **kwargs)
+        record_view(self.object)
+        return response
+
+    def get_page_cache_meta(self):
+        meta = super().get_page_cache_meta()
+        meta['view'] = (self.object._meta.label, self.object.pk)
+        return meta
+
+    def page_cache_hit(self, request, response):
+        super().page_cache_hit(request, response)
+        view = response.page_cache_meta.get('view')
+        if view:
+            record_view_by_pk(*view)
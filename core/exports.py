@@ -0,0 +1,203 @@
+"""
+Streaming CSV and JSON Lines exports.
+
+Exports read rows with ``values_list(...).iterator(chunk_size=...)``
+(a server-side cursor on PostgreSQL, chunked fetches on SQLite) and
+encode them as they are read, so memory stays flat however many rows are
+exported. The same byte stream backs the admin export actions
+(StreamingHttpResponse) and the ``export`` management command, optionally
+gzip-compressed on the fly.
+
+Fields are model field names or lookups through foreign keys
+(``organization__name``); EXPORTS lists the default fields of each
+exportable model.
+
+Usage:
+    export_response(ContactSubmission.objects.all(), fmt='jsonl', compress=True)
+    for chunk in export_stream(queryset, ['name', 'email'], 'csv'): ...
+"""
+
+import csv
+import io
+import json
+import zlib
+
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+
+# Model label -> default export fields
+EXPORTS = {
+    'contact.ContactSubmission': [
+        'id', 'name', 'email', 'organization', 'project_type', 'budget_range', 'message',
+        'is_read', 'is_responded', 'notes', 'submitted_at', 'read_at', 'responded_at',
+    ],
+    'project_management.Organization': [
+        'id', 'name', 'type__name', 'category__name', 'website', 'email', 'phone', 'location',
+        'priority', 'status', 'assigned_to__username', 'tags', 'created_at', 'last_contacted',
+    ],
+    'project_management.Contact': [
+        'id', 'first_name', 'last_name', 'title', 'role', 'organization_id', 'organization__name',
+        'is_primary', 'email', 'phone', 'mobile', 'is_active', 'created_at', 'last_contacted',
+    ],
+    'project_management.ContactInteraction': [
+        'id', 'interaction_type', 'organization_id', 'organization__name', 'contact_id', 'subject',
+        'notes', 'interaction_date', 'next_action', 'next_action_date', 'created_by__username',
+    ],
+}
+
+FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+}
+
+CHUNK_SIZE = 2000
+
+# Encoded output is yielded in pieces of about this many bytes
+FLUSH_SIZE = 64 * 1024
+
+# Leading characters spreadsheets treat as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def get_export_fields(model, fields=None):
+    """
+    Validate the requested fields of ``model`` (default: its EXPORTS entry).
+
+    Raises ValueError naming the first field that doesn't resolve.
+    """
+    if not fields:
+        fields = EXPORTS.get(model._meta.label) or [field.attname for field in model._meta.concrete_fields]
+    for path in fields:
+        current = model
+        parts = path.split('__')
+        for index, part in enumerate(parts):
+            try:
+                field = current._meta.get_field(part)
+            except FieldDoesNotExist:
+                raise ValueError(f'{model._meta.label} has no field {path!r}')
+            if index < len(parts) - 1:
+                if not field.many_to_one and not field.one_to_one:
+                    raise ValueError(f'{path!r} does not follow a foreign key')
+                current = field.related_model
+    return list(fields)
+
+
+def iter_rows(queryset, fields, chunk_size=CHUNK_SIZE):
+    """Yield value tuples of ``fields`` in primary key order, one chunk at a time."""
+    if not queryset.ordered:
+        queryset = queryset.order_by('pk')
+    return queryset.values_list(*fields).iterator(chunk_size=chunk_size)
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        # Public form input must not run as a spreadsheet formula
+        return "'" + value
+    return value
+
+
+def encode_csv(rows, fields):
+    """Yield CSV text: a header line, then the rows, in FLUSH_SIZE pieces."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for row in rows:
+        writer.writerow([_csv_value(value) for value in row])
+        if buffer.tell() >= FLUSH_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def encode_jsonl(rows, fields):
+    """Yield JSON Lines text, one object per row, in FLUSH_SIZE pieces."""
+    lines = []
+    size = 0
+    for row in rows:
+        line = json.dumps(dict(zip(fields, row)), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+        lines.append(line)
+        size += len(line)
+        if size >= FLUSH_SIZE:
+            yield ''.join(lines)
+            lines = []
+            size = 0
+    yield ''.join(lines)
+
+
+def gzip_stream(chunks):
+    """Gzip-compress a stream of byte strings incrementally."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(queryset, fields=None, fmt='csv', compress=False, chunk_size=CHUNK_SIZE):
+    """
+    Return an iterator of bytes exporting ``queryset``.
+
+    Args:
+        queryset: Rows to export
+        fields: Field names or foreign key lookups (default: the model's EXPORTS entry)
+        fmt: 'csv' or 'jsonl'
+        compress: Gzip the output
+        chunk_size: Rows fetched from the database at a time
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f'Unknown export format {fmt!r}; expected one of {", ".join(FORMATS)}')
+    fields = get_export_fields(queryset.model, fields)
+    encode = encode_csv if fmt == 'csv' else encode_jsonl
+    # Excel needs the byte order mark to read UTF-8 CSV
+    prefix = '\ufeff' if fmt == 'csv' else ''
+    chunks = (
+        (prefix + text if index == 0 else text).encode('utf-8')
+        for index, text in enumerate(encode(iter_rows(queryset, fields, chunk_size), fields))
+    )
+    return gzip_stream(chunks) if compress else chunks
+
+
+def export_filename(model, fmt, compress=False):
+    """File name for an export, e.g. contactsubmission-20261016-1405.csv.gz"""
+    stamp = timezone.localtime().strftime('%Y%m%d-%H%M')
+    extension = FORMATS[fmt][1] + ('.gz' if compress else '')
+    return f'{model._meta.model_name}-{stamp}.{extension}'
+
+
+def export_response(queryset, fields=None, fmt='csv', compress=False):
+    """A StreamingHttpResponse downloading the export of ``queryset``."""
+    content_type = 'application/gzip' if compress else f'{FORMATS[fmt][0]}; charset=utf-8'
+    response = StreamingHttpResponse(export_stream(queryset, fields, fmt, compress), content_type=content_type)
+    filename = export_filename(queryset.model, fmt, compress)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def export_action(fmt, compress=False):
+    """
+    Admin action exporting the selected rows.
+
+    The ModelAdmin's ``export_fields`` (if set) overrides the default fields.
+    """
+    def action(modeladmin, request, queryset):
+        return export_response(queryset, getattr(modeladmin, 'export_fields', None), fmt, compress)
+    label = {'csv': 'CSV', 'jsonl': 'JSON Lines'}[fmt]
+    action.__name__ = f'export_{fmt}' + ('_gzip' if compress else '')
+    action.short_description = f'Export selected as {label}' + (' (gzip)' if compress else '')
+    return action
+
+
+def get_export_model(label):
+    """Return the model for an 'app_label.ModelName' label, if it is exportable."""
+    model = apps.get_model(label)
+    if model._meta.label not in EXPORTS:
+        raise ValueError(f'{label} is not exportable; choose one of {", ".join(EXPORTS)}')
+    return model
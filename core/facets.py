@@ -0,0 +1,165 @@
+"""
+Facet counts for filtered listing pages.
+
+A listing with several filters (e.g. client type and service) shows, next
+to each filter option, how many results choosing it would give. Counting
+each option separately costs a query per option; instead FacetSet runs one
+grouped aggregate over all facet fields at once:
+
+    SELECT client_type, service.slug, COUNT(*) ... GROUP BY client_type, service.slug
+
+and derives every facet's counts from the grouped rows in Python. Counts
+for one facet respect the other active facet filters (and every non-facet
+filter already applied to the queryset) but not its own, so the
+alternatives to the current choice stay visible.
+
+Results are cached per listing and filter combination until one of the
+listing's page-cache tags is purged.
+"""
+
+from collections import defaultdict
+
+from django.db.models import Count
+
+from .cache import CacheNamespace, get_ttl
+from .page_cache import get_tag_versions, normalize_query_string, tags_are_current
+from .publishing import cap_timeout
+
+
+facet_cache = CacheNamespace('facets', timeout='long')
+
+
+class Facet:
+    """
+    One filterable field of a listing.
+
+    Args:
+        name: Query parameter holding the selected value
+        field: Lookup grouped on and filtered by (e.g. 'service__slug')
+        choices: Optional (value, label) pairs listing every option in
+            order, including ones without results
+        label_field: Optional lookup providing option labels when there are
+            no choices (e.g. 'service__title')
+    """
+
+    def __init__(self, name, field, choices=None, label_field=None):
+        self.name = name
+        self.field = field
+        self.choices = choices
+        self.label_field = label_field
+
+
+class FacetSet:
+    """
+    Facets of one listing request.
+
+    Args:
+        queryset: Listing queryset with every non-facet filter applied
+        facets: Facet instances
+        params: The request's query parameters (request.GET)
+        cache_key: Identifies the listing (e.g. the view name); counts are
+            not cached without it
+        tags: Page-cache tags whose purge invalidates the cached counts
+    """
+
+    def __init__(self, queryset, facets, params, cache_key=None, tags=()):
+        self.queryset = queryset
+        self.facets = list(facets)
+        self.params = params
+        self.cache_key = cache_key
+        self.tags = list(tags)
+        self.selected = {
+            facet.name: params.get(facet.name)
+            for facet in self.facets
+            if params.get(facet.name)
+        }
+
+    def apply(self, queryset):
+        """Filter ``queryset`` by the selected facet values."""
+        filters = {
+            facet.field: self.selected[facet.name]
+            for facet in self.facets
+            if facet.name in self.selected
+        }
+        return queryset.filter(**filters) if filters else queryset
+
+    def counts(self):
+        """
+        Return a dict mapping facet name to its options.
+
+        Each option is a dict with value, label, count, selected and query
+        (the query string selecting it, or clearing it when selected).
+        """
+        if self.cache_key is None:
+            return self.compute()
+
+        key = (self.cache_key, normalize_query_string(self._base_query()))
+        entry = facet_cache.get(key)
+        if entry is not None and tags_are_current(entry['tags']):
+            return entry['counts']
+
+        tags = get_tag_versions(self.tags) if self.tags else {}
+        counts = self.compute()
+        facet_cache.set(key, {'counts': counts, 'tags': tags}, cap_timeout(get_ttl(facet_cache.timeout)))
+        return counts
+
+    def compute(self):
+        """Run the grouped aggregate and build every facet's options."""
+        fields = [facet.field for facet in self.facets]
+        fields += [facet.label_field for facet in self.facets if facet.label_field]
+        rows = list(self.queryset.order_by().values(*fields).annotate(facet_count=Count('pk')))
+
+        results = {}
+        for facet in self.facets:
+            totals = defaultdict(int)
+            labels = {}
+            others = [other for other in self.facets if other is not facet and other.name in self.selected]
+            for row in rows:
+                if all(str(row[other.field]) == self.selected[other.name] for other in others):
+                    value = row[facet.field]
+                    totals[value] += row['facet_count']
+                    if facet.label_field:
+                        labels[value] = row[facet.label_field]
+
+            if facet.choices is not None:
+                options = [(value, label) for value, label in facet.choices]
+            else:
+                options = sorted(
+                    ((value, labels.get(value, value)) for value in totals if value is not None),
+                    key=lambda option: str(option[1]).lower(),
+                )
+            results[facet.name] = [
+                self.option(facet, value, label, totals.get(value, 0))
+                for value, label in options
+            ]
+        return results
+
+    def clear_queries(self):
+        """Return a dict mapping facet name to the query string without it ("All" links)."""
+        queries = {}
+        for facet in self.facets:
+            query = self._base_query()
+            query.pop(facet.name, None)
+            queries[facet.name] = query.urlencode()
+        return queries
+
+    def _base_query(self):
+        query = self.params.copy()
+        query.pop('page', None)
+        query.pop('cursor', None)
+        return query
+
+    def option(self, facet, value, label, count):
+        selected = self.selected.get(facet.name) == str(value)
+        query = self._base_query()
+        if selected:
+            query.pop(facet.name, None)
+        else:
+            query[facet.name] = value
+        return {
+            'value': value,
+            'label': label,
+            'count': count,
+            'selected': selected,
+            'query': query.urlencode(),
+        }
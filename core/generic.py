@@ -0,0 +1,103 @@
+"""
+Shared generic views for Tawi Meridian's public pages.
+
+PublicDetailView is the base for blog post, case study and service detail
+pages. It fetches the displayed object exactly once, with the related rows
+the page needs prefetched, and enforces a per-view query budget.
+"""
+
+import logging
+
+from django.conf import settings
+from django.db import connection
+from django.views.generic import DetailView
+
+from .context_processors import get_site_context
+from .counters import CountViewsMixin
+from .page_cache import AnonymousPageCacheMixin
+
+
+logger = logging.getLogger('core')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a view runs more queries than its query_budget allows."""
+
+
+class QueryCounter:
+    """Database execute wrapper counting the queries run while installed."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class QueryBudgetMixin:
+    """
+    Enforce a maximum number of database queries per request.
+
+    ``query_budget`` is the number of queries the view (including template
+    rendering) may run. The per-process site context snapshot is built
+    before counting starts, so it never counts against a view. What happens
+    when the budget is exceeded depends on settings.QUERY_BUDGET_MODE:
+    'raise' (used by tests), 'warn' (logs a warning) or 'off'.
+    """
+    query_budget = None
+
+    def dispatch(self, request, *args, **kwargs):
+        mode = getattr(settings, 'QUERY_BUDGET_MODE', 'off')
+        if self.query_budget is None or mode == 'off':
+            return super().dispatch(request, *args, **kwargs)
+
+        get_site_context()
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            response = super().dispatch(request, *args, **kwargs)
+            if hasattr(response, 'render') and callable(response.render):
+                response.render()
+
+        if counter.count > self.query_budget:
+            message = (
+                f'{self.__class__.__name__} ran {counter.count} queries '
+                f'(budget {self.query_budget}) for {request.path}'
+            )
+            if mode == 'raise':
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+
+class PublicDetailView(CountViewsMixin, AnonymousPageCacheMixin, QueryBudgetMixin, DetailView):
+    """
+    Base detail view for published content.
+
+    The object is fetched once per request, with ``select_related`` and
+    ``prefetch_related`` applied, and reused by get_context_data through
+    ``self.object``. Views are counted, anonymous responses are cached and
+    the query budget is checked on cache misses.
+
+    Subclasses set:
+        select_related: Forward relations to join in the object query
+        prefetch_related: Lookups (or Prefetch objects) for child rows
+        query_budget: Maximum queries for a rendered page
+    """
+    select_related = []
+    prefetch_related = []
+    slug_field = 'slug'
+    slug_url_kwarg = 'slug'
+
+    def get_object(self, queryset=None):
+        """Fetch the object once, with its related rows."""
+        if getattr(self, 'object', None) is not None:
+            return self.object
+        if queryset is None:
+            queryset = self.get_queryset()
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        self.object = super().get_object(queryset)
+        return self.object
@@ -0,0 +1,296 @@
+"""
+Responsive image derivatives.
+
+Uploaded images are served at full size unless smaller variants exist.
+When a model with an image field is saved, the image is resized with
+Pillow to the standard DERIVATIVE_WIDTHS (never upscaling) in WebP and
+JPEG, in a background process pool so uploads don't wait for it.
+
+Derivatives are stored next to the uploads under ``derivatives/`` with
+predictable names. What was generated is recorded in the model's
+``renditions`` JSON field, keyed by image field name, together with the
+image's metadata computed in the same pass:
+
+    {'hero_image': {'source': 'case_studies/x.jpg', 'width': 2400,
+                    'height': 1600, 'widths': [320, 640, 960, 1280, 1920],
+                    'color': '#3b5f7a', 'placeholder': 'data:image/webp;base64,...'}}
+
+so templates can build ``srcset`` attributes, reserve the right aspect
+ratio and paint a blurred placeholder without touching storage (see the
+``responsive_image`` tag in core.templatetags.images).
+
+IMAGE_FIELDS lists the image fields processed; models listed there need
+a ``renditions = JSONField(default=dict)`` field.
+"""
+
+import base64
+import io
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+
+
+logger = logging.getLogger('core')
+
+# Model label -> image fields with derivatives
+IMAGE_FIELDS = {
+    'blog.BlogPost': ['featured_image'],
+    'blog.BlogImage': ['image'],
+    'portfolio.CaseStudy': ['hero_image'],
+    'portfolio.CaseStudyImage': ['image'],
+    'services.Service': ['featured_image'],
+    'core.Certification': ['logo'],
+}
+
+DERIVATIVE_WIDTHS = [320, 640, 960, 1280, 1920]
+
+# Format -> (file extension, Pillow save options)
+DERIVATIVE_FORMATS = {
+    'webp': ('webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+DERIVATIVE_PREFIX = 'derivatives'
+
+# Longest side of the inline placeholder image, in pixels
+PLACEHOLDER_SIZE = 16
+
+# Keys every up-to-date rendition record has
+METADATA_KEYS = ('width', 'height', 'color', 'placeholder')
+
+
+def derivative_name(name, width, fmt):
+    """Return the storage name of the ``width``-pixel ``fmt`` variant of ``name``."""
+    root, ext = os.path.splitext(name)
+    return f'{DERIVATIVE_PREFIX}/{root}-{width}w.{DERIVATIVE_FORMATS[fmt][0]}'
+
+
+def derivative_widths(original_width):
+    """Standard widths smaller than the original, plus the original if within range."""
+    widths = [width for width in DERIVATIVE_WIDTHS if width < original_width]
+    if original_width <= DERIVATIVE_WIDTHS[-1]:
+        widths.append(original_width)
+    return widths
+
+
+def get_rendition(instance, field_name):
+    """Return the rendition record for the image currently in ``field_name``, or None."""
+    file = getattr(instance, field_name)
+    if not file:
+        return None
+    rendition = (getattr(instance, 'renditions', None) or {}).get(field_name)
+    if not rendition or rendition.get('source') != file.name:
+        return None
+    return rendition
+
+
+def needs_processing(instance, field_name):
+    """Check whether an image field lacks derivatives or metadata for its current file."""
+    if not getattr(instance, field_name):
+        return False
+    rendition = get_rendition(instance, field_name)
+    return rendition is None or any(key not in rendition for key in METADATA_KEYS)
+
+
+def _prepare(image, fmt):
+    """Convert an image to a mode the target format can store."""
+    from PIL import Image
+
+    if fmt == 'jpeg' and image.mode != 'RGB':
+        if image.mode in ('RGBA', 'LA', 'P'):
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel('A'))
+            return background
+        return image.convert('RGB')
+    if fmt == 'webp' and image.mode not in ('RGB', 'RGBA'):
+        return image.convert('RGBA' if 'A' in image.getbands() or image.mode == 'P' else 'RGB')
+    return image
+
+
+def open_image(name, storage=None):
+    """Open and fully load a stored image, applying its EXIF orientation."""
+    from PIL import Image, ImageOps
+    from django.core.files.storage import default_storage
+
+    storage = storage or default_storage
+    with storage.open(name, 'rb') as source:
+        image = Image.open(source)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    return image
+
+
+def image_metadata(image):
+    """
+    Compute the stored metadata of a loaded image.
+
+    Returns width, height, the dominant color as '#rrggbb' (the most common
+    color of a 5-color quantization) and a tiny WebP data URI to show,
+    scaled up, while the real image loads.
+    """
+    from PIL import Image
+
+    width, height = image.size
+    rgb = _prepare(image, 'jpeg')
+
+    sample = rgb.copy()
+    sample.thumbnail((64, 64))
+    palette_image = sample.quantize(colors=5)
+    count, index = max(palette_image.getcolors())
+    palette = palette_image.getpalette()
+    color = '#{:02x}{:02x}{:02x}'.format(*palette[index * 3:index * 3 + 3])
+
+    tiny = rgb.copy()
+    tiny.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.BILINEAR)
+    buffer = io.BytesIO()
+    tiny.save(buffer, format='WEBP', quality=40)
+    placeholder = 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+    return {'width': width, 'height': height, 'color': color, 'placeholder': placeholder}
+
+
+def build_derivatives(name, storage=None):
+    """
+    Generate every derivative of the stored image ``name``.
+
+    Returns the rendition record (source, widths and image metadata).
+    """
+    from PIL import Image
+    from django.core.files.storage import default_storage
+
+    storage = storage or default_storage
+    image = open_image(name, storage)
+
+    width, height = image.size
+    widths = derivative_widths(width)
+    for target_width in widths:
+        target_height = max(1, round(height * target_width / width))
+        resized = image if target_width == width else image.resize((target_width, target_height), Image.LANCZOS)
+        for fmt, (ext, options) in DERIVATIVE_FORMATS.items():
+            buffer = io.BytesIO()
+            _prepare(resized, fmt).save(buffer, format=fmt.upper(), **options)
+            target = derivative_name(name, target_width, fmt)
+            if storage.exists(target):
+                storage.delete(target)
+            storage.save(target, ContentFile(buffer.getvalue()))
+
+    return {'source': name, 'widths': widths, **image_metadata(image)}
+
+
+def is_source_in_use(name):
+    """Check whether any image field still stores ``name`` (uploads are deduplicated)."""
+    for label, field_names in IMAGE_FIELDS.items():
+        model = apps.get_model(label)
+        for field_name in field_names:
+            if model.objects.filter(**{field_name: name}).exists():
+                return True
+    return False
+
+
+def delete_derivatives(rendition, storage=None):
+    """Remove the files of an outdated rendition record."""
+    from django.core.files.storage import default_storage
+
+    storage = storage or default_storage
+    for width in rendition.get('widths', []):
+        for fmt in DERIVATIVE_FORMATS:
+            target = derivative_name(rendition['source'], width, fmt)
+            if storage.exists(target):
+                storage.delete(target)
+
+
+def process_image(label, pk, field_name, metadata_only=False):
+    """
+    Build derivatives and metadata for one image field and record them on the row.
+
+    Runs in a pool worker (or inline); the row is updated with a queryset
+    update so no save signals fire, and the pages showing it are purged.
+    With ``metadata_only``, existing derivatives of the same file are kept
+    and only the metadata is recomputed.
+    """
+    from .page_cache import get_purge_tags, purge_tags
+
+    model = apps.get_model(label)
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return None
+    file = getattr(instance, field_name)
+    if not file:
+        return None
+
+    current = get_rendition(instance, field_name)
+    if metadata_only and current is not None:
+        rendition = {**current, **image_metadata(open_image(file.name, file.storage))}
+    else:
+        rendition = build_derivatives(file.name, file.storage)
+
+    # Re-read so renditions written for other fields meanwhile are kept
+    renditions = dict(model.objects.filter(pk=pk).values_list('renditions', flat=True).first() or {})
+    previous = renditions.get(field_name)
+    if previous and previous.get('source') != rendition['source'] and not is_source_in_use(previous['source']):
+        delete_derivatives(previous, file.storage)
+    renditions[field_name] = rendition
+    model.objects.filter(pk=pk).update(renditions=renditions)
+
+    purge_tags(*get_purge_tags(instance))
+    if label == 'core.Certification':
+        from .signals import site_context_changed
+        site_context_changed(sender=model)
+    return rendition
+
+
+def init_worker():
+    """Set up Django in a freshly spawned pool worker."""
+    import django
+    django.setup()
+
+
+_executor = {'pool': None}
+
+
+def get_executor():
+    """Return this process's image pool, creating it on first use."""
+    if _executor['pool'] is None:
+        _executor['pool'] = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_DERIVATIVE_WORKERS,
+            # Spawned workers open their own database connections
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_worker,
+        )
+    return _executor['pool']
+
+
+def _log_failure(future):
+    error = future.exception()
+    if error is not None:
+        logger.error(f'Failed to build image derivatives: {error}')
+
+
+def schedule_image(label, pk, field_name):
+    """Queue derivative generation for one image field after the transaction commits."""
+    def submit():
+        if not settings.IMAGE_DERIVATIVE_WORKERS:
+            try:
+                process_image(label, pk, field_name)
+            except Exception as e:
+                logger.error(f'Failed to build image derivatives: {e}')
+            return
+        future = get_executor().submit(process_image, label, pk, field_name)
+        future.add_done_callback(_log_failure)
+    transaction.on_commit(submit)
+
+
+def images_changed(sender, instance, raw=False, **kwargs):
+    """Queue derivatives for image fields without an up-to-date rendition."""
+    if raw:
+        return
+    for field_name in IMAGE_FIELDS.get(instance._meta.label, []):
+        if needs_processing(instance, field_name):
+            schedule_image(instance._meta.label, instance.pk, field_name)
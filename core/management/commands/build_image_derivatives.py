@@ -0,0 +1,86 @@
+"""
+Management command to build responsive image derivatives.
+
+New uploads are processed automatically; run this after deploying the
+pipeline, after changing DERIVATIVE_WIDTHS/DERIVATIVE_FORMATS (with --all),
+or to retry images that failed. Images whose derivatives are current but
+whose stored metadata (size, dominant color, placeholder) is incomplete
+only get their metadata recomputed.
+
+Usage:
+    python manage.py build_image_derivatives
+    python manage.py build_image_derivatives --all --workers 4
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from core.images import IMAGE_FIELDS, init_worker, get_rendition, needs_processing, process_image
+
+
+class Command(BaseCommand):
+    help = 'Build resized WebP/JPEG derivatives for uploaded images'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Rebuild derivatives for every image, not only missing ones'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Number of worker processes (1 builds in this process)'
+        )
+
+    def handle(self, *args, **options):
+        jobs = []
+        for label, field_names in IMAGE_FIELDS.items():
+            model = apps.get_model(label)
+            for instance in model.objects.only('pk', 'renditions', *field_names):
+                for field_name in field_names:
+                    if not getattr(instance, field_name):
+                        continue
+                    if options['all'] or get_rendition(instance, field_name) is None:
+                        jobs.append((label, instance.pk, field_name, False))
+                    elif needs_processing(instance, field_name):
+                        jobs.append((label, instance.pk, field_name, True))
+
+        if not jobs:
+            self.stdout.write(self.style.SUCCESS('All image derivatives are up to date.'))
+            return
+
+        workers = max(1, options['workers'])
+        self.stdout.write(f'Building derivatives for {len(jobs)} images with {workers} worker(s)...')
+        failed = 0
+        if workers == 1:
+            for job in jobs:
+                failed += self.run_job(process_image, job)
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=init_worker,
+            ) as executor:
+                futures = {executor.submit(process_image, *job): job for job in jobs}
+                for future in as_completed(futures):
+                    failed += self.run_job(lambda *job: future.result(), futures[future])
+
+        built = len(jobs) - failed
+        self.stdout.write(self.style.SUCCESS(f'Built derivatives for {built} images.'))
+        if failed:
+            self.stdout.write(self.style.WARNING(f'{failed} images failed.'))
+
+    def run_job(self, func, job):
+        """Run one job, reporting errors; returns 1 on failure."""
+        try:
+            func(*job)
+        except Exception as e:
+            label, pk, field_name, metadata_only = job
+            self.stderr.write(f'{label} {pk} {field_name}: {e}')
+            return 1
+        return 0
@@ -0,0 +1,76 @@
+"""
+Management command to move existing uploads into content-addressed storage.
+
+Files uploaded before core.storage.ContentAddressedStorage was enabled keep
+their original names. This re-saves each one through the storage (which
+stores it under its content hash, deduplicating identical files), points
+the row at the new name and deletes the old file once nothing refers to it.
+Run build_image_derivatives afterwards to regenerate derivatives.
+
+Usage:
+    python manage.py convert_media_storage
+    python manage.py convert_media_storage --dry-run
+"""
+
+from django.apps import apps
+from django.core.files.storage import default_storage, storages
+from django.core.management.base import BaseCommand
+from django.db import models
+from core.storage import ContentAddressedStorage
+
+
+class Command(BaseCommand):
+    help = 'Move existing uploads to content-addressed names and deduplicate them'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report what would be converted without changing anything'
+        )
+
+    def handle(self, *args, **options):
+        storage = storages['default']
+        if not isinstance(storage, ContentAddressedStorage):
+            self.stdout.write(self.style.ERROR('The default storage is not ContentAddressedStorage.'))
+            return
+
+        converted = {}
+        rows = 0
+        for model in apps.get_models():
+            for field in model._meta.get_fields():
+                if not isinstance(field, models.FileField) or field.storage is not default_storage:
+                    continue
+                queryset = (
+                    model.objects.exclude(**{field.name: ''})
+                    .exclude(**{f'{field.name}__isnull': True})
+                    .exclude(**{f'{field.name}__startswith': f'{storage.prefix}/'})
+                    .values_list('pk', field.name)
+                )
+                for pk, name in queryset.iterator():
+                    if not storage.exists(name):
+                        self.stderr.write(f'{model._meta.label} {pk}: missing file {name}')
+                        continue
+                    if options['dry_run']:
+                        self.stdout.write(f'{model._meta.label} {pk}: {name}')
+                        rows += 1
+                        continue
+                    if name not in converted:
+                        with storage.open(name, 'rb') as source:
+                            converted[name] = storage.save(name, source)
+                    model.objects.filter(pk=pk).update(**{field.name: converted[name]})
+                    rows += 1
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'{rows} files would be converted.'))
+            return
+
+        for old_name, new_name in converted.items():
+            if old_name != new_name:
+                storage.delete(old_name)
+        unique = len(set(converted.values()))
+        self.stdout.write(self.style.SUCCESS(
+            f'Converted {rows} file references; {len(converted)} files stored as {unique} unique files.'
+        ))
+        if rows:
+            self.stdout.write('Run build_image_derivatives to regenerate image derivatives.')
@@ -0,0 +1,80 @@
+"""
+Management command to export contact submissions and CRM data.
+
+Rows are streamed from the database and written as they are encoded, so
+exports of any size run in constant memory.
+
+Usage:
+    python manage.py export contact.ContactSubmission > submissions.csv
+    python manage.py export project_management.Organization --format jsonl --gzip -o organizations.jsonl.gz
+    python manage.py export project_management.Contact --fields first_name,last_name,email,organization__name
+"""
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from core.exports import CHUNK_SIZE, EXPORTS, FORMATS, export_stream, get_export_model
+
+
+class Command(BaseCommand):
+    help = 'Export contact submissions or CRM records as CSV or JSON Lines'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'model',
+            help=f'Model to export: {", ".join(EXPORTS)}'
+        )
+        parser.add_argument(
+            '--format',
+            choices=list(FORMATS),
+            default='csv',
+            help='Output format (default: csv)'
+        )
+        parser.add_argument(
+            '--fields',
+            help='Comma-separated fields, including foreign key lookups such as organization__name'
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Gzip-compress the output'
+        )
+        parser.add_argument(
+            '-o', '--output',
+            help='File to write (default: standard output)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help=f'Rows fetched from the database at a time (default: {CHUNK_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        fields = [field.strip() for field in options['fields'].split(',') if field.strip()] if options['fields'] else None
+        try:
+            model = get_export_model(options['model'])
+            stream = export_stream(
+                model.objects.all(),
+                fields,
+                options['format'],
+                compress=options['gzip'],
+                chunk_size=options['chunk_size'],
+            )
+        except (LookupError, ValueError) as e:
+            raise CommandError(str(e))
+
+        if options['output']:
+            with open(options['output'], 'wb') as output:
+                size = self.write(stream, output)
+            self.stderr.write(self.style.SUCCESS(f'Wrote {size} bytes to {options["output"]}.'))
+        else:
+            self.write(stream, sys.stdout.buffer)
+
+    def write(self, stream, output):
+        size = 0
+        for chunk in stream:
+            output.write(chunk)
+            size += len(chunk)
+        output.flush()
+        return size
@@ -0,0 +1,29 @@
+"""
+Management command to purge caches for scheduled content that went live.
+
+Caches are purged automatically by the first request after a publish time;
+run this from cron (e.g. every minute) so HTTP caches and feeds pick up
+scheduled posts on time even when the site has no traffic.
+
+Usage: python manage.py publish_scheduled
+"""
+
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand
+from core.publishing import get_next_publish_time, publish_due_content
+
+
+class Command(BaseCommand):
+    help = 'Purge cached pages and feeds for scheduled content whose publish time has passed'
+
+    def handle(self, *args, **options):
+        count = publish_due_content()
+        self.stdout.write(self.style.SUCCESS(f'Published {count} scheduled item(s).'))
+
+        next_at = get_next_publish_time()
+        if next_at is None:
+            self.stdout.write('Nothing else is scheduled.')
+        else:
+            when = datetime.fromtimestamp(next_at, dt_timezone.utc)
+            self.stdout.write(f'Next scheduled publish: {when.isoformat()}')
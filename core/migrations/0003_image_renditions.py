@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_tag"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="certification",
+            name="renditions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Responsive logo derivatives (maintained by core.images)",
+            ),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_image_renditions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RateLimitBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "key",
+                    models.CharField(
+                        help_text='Scope and client, e.g. "contact:203.0.113.7"',
+                        max_length=255,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "tat",
+                    models.FloatField(
+                        help_text="Theoretical arrival time of the next request (Unix seconds)"
+                    ),
+                ),
+                (
+                    "allowed",
+                    models.BooleanField(
+                        default=True, help_text="Outcome of the most recent check"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Rate Limit Bucket",
+                "verbose_name_plural": "Rate Limit Buckets",
+                "indexes": [
+                    models.Index(fields=["tat"], name="core_rateli_tat_57d7fa_idx")
+                ],
+            },
+        ),
+    ]
@@ -88,6 +88,7 @@ class Certification(models.Model):
     abbreviation = models.CharField(max_length=50, blank=True, help_text='Short form (e.g., "WOSB")')
     description = models.TextField(blank=True, help_text='Brief description of the certification')
     logo = models.ImageField(upload_to='certifications/', blank=True, null=True, help_text='Certification logo/badge')
+    renditions = models.JSONField(default=dict, blank=True, editable=False, help_text='Responsive logo derivatives (maintained by core.images)')
     certification_number = models.CharField(max_length=100, blank=True, help_text='Certification ID number')
     issue_date = models.DateField(blank=True, null=True)
     expiry_date = models.DateField(blank=True, null=True)
@@ -117,3 +118,44 @@ class Certification(models.Model):
         if self.status == 'active':
             return True
         return False
+
+
+class Tag(models.Model):
+    """
+    Normalized tag shared by blog posts and CRM organizations.
+
+    Tags are matched on their slug, so "AI", "ai" and " AI " are the same
+    tag while "Kenya Air" is a different one.
+    """
+    name = models.CharField(max_length=100, help_text='Display name (first spelling used)')
+    slug = models.SlugField(max_length=100, unique=True, help_text='Normalized lookup key')
+
+    class Meta:
+        verbose_name = 'Tag'
+        verbose_name_plural = 'Tags'
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class RateLimitBucket(models.Model):
+    """
+    GCRA state of one rate-limited client (see core.ratelimit).
+
+    Lives in the database so every gunicorn worker shares the same limits.
+    Each check reads and updates its row in one atomic upsert.
+    """
+    key = models.CharField(max_length=255, unique=True, help_text='Scope and client, e.g. "contact:203.0.113.7"')
+    tat = models.FloatField(help_text='Theoretical arrival time of the next request (Unix seconds)')
+    allowed = models.BooleanField(default=True, help_text='Outcome of the most recent check')
+
+    class Meta:
+        verbose_name = 'Rate Limit Bucket'
+        verbose_name_plural = 'Rate Limit Buckets'
+        indexes = [
+            models.Index(fields=['tat']),
+        ]
+
+    def __str__(self):
+        return self.key
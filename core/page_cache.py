@@ -0,0 +1,259 @@
+"""
+Full-page response cache for anonymous visitors.
+
+Public pages (home, about, services, portfolio, blog) render the same HTML
+for every anonymous visitor, so the rendered response is stored in the
+shared cache, keyed on host, path and normalized query string.
+
+Every entry records the content tags it depends on (e.g. ``blogpost:12``,
+``blogpost:list``, ``site``) together with the version token each tag had
+when the page was rendered. Purging a tag replaces its token, so any entry
+rendered against the old token is treated as a miss. This makes a purge a
+single cache write regardless of how many pages depend on the tag.
+
+Tag conventions:
+
+- ``<model>:<pk>``  - a page renders this object
+- ``<model>:list``  - a page renders a collection of these objects
+- ``site``          - every page (global context: navigation, footer)
+"""
+
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpResponse
+
+from .cache import CacheNamespace
+
+
+page_cache = CacheNamespace('pages', timeout='long')
+tag_versions = CacheNamespace('page_tags', timeout=None)
+
+SITE_TAG = 'site'
+
+# Query parameters that never change the rendered page
+IGNORED_QUERY_PARAMS = {'fbclid', 'gclid', 'mc_cid', 'mc_eid'}
+IGNORED_QUERY_PREFIXES = ('utm_',)
+
+# Response headers replayed on a cache hit
+STORED_HEADERS = ['Content-Type', 'Content-Language']
+
+# Purge rules: model label -> (tag prefix, parent foreign key attname).
+# Saving a top-level object purges its own tag and the collection tag;
+# saving a child object purges its parent's tag.
+PURGE_RULES = {
+    'blog.BlogPost': ('blogpost', None),
+    'blog.BlogImage': ('blogpost', 'blog_post_id'),
+    'portfolio.CaseStudy': ('casestudy', None),
+    'portfolio.CaseStudyImage': ('casestudy', 'case_study_id'),
+    'portfolio.CaseStudyTestimonial': ('casestudy', 'case_study_id'),
+    'services.Service': ('service', None),
+    'services.ServiceFeature': ('service', 'service_id'),
+    'services.ServiceCaseStudy': ('service', 'service_id'),
+}
+
+
+def normalize_query_string(query_dict):
+    """Return a canonical query string: sorted, without tracking parameters or empty values."""
+    items = []
+    for key in sorted(query_dict.keys()):
+        if key in IGNORED_QUERY_PARAMS or key.startswith(IGNORED_QUERY_PREFIXES):
+            continue
+        for value in sorted(query_dict.getlist(key)):
+            if value != '':
+                items.append((key, value))
+    return urlencode(items)
+
+
+def get_page_cache_key(request):
+    """Return the cache key for the page requested."""
+    return (
+        request.scheme,
+        request.get_host(),
+        request.path,
+        normalize_query_string(request.GET),
+        'htmx' if getattr(request, 'htmx', False) else 'full',
+    )
+
+
+def is_cacheable_request(request):
+    """
+    Check whether a request may be served from (or stored in) the page cache.
+
+    Only anonymous GET requests qualify. A visitor counts as anonymous when
+    they carry neither a session cookie nor pending flash messages; that
+    avoids touching the session, so cache hits never cost a database query.
+    """
+    if not getattr(settings, 'PAGE_CACHE_ENABLED', False):
+        return False
+    if request.method != 'GET':
+        return False
+    if settings.SESSION_COOKIE_NAME in request.COOKIES:
+        return False
+    if 'messages' in request.COOKIES:
+        return False
+    return True
+
+
+def is_cacheable_response(response):
+    """Only plain 200 responses that don't set cookies are stored."""
+    if response.status_code != 200 or response.streaming:
+        return False
+    if response.cookies:
+        return False
+    cache_control = response.get('Cache-Control', '')
+    if 'private' in cache_control or 'no-cache' in cache_control or 'no-store' in cache_control:
+        return False
+    return True
+
+
+def get_tag_versions(tags):
+    """Return the current version token of each tag, creating missing ones."""
+    versions = tag_versions.get_many(tags)
+    for tag in tags:
+        if tag not in versions:
+            versions[tag] = tag_versions.version(tag)
+    return versions
+
+
+def tags_are_current(versions):
+    """Check that every tag in a stored {tag: version} map is still at that version."""
+    current = tag_versions.get_many(list(versions))
+    return all(current.get(tag) == version for tag, version in versions.items())
+
+
+def get_cached_response(request):
+    """Return the cached response for ``request``, or None on a miss or stale entry."""
+    entry = page_cache.get(get_page_cache_key(request))
+    if entry is None or not tags_are_current(entry['tags']):
+        return None
+
+    response = HttpResponse(entry['content'])
+    for header, value in entry['headers'].items():
+        response[header] = value
+    response['X-Page-Cache'] = 'HIT'
+    response.page_cache_meta = entry['meta']
+    return response
+
+
+def store_response(request, response, tags, meta=None, timeout=None):
+    """
+    Store a rendered response under the request's key.
+
+    Args:
+        tags: Content tags this page depends on (``site`` is always added)
+        meta: Small dict kept alongside the entry and exposed on cache hits
+        timeout: Seconds to keep the entry (defaults to PAGE_CACHE_TIMEOUT),
+            never longer than until the next scheduled publish time
+    """
+    # Imported here: core.publishing purges through this module
+    from .publishing import cap_timeout
+
+    if not is_cacheable_response(response):
+        return
+    tags = sorted(set(tags) | {SITE_TAG})
+    entry = {
+        'content': response.content,
+        'headers': {header: response[header] for header in STORED_HEADERS if response.has_header(header)},
+        'tags': get_tag_versions(tags),
+        'meta': meta or {},
+    }
+    if timeout is None:
+        timeout = settings.PAGE_CACHE_TIMEOUT
+    timeout = cap_timeout(timeout)
+    page_cache.set(get_page_cache_key(request), entry, timeout)
+    response['X-Page-Cache'] = 'MISS'
+
+
+def purge_tags(*tags):
+    """
+    Invalidate every cached page that depends on any of ``tags``.
+
+    The purge runs when the current transaction commits (immediately
+    outside one): purging earlier would let a concurrent request re-cache
+    the page from the old rows under the new token.
+    """
+    if tags:
+        tags = set(tags)
+        transaction.on_commit(lambda: tag_versions.bump_many(tags))
+
+
+def get_purge_tags(instance):
+    """Return the tags to purge when ``instance`` is saved or deleted."""
+    rule = PURGE_RULES.get(instance._meta.label)
+    if rule is None:
+        return []
+    prefix, parent_attname = rule
+    if parent_attname:
+        return [f'{prefix}:{getattr(instance, parent_attname)}']
+    return [f'{prefix}:{instance.pk}', f'{prefix}:list']
+
+
+def cache_anonymous_page(tags=()):
+    """
+    Decorator caching a function-based view's response for anonymous visitors.
+
+    Usage:
+        @cache_anonymous_page(tags=['service:list'])
+        def home(request):
+            ...
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapped_view(request, *args, **kwargs):
+            if not is_cacheable_request(request):
+                return view_func(request, *args, **kwargs)
+            response = get_cached_response(request)
+            if response is not None:
+                return response
+            response = view_func(request, *args, **kwargs)
+            if hasattr(response, 'render') and callable(response.render):
+                response.render()
+            store_response(request, response, tags)
+            return response
+        return wrapped_view
+    return decorator
+
+
+class AnonymousPageCacheMixin:
+    """
+    Class-based view mixin caching full responses for anonymous visitors.
+
+    Set ``page_cache_tags`` to the collection tags the page depends on.
+    Detail views automatically add the tag of the object they display.
+    """
+    page_cache_tags = []
+
+    def get_page_cache_tags(self):
+        """Return the tags for the page just rendered."""
+        tags = list(self.page_cache_tags)
+        obj = getattr(self, 'object', None)
+        if obj is not None:
+            prefix = PURGE_RULES.get(obj._meta.label, (obj._meta.model_name, None))[0]
+            tags.append(f'{prefix}:{obj.pk}')
+        return tags
+
+    def get_page_cache_meta(self):
+        """Return extra data stored with the cache entry."""
+        return {}
+
+    def page_cache_hit(self, request, response):
+        """Hook called when a response is served from the cache."""
+        pass
+
+    def dispatch(self, request, *args, **kwargs):
+        if not is_cacheable_request(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        response = get_cached_response(request)
+        if response is not None:
+            self.page_cache_hit(request, response)
+            return response
+
+        response = super().dispatch(request, *args, **kwargs)
+        if hasattr(response, 'render') and callable(response.render):
+            response.render()
+        store_response(request, response, self.get_page_cache_tags(), meta=self.get_page_cache_meta())
+        return response
@@ -0,0 +1,241 @@
+"""
+Pagination for public listing pages.
+
+Offset pagination (``?page=7``) makes the database skip every earlier row
+and run a COUNT(*) for the page count, so both get slower as the archive
+grows. This module provides:
+
+- CursorPaginator: keyset pagination on a descending (published_date, id)
+  key. Each page is a single indexed range query, whatever its position.
+  Pages are addressed by signed, opaque cursor tokens (``?cursor=...``),
+  so next/previous links stay stable when posts are added.
+- CachedCountPaginator: Django's Paginator with the total count cached
+  briefly, for listings that still need page numbers (ranked search).
+- CursorPaginationMixin: opt-in ListView mixin switching between the two.
+"""
+
+from django.core import signing
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.http import Http404
+from django.utils.functional import cached_property
+
+from .cache import CacheNamespace, get_ttl
+from .page_cache import normalize_query_string
+from .publishing import cap_timeout
+
+
+list_counts = CacheNamespace('list_counts', timeout='short')
+
+CURSOR_SALT = 'core.pagination.cursor'
+
+
+class InvalidCursor(Exception):
+    """Raised when a cursor token is malformed or has been tampered with."""
+
+
+class CursorPage:
+    """One page of a CursorPaginator."""
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.has_next_page = has_next
+        self.has_previous_page = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self.object_list)} objects>'
+
+    def has_next(self):
+        return self.has_next_page
+
+    def has_previous(self):
+        return self.has_previous_page
+
+    def has_other_pages(self):
+        return self.has_next_page or self.has_previous_page
+
+    @property
+    def next_cursor(self):
+        """Token for the page after this one, or None."""
+        if not self.has_next_page or not self.object_list:
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1], 'next')
+
+    @property
+    def previous_cursor(self):
+        """Token for the page before this one, or None."""
+        if not self.has_previous_page or not self.object_list:
+            return None
+        return self.paginator.encode_cursor(self.object_list[0], 'previous')
+
+
+class CursorPaginator:
+    """
+    Keyset paginator over a descending composite key.
+
+    Args:
+        queryset: The filtered, unordered-or-ordered queryset to page through
+        per_page: Number of objects per page
+        keys: Field names forming a unique key; the last one must be unique
+            on its own (normally the primary key)
+
+    The queryset is re-ordered by the keys, newest first. A page fetches
+    ``per_page + 1`` rows to learn whether another page follows, so no
+    COUNT(*) query is ever run.
+    """
+
+    def __init__(self, queryset, per_page, keys=('published_date', 'id')):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.keys = tuple(keys)
+
+    def encode_cursor(self, obj, direction):
+        """Return a signed token pointing just past ``obj`` in ``direction``."""
+        values = [self._serialize(getattr(obj, key)) for key in self.keys]
+        return signing.dumps({'k': values, 'd': direction[0]}, salt=CURSOR_SALT, compress=True)
+
+    def decode_cursor(self, token):
+        """Return (values, direction) from a token, or raise InvalidCursor."""
+        try:
+            data = signing.loads(token, salt=CURSOR_SALT)
+            values, direction = data['k'], data['d']
+            if len(values) != len(self.keys) or direction not in ('n', 'p'):
+                raise ValueError('Cursor does not match this listing')
+            model = self.queryset.model
+            values = [model._meta.get_field(key).to_python(value) for key, value in zip(self.keys, values)]
+        except Exception as e:
+            raise InvalidCursor(str(e))
+        return values, ('next' if direction == 'n' else 'previous')
+
+    def page(self, token=None):
+        """Return the page for ``token`` (the first page when None)."""
+        descending = [f'-{key}' for key in self.keys]
+        if not token:
+            rows = list(self.queryset.order_by(*descending)[:self.per_page + 1])
+            return CursorPage(rows[:self.per_page], self, len(rows) > self.per_page, False)
+
+        values, direction = self.decode_cursor(token)
+        if direction == 'next':
+            queryset = self.queryset.filter(self._beyond(values, 'lt')).order_by(*descending)
+            rows = list(queryset[:self.per_page + 1])
+            return CursorPage(rows[:self.per_page], self, len(rows) > self.per_page, True)
+
+        queryset = self.queryset.filter(self._beyond(values, 'gt')).order_by(*self.keys)
+        rows = list(queryset[:self.per_page + 1])
+        has_previous = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        rows.reverse()
+        return CursorPage(rows, self, True, has_previous)
+
+    def _beyond(self, values, lookup):
+        """
+        Build the keyset condition for rows past ``values``.
+
+        For keys (a, b): a < x OR (a = x AND b < y), with ``lt`` or ``gt``.
+        """
+        condition = Q()
+        for i, key in enumerate(self.keys):
+            equal = {self.keys[j]: values[j] for j in range(i)}
+            condition |= Q(**equal, **{f'{key}__{lookup}': values[i]})
+        return condition
+
+    @staticmethod
+    def _serialize(value):
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        return value
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator whose total count is cached for a short time.
+
+    Pass ``cache_key`` to identify the listing; queries filtering on the
+    current time would otherwise never produce the same key twice. Counts
+    never outlive the next scheduled publish time.
+    """
+
+    def __init__(self, object_list, per_page, cache_key=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.cache_key = cache_key
+
+    @cached_property
+    def count(self):
+        if self.cache_key is None:
+            return super().count
+        count = list_counts.get(('count', self.cache_key))
+        if count is None:
+            count = Paginator.count.func(self)
+            list_counts.set(('count', self.cache_key), count, cap_timeout(get_ttl(list_counts.timeout)))
+        return count
+
+
+def cursor_query_string(request, token):
+    """Current query string with the page position replaced by ``token``."""
+    query = request.GET.copy()
+    query.pop('page', None)
+    query.pop('cursor', None)
+    if token:
+        query['cursor'] = token
+    return query.urlencode()
+
+
+class CursorPaginationMixin:
+    """
+    ListView mixin enabling cursor pagination.
+
+    Opt in by setting ``cursor_pagination = True``. Requests with a search
+    query (whose results are ordered by relevance, not by date) or an
+    explicit ``?page=`` fall back to offset pagination with a cached count.
+
+    In cursor mode the context gets ``cursor_pagination`` plus the query
+    strings ``next_query`` and ``previous_query`` for building links.
+    """
+    cursor_pagination = False
+    cursor_keys = ('published_date', 'id')
+    paginator_class = CachedCountPaginator
+
+    def use_cursor_pagination(self):
+        if not self.cursor_pagination:
+            return False
+        if self.request.GET.get('search') or self.request.GET.get('page'):
+            return False
+        return True
+
+    def get_paginator(self, queryset, per_page, orphans=0, allow_empty_first_page=True, **kwargs):
+        """Key the cached count on the view and its filters (minus the page)."""
+        query = self.request.GET.copy()
+        query.pop('page', None)
+        kwargs.setdefault('cache_key', (self.__class__.__name__, normalize_query_string(query)))
+        return super().get_paginator(
+            queryset, per_page, orphans=orphans, allow_empty_first_page=allow_empty_first_page, **kwargs
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.use_cursor_pagination():
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = CursorPaginator(queryset, page_size, keys=self.cursor_keys)
+        try:
+            page = paginator.page(self.request.GET.get('cursor'))
+        except InvalidCursor:
+            raise Http404('Invalid page cursor.')
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = context.get('page_obj')
+        context['cursor_pagination'] = isinstance(page, CursorPage)
+        if context['cursor_pagination']:
+            next_cursor = page.next_cursor
+            previous_cursor = page.previous_cursor
+            context['next_query'] = cursor_query_string(self.request, next_cursor) if next_cursor else None
+            context['previous_query'] = cursor_query_string(self.request, previous_cursor) if previous_cursor else None
+        return context
@@ -0,0 +1,127 @@
+"""
+Publish-time-aware cache invalidation.
+
+Blog queries filter on ``published_date__lte=now()``, so their results
+change on their own when a scheduled post's publish time passes. This
+module tracks the next upcoming publish time across all scheduled models
+so that caches stay correct without short TTLs:
+
+- cap_timeout() limits a cache timeout to the seconds remaining until the
+  next publish time, so nothing cached can outlive it
+- publish_due_content() runs at the start of every request (and from
+  ``manage.py publish_scheduled``); once a publish time has passed, one
+  worker purges the page-cache tags of the content that went live
+
+The next publish time is kept in the shared cache and recomputed whenever
+a scheduled model is saved or deleted.
+"""
+
+import logging
+import math
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.apps import apps
+
+from .cache import CacheNamespace
+from .page_cache import purge_tags
+
+
+logger = logging.getLogger('core')
+
+schedule_cache = CacheNamespace('publish_schedule', timeout='long')
+
+# Scheduled models: label -> (date field, filters for live content, tag prefix,
+# extra tags purged when an object goes live)
+SCHEDULED_MODELS = {
+    'blog.BlogPost': ('published_date', {'is_published': True}, 'blogpost', ['feed', 'sitemap']),
+}
+
+# Stored when nothing is scheduled
+NOTHING_SCHEDULED = 0
+
+
+def compute_next_publish_time():
+    """Query the earliest future publish time; returns a timestamp or None."""
+    now = datetime.now(dt_timezone.utc)
+    upcoming = []
+    for label, (date_field, filters, prefix, extra_tags) in SCHEDULED_MODELS.items():
+        model = apps.get_model(label)
+        first = (
+            model.objects.filter(**filters, **{f'{date_field}__gt': now})
+            .order_by(date_field)
+            .values_list(date_field, flat=True)
+            .first()
+        )
+        if first is not None:
+            upcoming.append(first.timestamp())
+    return min(upcoming) if upcoming else None
+
+
+def get_next_publish_time():
+    """Return the next publish time as a timestamp, or None if nothing is scheduled."""
+    value = schedule_cache.get('next')
+    if value is None:
+        value = compute_next_publish_time() or NOTHING_SCHEDULED
+        schedule_cache.set('next', value)
+    return value or None
+
+
+def reset_schedule(**kwargs):
+    """Forget the stored next publish time (connected to saves and deletes)."""
+    schedule_cache.delete('next')
+
+
+def cap_timeout(timeout):
+    """
+    Limit a cache timeout to the time remaining until the next publish.
+
+    Accepts seconds or None (no expiry) and returns seconds or None.
+    """
+    next_at = get_next_publish_time()
+    if next_at is None:
+        return timeout
+    remaining = max(1, math.ceil(next_at - time.time()))
+    if timeout is None:
+        return remaining
+    return min(timeout, remaining)
+
+
+def publish_due_content(**kwargs):
+    """
+    Purge caches for content whose publish time has passed.
+
+    Connected to request_started, so pages are purged before the request
+    that first sees the new content is served. Only one worker performs
+    each purge. Returns the number of objects that went live.
+    """
+    next_at = get_next_publish_time()
+    if next_at is None or next_at > time.time():
+        return 0
+    if not schedule_cache.add(('publishing', next_at), 1, timeout=60):
+        return 0
+
+    try:
+        return purge_published(next_at)
+    except Exception as e:
+        logger.error(f'Failed to purge caches for scheduled content: {e}')
+        return 0
+    finally:
+        reset_schedule()
+
+
+def purge_published(since):
+    """Purge the tags of every object published between ``since`` and now."""
+    start = datetime.fromtimestamp(since, dt_timezone.utc)
+    now = datetime.now(dt_timezone.utc)
+    total = 0
+    for label, (date_field, filters, prefix, extra_tags) in SCHEDULED_MODELS.items():
+        model = apps.get_model(label)
+        pks = list(
+            model.objects.filter(**filters, **{f'{date_field}__gte': start, f'{date_field}__lte': now})
+            .values_list('pk', flat=True)
+        )
+        if pks:
+            purge_tags(f'{prefix}:list', *extra_tags, *[f'{prefix}:{pk}' for pk in pks])
+            total += len(pks)
+    return total
@@ -0,0 +1,189 @@
+"""
+Rate limiting shared by every worker.
+
+Counters kept in a per-process cache multiply the real limit by the number
+of gunicorn workers. Limits here live in the database (core.RateLimitBucket)
+and use the Generic Cell Rate Algorithm: a rate of ``limit`` requests per
+``period`` seconds admits one request every ``period / limit`` seconds, with
+bursts of up to ``limit`` requests. Each client needs a single stored
+timestamp, the theoretical arrival time (TAT) of its next request:
+
+    new_tat = max(tat, now) + period / limit
+    allowed = new_tat - now <= period        (store new_tat only if allowed)
+
+Each check is one INSERT ... ON CONFLICT DO UPDATE ... RETURNING statement,
+so concurrent requests can't both slip under the limit.
+
+Usage:
+    @rate_limit('contact', '5/h', method='POST')
+    def contact(request):
+        ...
+
+Requests over the limit get a 429 response with a Retry-After header.
+"""
+
+import ipaddress
+import random
+import re
+import time
+from collections import namedtuple
+from functools import wraps
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.shortcuts import render
+
+from .models import RateLimitBucket
+
+
+RATE_PATTERN = re.compile(r'^(\d+)/(\d*)([smhd])$')
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+# Share of checks that also delete expired buckets
+PRUNE_PROBABILITY = 0.01
+
+RateLimitResult = namedtuple('RateLimitResult', ['allowed', 'retry_after'])
+
+
+def parse_rate(rate):
+    """
+    Parse a rate such as '5/h' or '10/15m' into (limit, period in seconds).
+    """
+    match = RATE_PATTERN.match(rate)
+    if match is None:
+        raise ValueError(f'Invalid rate {rate!r}; expected e.g. "5/h" or "10/15m"')
+    limit, multiplier, unit = match.groups()
+    return int(limit), int(multiplier or 1) * PERIODS[unit]
+
+
+def client_ip(request):
+    """
+    Return the client's IP address.
+
+    Behind nginx this is X-Real-IP, which nginx sets from the connecting
+    address ($remote_addr) and overwrites whatever the client sent. The
+    header is only honoured when the request comes from one of
+    TRUSTED_PROXIES; anyone reaching gunicorn directly could set it to
+    anything. X-Forwarded-For is never trusted: nginx appends to the value
+    the client supplied, so its first hop is whatever the client chose.
+    """
+    remote_addr = request.META.get('REMOTE_ADDR')
+    if remote_addr not in settings.TRUSTED_PROXIES:
+        return remote_addr
+    real_ip = request.META.get('HTTP_X_REAL_IP', '').strip()
+    if real_ip:
+        try:
+            return str(ipaddress.ip_address(real_ip))
+        except ValueError:
+            pass
+    return remote_addr
+
+
+def _upsert_sql():
+    table = connection.ops.quote_name(RateLimitBucket._meta.db_table)
+    key, tat, allowed = (connection.ops.quote_name(name) for name in ('key', 'tat', 'allowed'))
+    greatest = 'GREATEST' if connection.vendor == 'postgresql' else 'MAX'
+    # Every SET expression sees the row's old values
+    return (
+        f'INSERT INTO {table} ({key}, {tat}, {allowed}) VALUES (%s, %s, %s) '
+        f'ON CONFLICT ({key}) DO UPDATE SET '
+        f'{tat} = CASE WHEN {greatest}({table}.{tat}, %s) + %s - %s <= %s '
+        f'THEN {greatest}({table}.{tat}, %s) + %s ELSE {table}.{tat} END, '
+        f'{allowed} = ({greatest}({table}.{tat}, %s) + %s - %s <= %s) '
+        f'RETURNING {tat}, {allowed}'
+    )
+
+
+def _hit_locked(bucket_key, now, interval, period):
+    """Fallback for databases without INSERT ... RETURNING upserts."""
+    with transaction.atomic():
+        bucket, created = RateLimitBucket.objects.select_for_update().get_or_create(
+            key=bucket_key, defaults={'tat': now + interval}
+        )
+        if created:
+            return bucket.tat, True
+        new_tat = max(bucket.tat, now) + interval
+        bucket.allowed = new_tat - now <= period
+        if bucket.allowed:
+            bucket.tat = new_tat
+        bucket.save(update_fields=['tat', 'allowed'])
+        return bucket.tat, bucket.allowed
+
+
+def hit(scope, key, rate, now=None):
+    """
+    Count one request by ``key`` against ``scope``'s ``rate``.
+
+    Returns RateLimitResult(allowed, retry_after) where retry_after is the
+    number of seconds until the next request would be allowed (0 if this
+    one was).
+    """
+    limit, period = parse_rate(rate)
+    interval = period / limit
+    now = time.time() if now is None else now
+    bucket_key = f'{scope}:{key}'[:255]
+
+    if connection.vendor in ('sqlite', 'postgresql'):
+        with connection.cursor() as cursor:
+            cursor.execute(_upsert_sql(), [
+                bucket_key, now + interval, True,
+                now, interval, now, period, now, interval,
+                now, interval, now, period,
+            ])
+            tat, allowed = cursor.fetchone()
+        allowed = bool(allowed)
+    else:
+        tat, allowed = _hit_locked(bucket_key, now, interval, period)
+
+    if random.random() < PRUNE_PROBABILITY:
+        prune(now)
+
+    if allowed:
+        return RateLimitResult(True, 0)
+    return RateLimitResult(False, max(tat + interval - period - now, 0))
+
+
+def prune(now=None):
+    """Delete buckets of clients back at their full allowance."""
+    now = time.time() if now is None else now
+    return RateLimitBucket.objects.filter(tat__lt=now).delete()[0]
+
+
+def rate_limited(request, result):
+    """The 429 response for a request over its limit."""
+    retry_after = max(int(result.retry_after + 0.999), 1)
+    response = render(
+        request,
+        '429.html',
+        {'retry_after_minutes': (retry_after + 59) // 60, 'page_title': 'Too Many Requests'},
+        status=429,
+    )
+    response['Retry-After'] = str(retry_after)
+    return response
+
+
+def rate_limit(scope, rate, method=None, key=client_ip):
+    """
+    View decorator limiting each client to ``rate`` (e.g. '5/h').
+
+    Args:
+        scope: Name of the limit; views sharing a scope share the allowance
+        rate: '<limit>/<period>' with an s, m, h or d period, optionally
+            multiplied ('10/15m')
+        method: Only count requests with this method (or list of methods)
+        key: Function returning the client key for a request (default: IP)
+    """
+    parse_rate(rate)
+    methods = [method] if isinstance(method, str) else method
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapped(request, *args, **kwargs):
+            if settings.RATELIMIT_ENABLE and (methods is None or request.method in methods):
+                result = hit(scope, key(request), rate)
+                if not result.allowed:
+                    return rate_limited(request, result)
+            return view_func(request, *args, **kwargs)
+        return wrapped
+    return decorator
@@ -0,0 +1,55 @@
+"""
+Signal handlers for core app.
+
+Keeps the cached site context and the anonymous page cache in sync with the
+models they are built from, queues responsive image derivatives for new
+uploads, purges pages when scheduled content goes live, and flushes
+buffered view counts after requests.
+"""
+
+from django.core.signals import request_started, request_finished
+from django.db.models.signals import post_save, post_delete
+from .context_processors import invalidate_site_context
+from .counters import flush_view_counts_if_due
+from .images import IMAGE_FIELDS, images_changed
+from .page_cache import PURGE_RULES, SITE_TAG, get_purge_tags, purge_tags
+from .publishing import SCHEDULED_MODELS, publish_due_content, reset_schedule
+
+
+SITE_CONTEXT_MODELS = [
+    'core.OfficeLocation',
+    'core.Certification',
+    'core.SiteSetting',
+    'services.Service',
+]
+
+
+def site_context_changed(sender, **kwargs):
+    """Invalidate the site context snapshot in every worker."""
+    invalidate_site_context()
+    # Every cached page embeds the site context
+    purge_tags(SITE_TAG)
+
+
+def page_content_changed(sender, instance, **kwargs):
+    """Purge cached pages that render the saved or deleted object."""
+    purge_tags(*get_purge_tags(instance))
+
+
+for model in SITE_CONTEXT_MODELS:
+    post_save.connect(site_context_changed, sender=model, dispatch_uid=f'site_context_save_{model}')
+    post_delete.connect(site_context_changed, sender=model, dispatch_uid=f'site_context_delete_{model}')
+
+for model in PURGE_RULES:
+    post_save.connect(page_content_changed, sender=model, dispatch_uid=f'page_cache_save_{model}')
+    post_delete.connect(page_content_changed, sender=model, dispatch_uid=f'page_cache_delete_{model}')
+
+for model in IMAGE_FIELDS:
+    post_save.connect(images_changed, sender=model, dispatch_uid=f'image_derivatives_{model}')
+
+for model in SCHEDULED_MODELS:
+    post_save.connect(reset_schedule, sender=model, dispatch_uid=f'publish_schedule_save_{model}')
+    post_delete.connect(reset_schedule, sender=model, dispatch_uid=f'publish_schedule_delete_{model}')
+
+request_started.connect(publish_due_content, dispatch_uid='publish_due_content')
+request_finished.connect(flush_view_counts_if_due, dispatch_uid='flush_view_counts')
@@ -0,0 +1,88 @@
+"""
+Content-addressed media storage.
+
+Uploads are stored under the SHA-256 of their content instead of their
+upload name:
+
+    blog/team-photo.JPG  ->  cas/3f/a2/3fa2...c9.jpg
+
+The hash is computed by streaming the upload through the hasher in chunks,
+so large files are never read into memory. Uploading a file that is
+already stored reuses the existing copy, and since a name can never refer
+to different content, nginx serves ``/media/cas/`` with immutable caching
+headers.
+
+Names under PASSTHROUGH_PREFIXES are stored as given: responsive image
+derivatives (core.images) are named after their content-addressed source
+and must keep predictable names.
+
+StaticFilesStorage is the WhiteNoise manifest storage for static files,
+tolerating template references to files that aren't in static/.
+"""
+
+import hashlib
+import os
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage saving files under their SHA-256 content hash."""
+
+    prefix = 'cas'
+    chunk_size = 64 * 1024
+    passthrough_prefixes = ('derivatives/',)
+
+    def is_passthrough(self, name):
+        """Check whether ``name`` is stored under its own name."""
+        return name.replace('\\', '/').startswith(self.passthrough_prefixes)
+
+    def content_hash(self, content):
+        """Return the hex SHA-256 of a File, reading it in chunks."""
+        hasher = hashlib.sha256()
+        for chunk in content.chunks(chunk_size=self.chunk_size):
+            hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def hashed_name(self, name, digest):
+        """Return the content-addressed name for ``digest``, keeping the extension."""
+        ext = os.path.splitext(name)[1].lower()
+        return f'{self.prefix}/{digest[:2]}/{digest[2:4]}/{digest}{ext}'
+
+    def _save(self, name, content):
+        if self.is_passthrough(name):
+            return super()._save(name, content)
+
+        target = self.hashed_name(name, self.content_hash(content))
+        if self.exists(target):
+            # Duplicate upload: reuse the stored copy
+            return target
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        return super()._save(target, content)
+
+
+class StaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """
+    Compressed, hashed static files that don't fail on missing assets.
+
+    The manifest storage raises ValueError for any {% static %} reference
+    to a file that wasn't collected, turning every page that uses it into a
+    500. Templates link a few images that are uploaded to the server by
+    hand (og-image.jpg, favicons, team photos), so those are linked under
+    their plain name instead; every collected file still gets its hashed,
+    cache-forever name.
+    """
+
+    manifest_strict = False
+
+    def hashed_name(self, name, content=None, filename=None):
+        try:
+            return super().hashed_name(name, content, filename)
+        except ValueError:
+            if content is not None:
+                raise
+            return name
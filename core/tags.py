@@ -0,0 +1,52 @@
+"""
+Helpers for normalized tags.
+
+Models keep a comma-separated ``tags`` CharField for editing and mirror it
+into a many-to-many relation to core.Tag through an indexed through-table,
+which is what filters and related-content lookups query.
+"""
+
+from django.utils.text import slugify
+
+
+def parse_tags(value):
+    """
+    Parse a comma-separated tag string.
+
+    Returns a list of (slug, name) tuples in their original order, without
+    duplicates or empty entries.
+    """
+    tags = []
+    seen = set()
+    for name in (value or '').split(','):
+        name = ' '.join(name.split())
+        slug = slugify(name)[:100]
+        if slug and slug not in seen:
+            seen.add(slug)
+            tags.append((slug, name[:100]))
+    return tags
+
+
+def get_or_create_tags(tag_model, parsed):
+    """Return Tag objects for ``parsed`` (slug, name) pairs, creating missing ones."""
+    if not parsed:
+        return []
+    slugs = [slug for slug, name in parsed]
+    existing = {tag.slug: tag for tag in tag_model.objects.filter(slug__in=slugs)}
+    missing = [tag_model(slug=slug, name=name) for slug, name in parsed if slug not in existing]
+    if missing:
+        tag_model.objects.bulk_create(missing, ignore_conflicts=True)
+        existing = {tag.slug: tag for tag in tag_model.objects.filter(slug__in=slugs)}
+    return [existing[slug] for slug in slugs]
+
+
+def sync_tags(instance, value, relation='normalized_tags'):
+    """Point ``instance``'s tag relation at the tags parsed from ``value``."""
+    from .models import Tag
+    tags = get_or_create_tags(Tag, parse_tags(value))
+    getattr(instance, relation).set(tags)
+
+
+def tag_slug(value):
+    """Return the lookup slug for a tag entered by a user."""
+    return slugify(' '.join((value or '').split()))[:100]
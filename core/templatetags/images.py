@@ -0,0 +1,91 @@
+"""
+Template tags for responsive images.
+
+Usage:
+    {% load images %}
+    {% responsive_image case_study 'hero_image' alt=case_study.title class='w-full h-48 object-cover' sizes='(min-width: 1024px) 33vw, 100vw' %}
+
+Emits a <picture> with a WebP source and a JPEG <img> fallback, both with
+``srcset``/``sizes`` built from the derivatives recorded on the object
+(see core.images), plus width/height attributes so the browser reserves
+space before the image loads. Until it loads, the image's dominant color
+and blurred inline placeholder are painted as its background. Images
+without derivatives yet fall back to a plain <img> of the original upload.
+
+Templates needing an image's stored dimensions or color directly can use
+the ``image_meta`` filter:
+    {% with meta=post|image_meta:'featured_image' %}{{ meta.width }}{% endwith %}
+"""
+
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from core.images import derivative_name, get_rendition
+
+
+register = template.Library()
+
+DEFAULT_SIZES = '100vw'
+
+
+def _srcset(storage, rendition, fmt):
+    return ', '.join(
+        f'{storage.url(derivative_name(rendition["source"], width, fmt))} {width}w'
+        for width in rendition['widths']
+    )
+
+
+@register.simple_tag
+def responsive_image(obj, field_name, alt='', sizes=DEFAULT_SIZES, loading='lazy', **attrs):
+    """
+    Render a responsive image for ``obj.<field_name>``.
+
+    Extra keyword arguments become attributes of the <img> element
+    (``class`` included).
+    """
+    file = getattr(obj, field_name, None)
+    if not file:
+        return ''
+
+    extra = format_html_join('', ' {}="{}"', sorted(attrs.items()))
+    rendition = get_rendition(obj, field_name)
+    if rendition is None:
+        return format_html(
+            '<img src="{}" alt="{}" loading="{}" decoding="async"{}>',
+            file.url, alt, loading, extra,
+        )
+
+    storage = file.storage
+    largest = rendition['widths'][-1]
+    height = round(rendition['height'] * largest / rendition['width'])
+    return format_html(
+        '<picture class="contents">'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" loading="{}" decoding="async" style="{}"{}>'
+        '</picture>',
+        _srcset(storage, rendition, 'webp'), sizes,
+        storage.url(derivative_name(rendition['source'], largest, 'jpeg')),
+        _srcset(storage, rendition, 'jpeg'), sizes,
+        largest, height, alt, loading, placeholder_style(rendition), extra,
+    )
+
+
+def placeholder_style(rendition):
+    """Inline CSS painting the dominant color and blurred placeholder behind an image."""
+    styles = []
+    if rendition.get('color'):
+        styles.append(f'background-color:{rendition["color"]}')
+    if rendition.get('placeholder'):
+        styles.append(f'background-image:url({rendition["placeholder"]});background-size:cover;background-position:center')
+    return ';'.join(styles)
+
+
+@register.filter
+def image_meta(obj, field_name):
+    """
+    Return the stored metadata of ``obj.<field_name>``.
+
+    A dict with width, height, color and placeholder (plus the derivative
+    widths), or None when the image hasn't been processed yet.
+    """
+    return get_rendition(obj, field_name)
@@ -0,0 +1,47 @@
+"""
+Test runner for the project.
+
+The default cache is a directory shared by every process (see CACHES in
+settings), so tests using it would read entries left by earlier runs and
+leave files behind. The runner swaps in a local-memory cache for the whole
+run and empties it before every test, so no test sees pages, versions or
+counts cached by another and results don't depend on the order tests run in.
+"""
+
+import unittest
+
+from django.core.cache import caches
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+TEST_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'tawimeridian-tests',
+    }
+}
+
+
+class TestRunner(DiscoverRunner):
+    """DiscoverRunner using TEST_CACHES instead of the configured caches."""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.cache_override = override_settings(CACHES=TEST_CACHES)
+        self.cache_override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.cache_override.disable()
+        super().teardown_test_environment(**kwargs)
+
+    def get_resultclass(self):
+        base = super().get_resultclass() or unittest.TextTestResult
+
+        class CacheClearingResult(base):
+            def startTest(self, test):
+                for cache in caches.all():
+                    cache.clear()
+                super().startTest(test)
+
+        return CacheClearingResult
@@ -0,0 +1,881 @@
+"""
+Tests for the core app.
+"""
+
+import base64
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import BlogImage, BlogPost
+from contact.models import ContactSubmission
+from project_management.models import Organization, OrganizationType
+from services.models import Service
+
+from . import counters, ratelimit
+from .bulk import bulk_update
+from .cache import COMPRESS_MIN_LENGTH, CacheNamespace, make_key, pack, unpack
+from .context_processors import get_site_context, get_site_context_version
+from .exports import export_stream
+from .hyperloglog import HyperLogLog
+from .images import PLACEHOLDER_SIZE, derivative_name, needs_processing
+from .models import RateLimitBucket, SiteSetting
+from .page_cache import tag_versions
+from .pagination import CachedCountPaginator, CursorPaginator, InvalidCursor
+from .publishing import cap_timeout, publish_due_content
+from .storage import ContentAddressedStorage
+from .tags import parse_tags, tag_slug
+from .test_runner import TEST_CACHES
+
+
+class ManifestStaticFilesTests(TestCase):
+    """Pages render with the production (manifest) static storage after collectstatic."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.mkdtemp()
+        cls.settings_override = override_settings(STATIC_ROOT=cls.static_root)
+        cls.settings_override.enable()
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        shutil.rmtree(cls.static_root, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_uses_manifest_storage(self):
+        self.assertEqual(settings.STORAGES['staticfiles']['BACKEND'], 'core.storage.StaticFilesStorage')
+
+    def test_pages_extending_base_render(self):
+        for url in ['/', '/about/', '/services/', '/portfolio/', '/insights/', '/contact/']:
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_existing_assets_use_hashed_names(self):
+        content = self.client.get('/about/').content.decode()
+        self.assertRegex(content, r'/static/css/main\.[0-9a-f]{12}\.css')
+
+    def test_missing_assets_link_plain_names(self):
+        content = self.client.get('/').content.decode()
+        self.assertIn('/static/images/og-image.jpg', content)
+
+
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location, ignore_errors=True)
+        self.storage = ContentAddressedStorage(location=self.location)
+
+    def test_saves_under_content_hash(self):
+        name = self.storage.save('blog/Photo.JPG', ContentFile(b'image data'))
+        self.assertRegex(name, r'^cas/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.jpg$')
+        with self.storage.open(name) as stored:
+            self.assertEqual(stored.read(), b'image data')
+
+    def test_duplicate_uploads_share_one_file(self):
+        first = self.storage.save('a.png', ContentFile(b'same'))
+        second = self.storage.save('b.png', ContentFile(b'same'))
+        other = self.storage.save('c.png', ContentFile(b'different'))
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+
+    def test_derivatives_keep_their_names(self):
+        name = self.storage.save('derivatives/cas/ab/photo-480.webp', ContentFile(b'x'))
+        self.assertEqual(name, 'derivatives/cas/ab/photo-480.webp')
+
+
+@override_settings(RATELIMIT_ENABLE=True)
+class RateLimitTests(TestCase):
+    def test_parse_rate(self):
+        self.assertEqual(ratelimit.parse_rate('5/h'), (5, 3600))
+        self.assertEqual(ratelimit.parse_rate('10/15m'), (10, 900))
+        with self.assertRaises(ValueError):
+            ratelimit.parse_rate('5 per hour')
+
+    def test_allows_burst_then_spaces_requests(self):
+        now = 1000000.0
+        results = [ratelimit.hit('test', 'client', '5/h', now=now) for _ in range(6)]
+        self.assertEqual([result.allowed for result in results], [True] * 5 + [False])
+        # One request is earned back every 12 minutes
+        self.assertAlmostEqual(results[-1].retry_after, 720)
+        self.assertFalse(ratelimit.hit('test', 'client', '5/h', now=now + 719).allowed)
+        self.assertTrue(ratelimit.hit('test', 'client', '5/h', now=now + 721).allowed)
+
+    def test_clients_and_scopes_are_independent(self):
+        now = 1000000.0
+        for _ in range(5):
+            ratelimit.hit('test', 'a', '5/h', now=now)
+        self.assertFalse(ratelimit.hit('test', 'a', '5/h', now=now).allowed)
+        self.assertTrue(ratelimit.hit('test', 'b', '5/h', now=now).allowed)
+        self.assertTrue(ratelimit.hit('other', 'a', '5/h', now=now).allowed)
+
+    def test_prune_removes_recovered_buckets(self):
+        ratelimit.hit('test', 'client', '5/h', now=1000.0)
+        self.assertEqual(ratelimit.prune(now=1000.0), 0)
+        self.assertEqual(ratelimit.prune(now=1000.0 + 3600), 1)
+        self.assertFalse(RateLimitBucket.objects.exists())
+
+    def test_client_ip_ignores_forwarded_for(self):
+        factory = RequestFactory()
+        request = factory.get('/', HTTP_X_FORWARDED_FOR='1.2.3.4', REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(ratelimit.client_ip(request), '10.0.0.1')
+        request = factory.get('/', HTTP_X_REAL_IP='203.0.113.7', HTTP_X_FORWARDED_FOR='1.2.3.4, 203.0.113.7')
+        self.assertEqual(ratelimit.client_ip(request), '203.0.113.7')
+        request = factory.get('/', HTTP_X_REAL_IP='not an ip')
+        self.assertEqual(ratelimit.client_ip(request), '127.0.0.1')
+
+    @override_settings(TRUSTED_PROXIES=['127.0.0.1'])
+    def test_real_ip_only_trusted_from_proxy(self):
+        factory = RequestFactory()
+        request = factory.get('/', HTTP_X_REAL_IP='203.0.113.7', REMOTE_ADDR='198.51.100.9')
+        self.assertEqual(ratelimit.client_ip(request), '198.51.100.9')
+        request = factory.get('/', HTTP_X_REAL_IP='203.0.113.7', REMOTE_ADDR='127.0.0.1')
+        self.assertEqual(ratelimit.client_ip(request), '203.0.113.7')
+
+    def test_direct_clients_cannot_rotate_real_ip(self):
+        statuses = [
+            self.client.post(
+                '/project-management/login/',
+                {'username': 'x', 'password': 'y'},
+                REMOTE_ADDR='198.51.100.9',
+                HTTP_X_REAL_IP=f'203.0.113.{attempt}',
+            ).status_code
+            for attempt in range(11)
+        ]
+        self.assertNotIn(429, statuses[:10])
+        self.assertEqual(statuses[10], 429)
+
+    def test_login_limit_cannot_be_bypassed_with_forwarded_for(self):
+        statuses = [
+            self.client.post(
+                '/project-management/login/',
+                {'username': 'x', 'password': 'y'},
+                HTTP_X_FORWARDED_FOR=f'198.51.100.{attempt}',
+                HTTP_X_REAL_IP='203.0.113.7',
+            ).status_code
+            for attempt in range(11)
+        ]
+        self.assertNotIn(429, statuses[:10])
+        self.assertEqual(statuses[10], 429)
+
+    def test_limited_response_has_retry_after(self):
+        for _ in range(10):
+            self.client.post('/project-management/login/', {'username': 'x', 'password': 'y'})
+        response = self.client.post('/project-management/login/', {'username': 'x', 'password': 'y'})
+        self.assertEqual(response.status_code, 429)
+        # 15 minutes / 10 requests, less the time the earlier requests took
+        self.assertTrue(0 < int(response['Retry-After']) <= 90)
+        self.assertTemplateUsed(response, '429.html')
+
+    @override_settings(RATELIMIT_ENABLE=False)
+    def test_disabled(self):
+        for _ in range(12):
+            response = self.client.post('/project-management/login/', {'username': 'x', 'password': 'y'})
+        self.assertEqual(response.status_code, 200)
+
+
+class TagParsingTests(TestCase):
+    def test_parse_tags(self):
+        self.assertEqual(
+            parse_tags(' Machine  Learning, AI,,machine learning , Kenya Air'),
+            [('machine-learning', 'Machine Learning'), ('ai', 'AI'), ('kenya-air', 'Kenya Air')],
+        )
+        self.assertEqual(parse_tags(''), [])
+
+    def test_tag_slug_matches_parsed_slug(self):
+        self.assertEqual(tag_slug('  Machine learning '), 'machine-learning')
+
+
+class HyperLogLogTests(TestCase):
+    def test_estimates_distinct_values(self):
+        sketch = HyperLogLog()
+        for index in range(20000):
+            sketch.add(f'10.0.{index % 5000 // 256}.{index % 5000 % 256}')
+        self.assertAlmostEqual(sketch.count(), 5000, delta=5000 * 0.1)
+
+    def test_small_counts_are_exact(self):
+        sketch = HyperLogLog()
+        for value in ['a', 'b', 'c', 'a']:
+            sketch.add(value)
+        self.assertEqual(sketch.count(), 3)
+        self.assertEqual(HyperLogLog().count(), 0)
+
+    def test_merge_and_round_trip(self):
+        first, second = HyperLogLog(), HyperLogLog()
+        for index in range(1000):
+            first.add(index)
+            second.add(index + 500)
+        merged = HyperLogLog(bytes(first)).merge(second)
+        self.assertAlmostEqual(merged.count(), 1500, delta=150)
+        with self.assertRaises(ValueError):
+            HyperLogLog(b'short')
+
+
+class CacheNamespaceTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.namespace = CacheNamespace('test', timeout='short')
+
+    def test_tests_run_on_local_memory_cache(self):
+        self.assertEqual(settings.CACHES, TEST_CACHES)
+
+    def test_keys_are_namespaced_and_safe(self):
+        self.assertEqual(make_key('pages', 'home', 2), 'pages:home:2')
+        unsafe = make_key('pages', 'a key with spaces')
+        self.assertRegex(unsafe, r'^pages:h:[0-9a-f]{64}$')
+        self.assertEqual(unsafe, make_key('pages', 'a key with spaces'))
+        self.assertRegex(make_key('pages', 'x' * 300), r'^pages:h:')
+
+    def test_large_values_are_compressed(self):
+        small = {'title': 'Post'}
+        large = 'x' * COMPRESS_MIN_LENGTH
+        self.assertEqual(pack(small)[:1], b'P')
+        self.assertEqual(pack(large)[:1], b'Z')
+        self.assertLess(len(pack(large)), COMPRESS_MIN_LENGTH)
+        self.assertEqual(unpack(pack(small)), small)
+        self.assertEqual(unpack(pack(large)), large)
+        self.assertEqual(pack(5), 5)
+
+    def test_round_trip(self):
+        self.namespace.set(('list', 1), ['a', 'b'])
+        self.assertEqual(self.namespace.get(('list', 1)), ['a', 'b'])
+        self.assertEqual(self.namespace.get_many([('list', 1), 'missing']), {('list', 1): ['a', 'b']})
+        self.assertFalse(self.namespace.add(('list', 1), []))
+        self.namespace.delete(('list', 1))
+        self.assertIsNone(self.namespace.get(('list', 1)))
+
+    def test_get_or_set_computes_once(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return 42
+
+        self.assertEqual(self.namespace.get_or_set('answer', compute), 42)
+        self.assertEqual(self.namespace.get_or_set('answer', compute), 42)
+        self.assertEqual(len(calls), 1)
+
+    def test_namespace_timeout(self):
+        with mock.patch.object(cache, 'set') as cache_set:
+            self.namespace.set('key', 'value')
+            self.namespace.set('key', 'value', timeout=None)
+        self.assertEqual(cache_set.call_args_list[0].args[2], settings.CACHE_TTLS['short'])
+        self.assertIsNone(cache_set.call_args_list[1].args[2])
+
+    def test_incr(self):
+        self.assertEqual(self.namespace.incr('hits'), 1)
+        self.assertEqual(self.namespace.incr('hits', 4), 5)
+        self.assertEqual(self.namespace.get('hits'), 5)
+
+    def test_bump_replaces_version(self):
+        version = self.namespace.version()
+        self.assertEqual(self.namespace.version(), version)
+        self.assertNotEqual(self.namespace.bump(), version)
+        first, second = self.namespace.version('a'), self.namespace.version('b')
+        self.namespace.bump_many(['a', 'b'])
+        self.assertNotEqual(self.namespace.version('a'), first)
+        self.assertNotEqual(self.namespace.version('b'), second)
+
+
+class SiteContextTests(TestCase):
+    def setUp(self):
+        # A new version token, so no snapshot from an earlier test is reused
+        cache.clear()
+
+    def test_invalidated_when_save_commits(self):
+        get_site_context()
+        version = get_site_context_version()
+        with self.captureOnCommitCallbacks() as callbacks:
+            SiteSetting.objects.create(key='company_phone', value='555-0100')
+            # Other workers must not rebuild from rows they cannot see yet
+            self.assertEqual(get_site_context_version(), version)
+            self.assertNotIn('company_phone', get_site_context()['site_settings'])
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(get_site_context_version(), version)
+        self.assertEqual(get_site_context()['site_settings']['company_phone'], '555-0100')
+
+    def test_snapshot_reused_without_queries(self):
+        SiteSetting.objects.create(key='company_phone', value='555-0100')
+        get_site_context()
+        with self.assertNumQueries(0):
+            context = get_site_context()
+        self.assertEqual(context['site_settings'], {'company_phone': '555-0100'})
+
+    def test_rolled_back_save_keeps_version(self):
+        version = get_site_context_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    SiteSetting.objects.create(key='company_phone', value='555-0100')
+                    raise RuntimeError
+        self.assertEqual(get_site_context_version(), version)
+
+
+@override_settings(PAGE_CACHE_ENABLED=True)
+class PagePurgeTests(TestCase):
+    def setUp(self):
+        self.addCleanup(counters.take_pending_counts)
+        self.post = BlogPost.objects.create(
+            title='Post', slug='post', excerpt='Excerpt', content='Content',
+            is_published=True, published_date=timezone.now(),
+        )
+
+    def test_cached_page_purged_when_save_commits(self):
+        url = self.post.get_absolute_url()
+        self.assertEqual(self.client.get(url)['X-Page-Cache'], 'MISS')
+        self.assertEqual(self.client.get(url)['X-Page-Cache'], 'HIT')
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.post.title = 'Renamed'
+            self.post.save()
+            # Still served (and not re-cached) from the old version until the commit
+            self.assertEqual(self.client.get(url)['X-Page-Cache'], 'HIT')
+        for callback in callbacks:
+            callback()
+        response = self.client.get(url)
+        self.assertEqual(response['X-Page-Cache'], 'MISS')
+        self.assertContains(response, 'Renamed')
+
+    def test_hit_runs_no_queries(self):
+        url = self.post.get_absolute_url()
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response['X-Page-Cache'], 'HIT')
+
+    def test_visitors_with_a_session_are_not_cached(self):
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = 'session'
+        response = self.client.get(self.post.get_absolute_url())
+        self.assertFalse(response.has_header('X-Page-Cache'))
+
+    def test_tracking_parameters_share_the_entry(self):
+        self.client.get('/insights/?category=climate')
+        response = self.client.get('/insights/?utm_source=newsletter&category=climate&fbclid=abc')
+        self.assertEqual(response['X-Page-Cache'], 'HIT')
+
+    def test_child_and_site_changes_purge(self):
+        url = self.post.get_absolute_url()
+        self.client.get(url)
+        with mock.patch('core.images.schedule_image'), self.captureOnCommitCallbacks(execute=True):
+            BlogImage.objects.create(blog_post=self.post, image='blog/images/figure.jpg')
+        self.assertEqual(self.client.get(url)['X-Page-Cache'], 'MISS')
+        # Every page renders the site context
+        with self.captureOnCommitCallbacks(execute=True):
+            SiteSetting.objects.create(key='company_phone', value='555-0100')
+        self.assertEqual(self.client.get(url)['X-Page-Cache'], 'MISS')
+
+    def test_bulk_update_purges_once_after_commit(self):
+        version = tag_versions.version('blogpost:list')
+        with self.captureOnCommitCallbacks() as callbacks:
+            bulk_update(BlogPost.objects.all(), is_featured=True)
+            self.assertEqual(tag_versions.version('blogpost:list'), version)
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        self.assertNotEqual(tag_versions.version('blogpost:list'), version)
+        self.assertNotEqual(tag_versions.version(f'blogpost:{self.post.pk}'), version)
+
+    def test_rolled_back_save_does_not_purge(self):
+        version = tag_versions.version('blogpost:list')
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    self.post.save()
+                    raise RuntimeError
+        self.assertEqual(tag_versions.version('blogpost:list'), version)
+
+
+@override_settings(VIEW_COUNT_FLUSH_INTERVAL=0)
+class ViewCounterTests(TestCase):
+    def setUp(self):
+        counters.take_pending_counts()
+        self.addCleanup(counters.take_pending_counts)
+        self.posts = [
+            BlogPost.objects.create(
+                title=f'Post {index}', slug=f'post-{index}', excerpt='Excerpt', content='Content',
+                is_published=True, published_date=timezone.now(),
+            )
+            for index in range(4)
+        ]
+
+    def test_concurrent_views_are_not_lost(self):
+        post = self.posts[0]
+
+        def view():
+            for _ in range(500):
+                counters.record_view(post)
+
+        threads = [threading.Thread(target=view) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(counters.flush_view_counts(), 4000)
+        post.refresh_from_db()
+        self.assertEqual(post.view_count, 4000)
+
+    def test_flush_updates_only_viewed_objects(self):
+        first, second = self.posts[:2]
+        counters.record_view(first)
+        counters.record_view(second)
+        counters.record_view_by_pk('blog.BlogPost', second.pk)
+        with CaptureQueriesContext(connection) as queries:
+            counters.flush_view_counts()
+        # One UPDATE per increment size; nothing reads the other rows
+        self.assertEqual(len(queries), 2)
+        self.assertTrue(all(query['sql'].startswith('UPDATE') for query in queries))
+        self.assertEqual(
+            dict(BlogPost.objects.values_list('slug', 'view_count')),
+            {'post-0': 1, 'post-1': 2, 'post-2': 0, 'post-3': 0},
+        )
+
+    def test_flush_adds_to_current_count(self):
+        post = self.posts[0]
+        counters.record_view(post)
+        # Another worker flushed in the meantime
+        BlogPost.objects.filter(pk=post.pk).update(view_count=10)
+        counters.flush_view_counts()
+        post.refresh_from_db()
+        self.assertEqual(post.view_count, 11)
+        self.assertEqual(counters.flush_view_counts(), 0)
+
+    def test_failed_flush_keeps_counts(self):
+        post = self.posts[0]
+        counters.record_view(post)
+        with mock.patch.object(BlogPost.objects, 'filter', side_effect=RuntimeError('database is locked')):
+            with self.assertRaises(RuntimeError):
+                counters.flush_view_counts()
+        counters.record_view(post)
+        self.assertEqual(counters.flush_view_counts(), 2)
+        post.refresh_from_db()
+        self.assertEqual(post.view_count, 2)
+
+    def test_detail_views_are_counted_after_response(self):
+        post = self.posts[0]
+        for _ in range(3):
+            self.assertEqual(self.client.get(post.get_absolute_url()).status_code, 200)
+        post.refresh_from_db()
+        self.assertEqual(post.view_count, 3)
+
+
+@override_settings(PAGE_CACHE_ENABLED=False)
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(counters.take_pending_counts)
+        now = timezone.now()
+        # Pairs of posts share a publish time, so pages split ties on the id
+        self.posts = [
+            BlogPost.objects.create(
+                title=f'Post {index}', slug=f'post-{index}', excerpt='Excerpt', content='Content',
+                is_published=True, published_date=now - timedelta(days=index // 2),
+            )
+            for index in range(7)
+        ]
+        self.expected = list(BlogPost.objects.order_by('-published_date', '-id'))
+
+    def test_walks_forward_and_back_without_gaps(self):
+        paginator = CursorPaginator(BlogPost.objects.all(), 3)
+        pages = [paginator.page()]
+        while pages[-1].has_next():
+            with self.assertNumQueries(1):
+                pages.append(paginator.page(pages[-1].next_cursor))
+        self.assertEqual([post for page in pages for post in page], self.expected)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+
+        previous = paginator.page(pages[-1].previous_cursor)
+        self.assertEqual(list(previous), list(pages[1]))
+        self.assertTrue(previous.has_previous())
+        first = paginator.page(previous.previous_cursor)
+        self.assertEqual(list(first), list(pages[0]))
+        self.assertFalse(first.has_previous())
+
+    def test_rejects_tampered_cursor(self):
+        paginator = CursorPaginator(BlogPost.objects.all(), 3)
+        token = paginator.page().next_cursor
+        with self.assertRaises(InvalidCursor):
+            paginator.page(token[:-2] + 'xx')
+        self.assertEqual(self.client.get('/insights/', {'cursor': 'bogus'}).status_code, 404)
+
+    def test_list_view_links_pages(self):
+        response = self.client.get('/insights/')
+        self.assertTrue(response.context['cursor_pagination'])
+        self.assertEqual(list(response.context['posts']), self.expected)
+        self.assertIsNone(response.context['next_query'])
+        response = self.client.get('/insights/', {'page': '1'})
+        self.assertFalse(response.context['cursor_pagination'])
+
+    def test_load_more_fragment_does_not_shadow_slugs(self):
+        post = BlogPost.objects.create(
+            title='More', excerpt='Excerpt', content='Content', is_published=True, published_date=timezone.now(),
+        )
+        self.assertEqual(post.slug, 'more')
+        self.assertEqual(self.client.get('/insights/more/').context['post'], post)
+        response = self.client.get(reverse('blog:blog_list_more'))
+        self.assertTemplateUsed(response, 'blog/partials/post_cards.html')
+        self.assertEqual(reverse('portfolio:case_study_list_more'), '/portfolio/cards/more/')
+
+    def test_cached_counts_are_keyed_on_filters(self):
+        first = CachedCountPaginator(BlogPost.objects.all(), 3, cache_key=('list', ''))
+        self.assertEqual(first.count, 7)
+        BlogPost.objects.filter(pk=self.posts[0].pk).delete()
+        with self.assertNumQueries(0):
+            self.assertEqual(CachedCountPaginator(BlogPost.objects.all(), 3, cache_key=('list', '')).count, 7)
+        filtered = CachedCountPaginator(BlogPost.objects.filter(is_featured=True), 3, cache_key=('list', 'featured=true'))
+        self.assertEqual(filtered.count, 0)
+
+
+@override_settings(PAGE_CACHE_ENABLED=True)
+class ScheduledPublishingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def schedule_post(self, delay):
+        with self.captureOnCommitCallbacks(execute=True):
+            return BlogPost.objects.create(
+                title='Scheduled', slug='scheduled', excerpt='Excerpt', content='Content',
+                is_published=True, published_date=timezone.now() + timedelta(seconds=delay),
+            )
+
+    def test_timeouts_are_capped_at_next_publish_time(self):
+        self.assertEqual(cap_timeout(3600), 3600)
+        self.assertIsNone(cap_timeout(None))
+        self.schedule_post(600)
+        self.assertTrue(590 <= cap_timeout(3600) <= 600)
+        self.assertTrue(590 <= cap_timeout(None) <= 600)
+        self.assertEqual(cap_timeout(60), 60)
+
+    def test_nothing_to_publish_before_the_time(self):
+        self.schedule_post(600)
+        self.assertEqual(publish_due_content(), 0)
+
+    def test_cached_list_shows_post_once_it_goes_live(self):
+        self.schedule_post(1)
+        response = self.client.get('/insights/')
+        self.assertNotContains(response, 'Scheduled')
+        self.assertEqual(self.client.get('/insights/')['X-Page-Cache'], 'HIT')
+        version = tag_versions.version('blogpost:list')
+        time.sleep(1.1)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.get('/insights/')
+        self.assertEqual(response['X-Page-Cache'], 'MISS')
+        self.assertContains(response, 'Scheduled')
+        self.assertNotEqual(tag_versions.version('blogpost:list'), version)
+        # Another worker doesn't purge again
+        self.assertEqual(publish_due_content(), 0)
+
+    def test_sitemap_lists_post_once_it_goes_live(self):
+        self.schedule_post(1)
+        self.assertNotContains(self.client.get('/sitemap.xml'), '/insights/scheduled/')
+        version = tag_versions.version('sitemap')
+        time.sleep(1.1)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.get('/sitemap.xml')
+        self.assertContains(response, '/insights/scheduled/')
+        self.assertNotEqual(tag_versions.version('sitemap'), version)
+
+
+class SitemapTests(TestCase):
+    def test_sitemap_is_served_from_cache_until_content_changes(self):
+        response = self.client.get('/sitemap.xml')
+        self.assertContains(response, '/portfolio/')
+        self.assertNotContains(response, '/services/engineering/')
+        with self.assertNumQueries(0):
+            self.client.get('/sitemap.xml')
+        with self.captureOnCommitCallbacks(execute=True):
+            Service.objects.create(
+                title='Engineering', slug='engineering', short_description='Summary',
+                full_description='Description',
+            )
+        self.assertContains(self.client.get('/sitemap.xml'), '/services/engineering/')
+
+    def test_drafts_are_not_listed(self):
+        BlogPost.objects.create(
+            title='Draft', slug='draft', excerpt='Excerpt', content='Content',
+            is_published=False, published_date=timezone.now(),
+        )
+        self.assertNotContains(self.client.get('/sitemap.xml'), '/insights/draft/')
+
+
+def make_jpeg(width, height, color=(200, 30, 30)):
+    """JPEG bytes of a solid image with a small blue square in the corner."""
+    from PIL import Image
+
+    image = Image.new('RGB', (width, height), color)
+    image.paste((20, 40, 220), (0, 0, width // 10, height // 10))
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=90)
+    return buffer.getvalue()
+
+
+class ImageTestMixin:
+    """Stores uploads and their derivatives in a temporary MEDIA_ROOT."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media_override = override_settings(MEDIA_ROOT=self.media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+    def create_service(self, width, height):
+        name = default_storage.save('services/photo.jpg', ContentFile(make_jpeg(width, height)))
+        with self.captureOnCommitCallbacks(execute=True):
+            service = Service.objects.create(
+                title='Engineering', slug='engineering', short_description='Summary',
+                full_description='Description', featured_image=name,
+            )
+        service.refresh_from_db()
+        return service
+
+
+@override_settings(IMAGE_DERIVATIVE_WORKERS=0)
+class ResponsiveImageTests(ImageTestMixin, TestCase):
+    def test_derivatives_built_after_commit(self):
+        service = self.create_service(1000, 500)
+        rendition = service.renditions['featured_image']
+        self.assertEqual(rendition['source'], service.featured_image.name)
+        # Standard widths below the original, then the original; never upscaled
+        self.assertEqual(rendition['widths'], [320, 640, 960, 1000])
+        for width in rendition['widths']:
+            for fmt in ('webp', 'jpeg'):
+                self.assertTrue(default_storage.exists(derivative_name(rendition['source'], width, fmt)))
+        self.assertFalse(needs_processing(service, 'featured_image'))
+
+    def test_derivative_size(self):
+        from PIL import Image
+
+        service = self.create_service(1000, 500)
+        name = derivative_name(service.featured_image.name, 640, 'webp')
+        with default_storage.open(name) as derivative:
+            self.assertEqual(Image.open(derivative).size, (640, 320))
+
+    def test_large_originals_capped_at_largest_width(self):
+        service = self.create_service(2400, 600)
+        self.assertEqual(service.renditions['featured_image']['widths'], [320, 640, 960, 1280, 1920])
+
+    def test_replaced_image_derivatives_removed(self):
+        service = self.create_service(1000, 500)
+        old = derivative_name(service.featured_image.name, 320, 'webp')
+        service.featured_image = default_storage.save('services/other.jpg', ContentFile(make_jpeg(800, 400, (30, 200, 30))))
+        with self.captureOnCommitCallbacks(execute=True):
+            service.save()
+        service.refresh_from_db()
+        self.assertEqual(service.renditions['featured_image']['widths'], [320, 640, 800])
+        self.assertFalse(default_storage.exists(old))
+
+    def test_template_tag_renders_srcset(self):
+        service = self.create_service(1000, 500)
+        html = Template(
+            "{% load images %}{% responsive_image service 'featured_image' alt='Photo' class='hero' %}"
+        ).render(Context({'service': service}))
+        source = service.featured_image.name
+        self.assertIn('<source type="image/webp" srcset="', html)
+        self.assertIn(f'{default_storage.url(derivative_name(source, 320, "webp"))} 320w', html)
+        self.assertIn(f'{default_storage.url(derivative_name(source, 1000, "jpeg"))} 1000w', html)
+        self.assertIn('width="1000" height="500"', html)
+        self.assertIn('class="hero"', html)
+
+    def test_template_tag_falls_back_to_original(self):
+        with mock.patch('core.images.schedule_image'):
+            service = self.create_service(1000, 500)
+        html = Template(
+            "{% load images %}{% responsive_image service 'featured_image' %}"
+        ).render(Context({'service': service}))
+        self.assertNotIn('<picture', html)
+        self.assertIn(f'src="{service.featured_image.url}"', html)
+
+
+@override_settings(IMAGE_DERIVATIVE_WORKERS=0)
+class ImageMetadataTests(ImageTestMixin, TestCase):
+    def test_metadata_stored_with_rendition(self):
+        from PIL import Image
+
+        service = self.create_service(1000, 500)
+        rendition = service.renditions['featured_image']
+        self.assertEqual((rendition['width'], rendition['height']), (1000, 500))
+        self.assertRegex(rendition['color'], r'^#[0-9a-f]{6}$')
+        red, blue = int(rendition['color'][1:3], 16), int(rendition['color'][5:7], 16)
+        # The dominant color is the red background, not the blue corner
+        self.assertGreater(red, 150)
+        self.assertLess(blue, 100)
+
+        prefix = 'data:image/webp;base64,'
+        self.assertTrue(rendition['placeholder'].startswith(prefix))
+        placeholder = Image.open(io.BytesIO(base64.b64decode(rendition['placeholder'][len(prefix):])))
+        self.assertEqual(placeholder.format, 'WEBP')
+        self.assertEqual(placeholder.size, (PLACEHOLDER_SIZE, PLACEHOLDER_SIZE // 2))
+
+    def test_incomplete_metadata_recomputed_without_rebuilding(self):
+        service = self.create_service(1000, 500)
+        rendition = dict(service.renditions['featured_image'])
+        del rendition['color'], rendition['placeholder']
+        Service.objects.filter(pk=service.pk).update(renditions={'featured_image': rendition})
+        service.refresh_from_db()
+        self.assertTrue(needs_processing(service, 'featured_image'))
+
+        derivative = derivative_name(service.featured_image.name, 320, 'webp')
+        with mock.patch('core.images.build_derivatives') as build:
+            call_command('build_image_derivatives', workers=1, stdout=io.StringIO())
+        build.assert_not_called()
+        service.refresh_from_db()
+        self.assertFalse(needs_processing(service, 'featured_image'))
+        self.assertEqual(service.renditions['featured_image']['widths'], rendition['widths'])
+        self.assertTrue(default_storage.exists(derivative))
+
+    def test_template_paints_color_and_placeholder(self):
+        service = self.create_service(1000, 500)
+        rendition = service.renditions['featured_image']
+        html = Template(
+            "{% load images %}{% responsive_image service 'featured_image' %}"
+            "{% with meta=service|image_meta:'featured_image' %}[{{ meta.width }}x{{ meta.height }}]{% endwith %}"
+        ).render(Context({'service': service}))
+        self.assertIn(f'background-color:{rendition["color"]}', html)
+        self.assertIn(f'background-image:url({rendition["placeholder"]})', html)
+        self.assertIn('[1000x500]', html)
+
+
+class ConvertMediaStorageTests(ImageTestMixin, TestCase):
+    def create_legacy_service(self, slug, name, content):
+        path = f'{self.media_root}/{name}'
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as legacy:
+            legacy.write(content)
+        with mock.patch('core.images.schedule_image'):
+            return Service.objects.create(
+                title=slug, slug=slug, short_description='Summary',
+                full_description='Description', featured_image=name,
+            )
+
+    def test_uploads_moved_to_content_hash_names(self):
+        first = self.create_legacy_service('first', 'services/Photo.JPG', b'same bytes')
+        second = self.create_legacy_service('second', 'services/copy.jpg', b'same bytes')
+        third = self.create_legacy_service('third', 'services/other.png', b'other bytes')
+
+        output = io.StringIO()
+        call_command('convert_media_storage', stdout=output)
+        for service in (first, second, third):
+            service.refresh_from_db()
+            self.assertRegex(service.featured_image.name, r'^cas/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.(jpg|png)$')
+            self.assertTrue(default_storage.exists(service.featured_image.name))
+        self.assertEqual(first.featured_image.name, second.featured_image.name)
+        self.assertNotEqual(first.featured_image.name, third.featured_image.name)
+        for old_name in ('services/Photo.JPG', 'services/copy.jpg', 'services/other.png'):
+            self.assertFalse(default_storage.exists(old_name))
+        self.assertIn('Converted 3 file references; 3 files stored as 2 unique files.', output.getvalue())
+
+        # Converted rows are skipped on a second run
+        output = io.StringIO()
+        call_command('convert_media_storage', stdout=output)
+        self.assertIn('Converted 0 file references', output.getvalue())
+
+    def test_dry_run_changes_nothing(self):
+        service = self.create_legacy_service('first', 'services/photo.jpg', b'bytes')
+        output = io.StringIO()
+        call_command('convert_media_storage', dry_run=True, stdout=output)
+        service.refresh_from_db()
+        self.assertEqual(service.featured_image.name, 'services/photo.jpg')
+        self.assertTrue(default_storage.exists('services/photo.jpg'))
+        self.assertIn('1 files would be converted.', output.getvalue())
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        ContactSubmission.objects.create(
+            name='Ada', email='ada@example.com', project_type='other', message='=HYPERLINK("http://evil")',
+        )
+        ContactSubmission.objects.create(
+            name='Zoë', email='zoe@example.com', project_type='other', message='Line one\nline two',
+        )
+        self.agency = OrganizationType.objects.create(name='Agency')
+        Organization.objects.create(name='Water Board', type=self.agency)
+
+    def export(self, queryset, fields=None, fmt='csv', compress=False, chunk_size=1):
+        data = b''.join(export_stream(queryset, fields, fmt, compress, chunk_size))
+        return gzip.decompress(data) if compress else data
+
+    def test_csv_with_bom_and_escaped_formulas(self):
+        data = self.export(ContactSubmission.objects.order_by('pk'), ['name', 'message'])
+        self.assertTrue(data.startswith('\ufeff'.encode('utf-8')))
+        rows = list(csv.reader(io.StringIO(data.decode('utf-8-sig'))))
+        self.assertEqual(rows, [
+            ['name', 'message'],
+            ['Ada', "'=HYPERLINK(\"http://evil\")"],
+            ['Zoë', 'Line one\nline two'],
+        ])
+
+    def test_jsonl_follows_foreign_keys(self):
+        lines = self.export(Organization.objects.all(), ['name', 'type__name', 'created_at'], 'jsonl').splitlines()
+        row = json.loads(lines[0])
+        self.assertEqual((row['name'], row['type__name']), ('Water Board', 'Agency'))
+        self.assertRegex(row['created_at'], r'^\d{4}-\d{2}-\d{2}T')
+
+    def test_gzip_output(self):
+        plain = self.export(ContactSubmission.objects.all(), fmt='jsonl')
+        self.assertEqual(self.export(ContactSubmission.objects.all(), fmt='jsonl', compress=True), plain)
+        self.assertEqual(len(plain.splitlines()), 2)
+        self.assertIn('responded_at', json.loads(plain.splitlines()[0]))
+
+    def test_large_exports_stream_in_pieces(self):
+        ContactSubmission.objects.bulk_create([
+            ContactSubmission(name=f'Person {index}', email='p@example.com', project_type='other', message='x' * 200)
+            for index in range(500)
+        ])
+        chunks = list(export_stream(ContactSubmission.objects.all(), ['name', 'message'], 'csv', chunk_size=100))
+        self.assertGreater(len(chunks), 1)
+        rows = list(csv.reader(io.StringIO(b''.join(chunks).decode('utf-8-sig'))))
+        self.assertEqual(len(rows), 503)
+
+    def test_invalid_fields_and_formats_rejected(self):
+        with self.assertRaisesMessage(ValueError, "has no field 'secret'"):
+            export_stream(ContactSubmission.objects.all(), ['name', 'secret'])
+        with self.assertRaisesMessage(ValueError, 'does not follow a foreign key'):
+            export_stream(Organization.objects.all(), ['name__length'])
+        with self.assertRaises(ValueError):
+            export_stream(ContactSubmission.objects.all(), fmt='xml')
+
+    def test_command_writes_file(self):
+        path = f'{tempfile.mkdtemp()}/organizations.jsonl.gz'
+        self.addCleanup(shutil.rmtree, os.path.dirname(path), ignore_errors=True)
+        call_command(
+            'export', 'project_management.Organization', format='jsonl', fields='name,type__name',
+            gzip=True, output=path, stderr=io.StringIO(),
+        )
+        with gzip.open(path) as exported:
+            self.assertEqual(json.loads(exported.read()), {'name': 'Water Board', 'type__name': 'Agency'})
+        with self.assertRaisesMessage(CommandError, 'is not exportable'):
+            call_command('export', 'auth.User')
+
+    def test_admin_action_streams_selection(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        ada = ContactSubmission.objects.get(name='Ada')
+        response = self.client.post('/admin/contact/contactsubmission/', {
+            'action': 'export_csv', '_selected_action': [ada.pk],
+        })
+        self.assertTrue(response.streaming)
+        self.assertRegex(response['Content-Disposition'], r'attachment; filename="contactsubmission-\d{8}-\d{4}\.csv"')
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode('utf-8-sig'))))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][1], 'Ada')
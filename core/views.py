@@ -8,8 +8,10 @@ from django.shortcuts import render
 from django.conf import settings
 from portfolio.models import CaseStudy
 from services.models import Service
+from .page_cache import cache_anonymous_page
 
 
+@cache_anonymous_page(tags=['casestudy:list', 'service:list'])
 def home(request):
     """
     Home page view.
@@ -48,6 +50,7 @@ def home(request):
     return render(request, 'core/home.html', context)
 
 
+@cache_anonymous_page()
 def about(request):
     """
     About page view.
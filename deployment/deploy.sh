@@ -50,12 +50,23 @@ pip install -r requirements.txt
 
 # Run database migrations
 echo -e "${YELLOW}Running database migrations...${NC}"
+# project_management's tables predate its 0001_initial migration on existing
+# servers: until 0001 is recorded, --fake-initial marks it applied when the
+# tables are already there (and creates them otherwise). Only run it then;
+# migrating to 0001 later would unapply the migrations after it.
+if python manage.py showmigrations project_management | grep '\[ \] 0001_initial' >/dev/null; then
+    python manage.py migrate project_management 0001 --fake-initial --noinput
+fi
 python manage.py migrate --noinput
 
 # Collect static files
 echo -e "${YELLOW}Collecting static files...${NC}"
 python manage.py collectstatic --noinput --clear
 
+# Build capability statement PDFs that are missing or out of date
+echo -e "${YELLOW}Building capability statements...${NC}"
+python manage.py build_capability_statements
+
 # Clear cache (if using caching)
 # python manage.py clear_cache
 
@@ -63,6 +74,16 @@ python manage.py collectstatic --noinput --clear
 echo -e "${YELLOW}Restarting Gunicorn service...${NC}"
 sudo systemctl restart tawimeridian
 
+# Restart the email outbox worker so it runs the new code
+if systemctl cat tawimeridian-mail >/dev/null 2>&1; then
+    sudo systemctl restart tawimeridian-mail
+fi
+
+# Restart the capability statement build worker
+if systemctl cat tawimeridian-capabilities >/dev/null 2>&1; then
+    sudo systemctl restart tawimeridian-capabilities
+fi
+
 # Check service status
 if sudo systemctl is-active --quiet tawimeridian; then
     echo -e "${GREEN}✓ Gunicorn service is running${NC}"
@@ -123,8 +123,15 @@ fi
 echo -e "${YELLOW}Setting up systemd service...${NC}"
 if [ -f "/home/tawimeridian/tawimeridian/deployment/tawimeridian.service" ]; then
     cp /home/tawimeridian/tawimeridian/deployment/tawimeridian.service /etc/systemd/system/
+    cp /home/tawimeridian/tawimeridian/deployment/tawimeridian-mail.service /etc/systemd/system/
+    cp /home/tawimeridian/tawimeridian/deployment/tawimeridian-capabilities.service /etc/systemd/system/
+    cp /home/tawimeridian/tawimeridian/deployment/tawimeridian-prune.service /etc/systemd/system/
+    cp /home/tawimeridian/tawimeridian/deployment/tawimeridian-prune.timer /etc/systemd/system/
     systemctl daemon-reload
     systemctl enable tawimeridian
+    systemctl enable tawimeridian-mail
+    systemctl enable tawimeridian-capabilities
+    systemctl enable tawimeridian-prune.timer
     echo -e "${GREEN}✓ Systemd service configured${NC}"
 else
     echo -e "${YELLOW}⚠ Systemd service file not found. You'll need to copy it manually after deploying code.${NC}"
@@ -141,6 +148,6 @@ echo -e "5. Create superuser: /home/tawimeridian/venv/bin/python manage.py creat
 echo -e "6. Load initial data: /home/tawimeridian/venv/bin/python manage.py load_initial_data"
 echo -e "7. Collect static files: /home/tawimeridian/venv/bin/python manage.py collectstatic --noinput"
 echo -e "8. Copy Nginx config: sudo cp nginx/tawimeridian.conf /etc/nginx/sites-available/tawimeridian"
-echo -e "9. Copy systemd service: sudo cp deployment/tawimeridian.service /etc/systemd/system/"
-echo -e "10. Start services: sudo systemctl start tawimeridian && sudo systemctl reload nginx"
+echo -e "9. Copy systemd units: sudo cp deployment/tawimeridian*.service deployment/tawimeridian-prune.timer /etc/systemd/system/"
+echo -e "10. Start services: sudo systemctl daemon-reload && sudo systemctl enable --now tawimeridian tawimeridian-mail tawimeridian-capabilities tawimeridian-prune.timer && sudo systemctl reload nginx"
 echo -e "11. Set up SSL certificate: sudo certbot --nginx -d tawimeridian.com -d www.tawimeridian.com"
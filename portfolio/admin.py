@@ -4,7 +4,7 @@ Admin configuration for portfolio app.
 
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import CaseStudy, CaseStudyImage, CaseStudyTestimonial
+from .models import CaseStudy, CaseStudyImage, CaseStudyMetric, CaseStudyTestimonial
 
 
 class CaseStudyImageInline(admin.TabularInline):
@@ -23,6 +23,19 @@ class CaseStudyTestimonialInline(admin.TabularInline):
     ordering = ['display_order']
 
 
+class CaseStudyMetricInline(admin.TabularInline):
+    """Read-only inline listing the metrics parsed from impact_metrics."""
+    model = CaseStudyMetric
+    extra = 0
+    fields = ['name', 'value', 'unit', 'raw']
+    readonly_fields = ['name', 'value', 'unit', 'raw']
+    can_delete = False
+    verbose_name_plural = 'Parsed impact metrics'
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(CaseStudy)
 class CaseStudyAdmin(admin.ModelAdmin):
     """Admin interface for case studies."""
@@ -54,7 +67,7 @@ class CaseStudyAdmin(admin.ModelAdmin):
     ]
     list_editable = ['featured', 'published']
     prepopulated_fields = {'slug': ('title',)}
-    readonly_fields = ['created_at', 'updated_at', 'preview_image']
+    readonly_fields = ['created_at', 'updated_at', 'view_count', 'preview_image']
     date_hierarchy = 'published_date'
     
     fieldsets = (
@@ -74,13 +87,17 @@ class CaseStudyAdmin(admin.ModelAdmin):
             'fields': ('meta_title', 'meta_description'),
             'classes': ('collapse',)
         }),
+        ('Engagement', {
+            'fields': ('view_count',),
+            'classes': ('collapse',)
+        }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
     )
     
-    inlines = [CaseStudyImageInline, CaseStudyTestimonialInline]
+    inlines = [CaseStudyImageInline, CaseStudyTestimonialInline, CaseStudyMetricInline]
     
     def preview_image(self, obj):
         """Display image preview in admin."""
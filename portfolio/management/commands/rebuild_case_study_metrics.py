@@ -0,0 +1,19 @@
+"""
+Management command to re-parse the impact metrics of every case study.
+
+Usage: python manage.py rebuild_case_study_metrics
+"""
+
+from django.core.management.base import BaseCommand
+from core.page_cache import purge_tags
+from portfolio.metrics import ROLLUP_TAGS, rebuild_metrics
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the typed case study metric table from impact_metrics'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Parsing case study metrics...')
+        count = rebuild_metrics()
+        purge_tags(*ROLLUP_TAGS)
+        self.stdout.write(self.style.SUCCESS(f'Stored {count} case study metrics.'))
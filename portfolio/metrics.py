@@ -0,0 +1,209 @@
+"""
+Typed index over case study impact metrics.
+
+CaseStudy.impact_metrics is free-form JSON written by editors:
+
+    {"energy_saved": "45%", "cost_reduction": "$50k", "farmers_reached": "1,200+"}
+
+which can't be filtered, sorted or summed in SQL. Every time a case study
+is saved its metrics are parsed into CaseStudyMetric rows holding the
+metric name, its numeric value and unit:
+
+    energy_saved     45       %
+    cost_reduction   50000    USD
+    farmers_reached  1200
+
+Values that aren't numbers are kept with a NULL value so the raw text is
+still searchable. ``metric_rollup`` aggregates one metric across published
+case studies in a single grouped query and caches the result until case
+studies change.
+"""
+
+import re
+from decimal import Decimal, InvalidOperation
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Avg, Count, Max, Min, Sum
+from django.utils.text import slugify
+
+from core.cache import CacheNamespace
+from core.page_cache import get_tag_versions, tags_are_current
+
+
+metric_cache = CacheNamespace('case_study_metrics', timeout='long')
+
+ROLLUP_TAGS = ['casestudy:list']
+
+NAME_MAX_LENGTH = 100
+UNIT_MAX_LENGTH = 20
+RAW_MAX_LENGTH = 200
+
+# Largest magnitude the value column (20 digits, 4 decimal places) can hold
+MAX_VALUE = Decimal('1e16')
+
+NUMBER_PATTERN = re.compile(
+    r'^(?P<prefix>[^\d+\-.]*?)\s*(?P<number>[+\-]?(?:\d[\d,]*(?:\.\d+)?|\.\d+))\s*(?P<suffix>.*)$'
+)
+
+CURRENCY_PREFIXES = {
+    '$': 'USD',
+    'us$': 'USD',
+    'usd': 'USD',
+    '€': 'EUR',
+    'eur': 'EUR',
+    '£': 'GBP',
+    'gbp': 'GBP',
+    'ksh': 'KES',
+    'kes': 'KES',
+}
+
+MULTIPLIERS = {
+    'k': 1000,
+    'thousand': 1000,
+    'm': 1000000,
+    'mm': 1000000,
+    'million': 1000000,
+    'b': 1000000000,
+    'bn': 1000000000,
+    'billion': 1000000000,
+}
+
+
+def metric_name(key):
+    """Normalize a metric key: 'Energy Saved' -> 'energy_saved'."""
+    return slugify(str(key)).replace('-', '_')[:NAME_MAX_LENGTH]
+
+
+def parse_metric(raw):
+    """
+    Parse one metric value into (value, unit).
+
+    Numbers are returned as Decimals; value is None when the metric isn't
+    numeric. Examples:
+        '45%'          -> (Decimal('45'), '%')
+        '$50k'         -> (Decimal('50000'), 'USD')
+        '1,200+ farms' -> (Decimal('1200'), 'farms')
+        '2.5 million'  -> (Decimal('2500000'), '')
+    """
+    if isinstance(raw, bool) or raw is None:
+        return None, ''
+    if isinstance(raw, (int, float)):
+        return _bounded(Decimal(str(raw))), ''
+    if not isinstance(raw, str):
+        return None, ''
+
+    match = NUMBER_PATTERN.match(raw.strip())
+    if match is None:
+        return None, ''
+    try:
+        value = Decimal(match.group('number').replace(',', ''))
+    except InvalidOperation:
+        return None, ''
+
+    # Currency symbols become the unit; other leading text ("over") is dropped
+    unit = CURRENCY_PREFIXES.get(match.group('prefix').strip().lower(), '')
+
+    suffix = match.group('suffix').strip().lstrip('+').strip()
+    word = re.match(r'^([a-zA-Z]+)\b\.?\s*(.*)$', suffix)
+    if word and word.group(1).lower() in MULTIPLIERS:
+        value *= MULTIPLIERS[word.group(1).lower()]
+        suffix = word.group(2)
+    suffix = suffix.strip()
+
+    if suffix.startswith('%'):
+        unit = '%'
+    elif suffix:
+        separator = '' if suffix.startswith('/') else ' '
+        unit = f'{unit}{separator}{suffix.lower()}' if unit else suffix.lower()
+    return _bounded(value), unit[:UNIT_MAX_LENGTH]
+
+
+def _bounded(value):
+    if not value.is_finite() or abs(value) >= MAX_VALUE:
+        return None
+    return value.quantize(Decimal('0.0001'))
+
+
+def build_metrics(case_study, metric_model=None):
+    """Return unsaved CaseStudyMetric rows for a case study's impact_metrics."""
+    metric_model = metric_model or apps.get_model('portfolio', 'CaseStudyMetric')
+    metrics = case_study.impact_metrics if isinstance(case_study.impact_metrics, dict) else {}
+
+    rows = {}
+    for key, raw in metrics.items():
+        name = metric_name(key)
+        if not name or name in rows:
+            continue
+        value, unit = parse_metric(raw)
+        rows[name] = metric_model(
+            case_study_id=case_study.pk,
+            name=name,
+            value=value,
+            unit=unit,
+            raw=str(raw)[:RAW_MAX_LENGTH],
+        )
+    return list(rows.values())
+
+
+def sync_metrics(case_study):
+    """Replace the metric rows of one case study."""
+    CaseStudyMetric = apps.get_model('portfolio', 'CaseStudyMetric')
+    with transaction.atomic():
+        CaseStudyMetric.objects.filter(case_study_id=case_study.pk).delete()
+        CaseStudyMetric.objects.bulk_create(build_metrics(case_study))
+
+
+def rebuild_metrics(case_study_model=None, metric_model=None):
+    """
+    Rebuild the metric rows of every case study. Returns the number stored.
+
+    The model arguments let data migrations pass historical models.
+    """
+    case_study_model = case_study_model or apps.get_model('portfolio', 'CaseStudy')
+    metric_model = metric_model or apps.get_model('portfolio', 'CaseStudyMetric')
+
+    rows = []
+    for case_study in case_study_model.objects.only('id', 'impact_metrics').iterator():
+        rows.extend(build_metrics(case_study, metric_model))
+    with transaction.atomic():
+        metric_model.objects.all().delete()
+        metric_model.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def metric_rollup(name, **filters):
+    """
+    Aggregate one metric across published case studies, per unit.
+
+    Keyword arguments filter the case studies (e.g. client_type='federal',
+    service__slug='energy-systems'). Returns a list of dicts with unit,
+    total, average, minimum, maximum and count, e.g. the total energy saved
+    across federal projects:
+
+        metric_rollup('energy_saved', client_type='federal')
+    """
+    key = (metric_name(name),) + tuple(f'{field}={value}' for field, value in sorted(filters.items()))
+    entry = metric_cache.get(key)
+    if entry is not None and tags_are_current(entry['tags']):
+        return entry['rollup']
+
+    tags = get_tag_versions(ROLLUP_TAGS)
+    CaseStudyMetric = apps.get_model('portfolio', 'CaseStudyMetric')
+    queryset = CaseStudyMetric.objects.filter(
+        name=metric_name(name),
+        value__isnull=False,
+        case_study__published=True,
+        **{f'case_study__{field}': value for field, value in filters.items()}
+    )
+    rollup = list(
+        queryset.values('unit').annotate(
+            total=Sum('value'),
+            average=Avg('value'),
+            minimum=Min('value'),
+            maximum=Max('value'),
+            count=Count('id'),
+        ).order_by('unit')
+    )
+    metric_cache.set(key, {'rollup': rollup, 'tags': tags})
+    return rollup
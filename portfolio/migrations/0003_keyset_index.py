@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0002_casestudy_view_count"),
+        ("services", "0002_service_view_count"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="casestudy",
+            index=models.Index(
+                fields=["published", "-published_date", "-id"],
+                name="portfolio_c_publish_08bf22_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0003_keyset_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="casestudy",
+            name="renditions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Responsive image derivatives by image field (maintained by core.images)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="casestudyimage",
+            name="renditions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Responsive image derivatives by image field (maintained by core.images)",
+            ),
+        ),
+    ]
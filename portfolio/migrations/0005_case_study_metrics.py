@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0004_image_renditions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CaseStudyMetric",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text='Normalized metric key (e.g. "energy_saved")',
+                        max_length=100,
+                    ),
+                ),
+                (
+                    "value",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=4,
+                        help_text="Numeric value, or empty when the metric is not a number",
+                        max_digits=20,
+                        null=True,
+                    ),
+                ),
+                (
+                    "unit",
+                    models.CharField(
+                        blank=True,
+                        help_text='Unit such as "%", "USD" or "tonnes"',
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "raw",
+                    models.CharField(
+                        help_text="Value as entered in impact_metrics", max_length=200
+                    ),
+                ),
+                (
+                    "case_study",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="metrics",
+                        to="portfolio.casestudy",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Case Study Metric",
+                "verbose_name_plural": "Case Study Metrics",
+                "ordering": ["name"],
+                "indexes": [
+                    models.Index(
+                        fields=["name", "value"], name="portfolio_c_name_83241e_idx"
+                    )
+                ],
+                "unique_together": {("case_study", "name")},
+            },
+        ),
+    ]
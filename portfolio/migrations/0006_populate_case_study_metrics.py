@@ -0,0 +1,22 @@
+# Parse impact metrics of existing case studies into CaseStudyMetric rows
+
+from django.db import migrations
+
+
+def populate_metrics(apps, schema_editor):
+    from portfolio.metrics import rebuild_metrics
+    rebuild_metrics(
+        apps.get_model('portfolio', 'CaseStudy'),
+        apps.get_model('portfolio', 'CaseStudyMetric'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0005_case_study_metrics"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_metrics, migrations.RunPython.noop),
+    ]
@@ -89,6 +89,12 @@ class CaseStudy(models.Model):
         upload_to='case_studies/',
         help_text='Main featured image for case study'
     )
+    renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text='Responsive image derivatives by image field (maintained by core.images)'
+    )
     
     # Status & Display
     featured = models.BooleanField(
@@ -115,6 +121,12 @@ class CaseStudy(models.Model):
         help_text='SEO description'
     )
     
+    # Engagement Metrics
+    view_count = models.IntegerField(
+        default=0,
+        help_text='Number of times case study has been viewed'
+    )
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -128,6 +140,7 @@ class CaseStudy(models.Model):
             models.Index(fields=['featured', 'published']),
             models.Index(fields=['client_type', 'published']),
             models.Index(fields=['service', 'published']),
+            models.Index(fields=['published', '-published_date', '-id']),
         ]
 
     def __str__(self):
@@ -163,6 +176,47 @@ class CaseStudy(models.Model):
         return []
 
 
+class CaseStudyMetric(models.Model):
+    """
+    One impact metric of a case study, parsed into a typed value.
+
+    Rows are maintained by portfolio.metrics from CaseStudy.impact_metrics
+    whenever the case study is saved; indexed on (name, value) so metrics
+    can be filtered, sorted and aggregated in SQL.
+    """
+    case_study = models.ForeignKey(
+        CaseStudy,
+        on_delete=models.CASCADE,
+        related_name='metrics'
+    )
+    name = models.CharField(max_length=100, help_text='Normalized metric key (e.g. "energy_saved")')
+    value = models.DecimalField(
+        max_digits=20,
+        decimal_places=4,
+        null=True,
+        blank=True,
+        help_text='Numeric value, or empty when the metric is not a number'
+    )
+    unit = models.CharField(
+        max_length=20,
+        blank=True,
+        help_text='Unit such as "%", "USD" or "tonnes"'
+    )
+    raw = models.CharField(max_length=200, help_text='Value as entered in impact_metrics')
+
+    class Meta:
+        verbose_name = 'Case Study Metric'
+        verbose_name_plural = 'Case Study Metrics'
+        ordering = ['name']
+        unique_together = ['case_study', 'name']
+        indexes = [
+            models.Index(fields=['name', 'value']),
+        ]
+
+    def __str__(self):
+        return f'{self.case_study.title} - {self.name}: {self.raw}'
+
+
 class CaseStudyImage(models.Model):
     """
     Additional images for case studies.
@@ -175,6 +229,12 @@ class CaseStudyImage(models.Model):
         related_name='images'
     )
     image = models.ImageField(upload_to='case_studies/gallery/')
+    renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text='Responsive image derivatives by image field (maintained by core.images)'
+    )
     caption = models.CharField(max_length=200, blank=True)
     alt_text = models.CharField(
         max_length=200,
@@ -0,0 +1,21 @@
+"""
+Signal handlers for portfolio app.
+
+Keeps the typed impact metric table in sync with case studies.
+"""
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from .metrics import sync_metrics
+from .models import CaseStudy
+
+
+@receiver(post_save, sender=CaseStudy)
+def update_metrics(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Re-parse the saved case study's impact metrics when they may have changed."""
+    if raw:
+        # Skip fixture loading; run rebuild_case_study_metrics afterwards
+        return
+    if update_fields is not None and 'impact_metrics' not in update_fields:
+        return
+    sync_metrics(instance)
@@ -0,0 +1,23 @@
+"""
+Template tags for case study metric rollups.
+
+Usage:
+    {% load portfolio_metrics %}
+    {% metric_rollup 'energy_saved' client_type='federal' as energy %}
+    {% for row in energy %}{{ row.total|floatformat:0 }} {{ row.unit }}{% endfor %}
+
+Rollups are computed in SQL and cached (see portfolio.metrics).
+"""
+
+from django import template
+
+from portfolio import metrics
+
+
+register = template.Library()
+
+
+@register.simple_tag(name='metric_rollup')
+def metric_rollup(name, **filters):
+    """Aggregate one metric across published case studies, one row per unit."""
+    return metrics.metric_rollup(name, **filters)
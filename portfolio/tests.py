@@ -0,0 +1,249 @@
+"""
+Tests for the portfolio app.
+"""
+
+from datetime import date
+from decimal import Decimal
+from importlib import import_module
+from io import StringIO
+from unittest import mock
+
+from django.apps import apps
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.http import QueryDict
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+
+from core import counters
+from core.facets import Facet, FacetSet
+from core.generic import QueryBudgetExceeded
+from services.models import Service
+
+from .metrics import metric_rollup, parse_metric
+from .models import CLIENT_TYPES, CaseStudy, CaseStudyImage, CaseStudyMetric, CaseStudyTestimonial
+from .views import CaseStudyDetailView
+
+
+def create_case_study(title, **kwargs):
+    kwargs.setdefault('slug', title.lower().replace(' ', '-'))
+    kwargs.setdefault('client_type', 'federal')
+    kwargs.setdefault('challenge', 'Challenge')
+    kwargs.setdefault('solution', 'Solution')
+    kwargs.setdefault('results', 'Results')
+    kwargs.setdefault('hero_image', 'case_studies/hero.jpg')
+    kwargs.setdefault('published', True)
+    kwargs.setdefault('published_date', date(2026, 1, 1))
+    return CaseStudy.objects.create(title=title, **kwargs)
+
+
+@override_settings(QUERY_BUDGET_MODE='raise', PAGE_CACHE_ENABLED=False)
+class CaseStudyDetailQueryTests(TestCase):
+    def setUp(self):
+        self.addCleanup(counters.take_pending_counts)
+        self.service = Service.objects.create(
+            title='Data Science', slug='data-science', short_description='Short', full_description='Full',
+        )
+        self.case_study = create_case_study('Flood Forecasting', service=self.service)
+        for order in range(3):
+            CaseStudyImage.objects.create(
+                case_study=self.case_study, image=f'case_studies/gallery/{order}.jpg', display_order=order,
+            )
+            CaseStudyTestimonial.objects.create(
+                case_study=self.case_study, quote='Great work', author_name=f'Client {order}', display_order=order,
+            )
+        for index in range(3):
+            create_case_study(f'Same Service {index}', service=self.service)
+            create_case_study(f'Same Client Type {index}')
+
+    def test_detail_stays_within_query_budget(self):
+        response = self.client.get(self.case_study.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['images']), 3)
+        self.assertEqual(len(response.context['testimonials']), 3)
+        related = response.context['related_case_studies']
+        self.assertEqual([case_study.service_id for case_study in related], [self.service.pk] * 2 + [None])
+
+    def test_exceeding_budget_raises(self):
+        CaseStudyDetailView.query_budget = 1
+        self.addCleanup(setattr, CaseStudyDetailView, 'query_budget', 5)
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get(self.case_study.get_absolute_url())
+
+    def test_unpublished_case_study_is_not_found(self):
+        case_study = create_case_study('Draft', published=False)
+        self.assertEqual(self.client.get(case_study.get_absolute_url()).status_code, 404)
+
+
+def option_counts(options):
+    return {option['value']: option['count'] for option in options}
+
+
+@override_settings(PAGE_CACHE_ENABLED=False)
+class CaseStudyFacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.data = Service.objects.create(
+            title='Data Science', slug='data-science', short_description='Short', full_description='Full',
+        )
+        self.water = Service.objects.create(
+            title='Water', slug='water', short_description='Short', full_description='Full',
+        )
+        with mock.patch('core.images.schedule_image'):
+            create_case_study('Federal Data 1', service=self.data)
+            create_case_study('Federal Data 2', service=self.data)
+            create_case_study('Federal Water', service=self.water)
+            create_case_study('State Data', client_type='state', service=self.data)
+            create_case_study('Draft', client_type='state', service=self.water, published=False)
+
+    def facet_set(self, query='', cache_key=None):
+        return FacetSet(
+            CaseStudy.objects.filter(published=True),
+            [
+                Facet('client_type', 'client_type', choices=CLIENT_TYPES),
+                Facet('service', 'service__slug', label_field='service__title'),
+            ],
+            QueryDict(query),
+            cache_key=cache_key,
+            tags=['casestudy:list'],
+        )
+
+    def test_counts_from_one_grouped_query(self):
+        facets = self.facet_set()
+        with self.assertNumQueries(1):
+            counts = facets.counts()
+        client_types = option_counts(counts['client_type'])
+        self.assertEqual(client_types['federal'], 3)
+        self.assertEqual(client_types['state'], 1)
+        self.assertEqual(client_types['corporate'], 0)
+        self.assertEqual(option_counts(counts['service']), {'data-science': 3, 'water': 1})
+        self.assertEqual([option['label'] for option in counts['service']], ['Data Science', 'Water'])
+
+    def test_counts_respect_other_filters_but_not_their_own(self):
+        facets = self.facet_set('client_type=state&service=data-science')
+        counts = facets.counts()
+        # Client type counts are limited to the selected service, and vice versa
+        self.assertEqual(option_counts(counts['client_type'])['federal'], 2)
+        self.assertEqual(option_counts(counts['client_type'])['state'], 1)
+        self.assertEqual(option_counts(counts['service']), {'data-science': 1})
+        self.assertEqual(
+            list(facets.apply(CaseStudy.objects.all()).values_list('title', flat=True)), ['State Data'],
+        )
+
+    def test_option_queries_keep_other_filters(self):
+        counts = self.facet_set('service=water&page=2').counts()
+        federal = next(option for option in counts['client_type'] if option['value'] == 'federal')
+        self.assertEqual(QueryDict(federal['query']).dict(), {'service': 'water', 'client_type': 'federal'})
+        water = next(option for option in counts['service'] if option['value'] == 'water')
+        self.assertTrue(water['selected'])
+        self.assertEqual(water['query'], '')
+
+    def test_cached_counts_invalidated_by_purge(self):
+        self.facet_set(cache_key='tests').counts()
+        with self.assertNumQueries(0):
+            self.facet_set(cache_key='tests').counts()
+
+        with mock.patch('core.images.schedule_image'), self.captureOnCommitCallbacks(execute=True):
+            create_case_study('Corporate Water', client_type='corporate', service=self.water)
+        counts = self.facet_set(cache_key='tests').counts()
+        self.assertEqual(option_counts(counts['client_type'])['corporate'], 1)
+        self.assertEqual(option_counts(counts['service'])['water'], 2)
+
+    def test_list_view_filters_and_shows_counts(self):
+        response = self.client.get('/portfolio/', {'service': 'data-science'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['case_studies']), 3)
+        self.assertEqual(option_counts(response.context['facets']['client_type'])['federal'], 2)
+        self.assertEqual(option_counts(response.context['facets']['service'])['water'], 1)
+
+
+@override_settings(PAGE_CACHE_ENABLED=False)
+class CaseStudyMetricTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch('core.images.schedule_image')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_parse_metric(self):
+        cases = {
+            '45%': (Decimal('45'), '%'),
+            '$50k': (Decimal('50000'), 'USD'),
+            '1,200+ farms': (Decimal('1200'), 'farms'),
+            '2.5 million': (Decimal('2500000'), ''),
+            'KSh 3M': (Decimal('3000000'), 'KES'),
+            '12 tonnes/yr': (Decimal('12'), 'tonnes/yr'),
+            7: (Decimal('7'), ''),
+            'Statewide': (None, ''),
+            True: (None, ''),
+            '99999999999999999999': (None, ''),
+        }
+        for raw, expected in cases.items():
+            with self.subTest(raw=raw):
+                self.assertEqual(parse_metric(raw), expected)
+
+    def test_metrics_follow_impact_metrics(self):
+        case_study = create_case_study('Solar', impact_metrics={'Energy Saved': '45%', 'Reach': 'Statewide'})
+        self.assertEqual(
+            list(case_study.metrics.order_by('name').values_list('name', 'value', 'unit', 'raw')),
+            [('energy_saved', Decimal('45'), '%', '45%'), ('reach', None, '', 'Statewide')],
+        )
+        case_study.impact_metrics = {'energy_saved': '50%'}
+        case_study.save()
+        self.assertEqual(list(case_study.metrics.values_list('name', 'value')), [('energy_saved', Decimal('50'))])
+
+    def test_rollup_per_unit_over_published_case_studies(self):
+        create_case_study('Solar', impact_metrics={'energy_saved': '40%', 'cost_reduction': '$50k'})
+        create_case_study('Wind', impact_metrics={'energy_saved': '20%'}, client_type='state')
+        create_case_study('Hydro', impact_metrics={'energy_saved': '3 GWh'})
+        create_case_study('Draft', impact_metrics={'energy_saved': '90%'}, published=False)
+
+        with self.assertNumQueries(1):
+            rollup = metric_rollup('Energy Saved')
+        self.assertEqual([row['unit'] for row in rollup], ['%', 'gwh'])
+        percent = rollup[0]
+        self.assertEqual((percent['total'], percent['count']), (Decimal('60'), 2))
+        self.assertEqual((percent['minimum'], percent['maximum']), (Decimal('20'), Decimal('40')))
+        self.assertEqual(metric_rollup('energy_saved', client_type='state')[0]['total'], Decimal('20'))
+
+    def test_rollup_cached_until_case_studies_change(self):
+        create_case_study('Solar', impact_metrics={'energy_saved': '40%'})
+        metric_rollup('energy_saved')
+        with self.assertNumQueries(0):
+            metric_rollup('energy_saved')
+        with self.captureOnCommitCallbacks(execute=True):
+            create_case_study('Wind', impact_metrics={'energy_saved': '20%'})
+        self.assertEqual(metric_rollup('energy_saved')[0]['total'], Decimal('60'))
+
+    def test_template_tag(self):
+        create_case_study('Solar', impact_metrics={'energy_saved': '40%'})
+        html = Template(
+            "{% load portfolio_metrics %}{% metric_rollup 'energy_saved' client_type='federal' as energy %}"
+            "{% for row in energy %}{{ row.total|floatformat:0 }}{{ row.unit }}{% endfor %}"
+        ).render(Context())
+        self.assertEqual(html, '40%')
+
+    def test_portfolio_list_shows_impact_summary(self):
+        create_case_study('Solar', impact_metrics={'energy_saved': '40%', 'farmers_reached': '1,200+'})
+        create_case_study('Wind', impact_metrics={'energy_saved': '20%', 'farmers_reached': '800'})
+        create_case_study('Farm', impact_metrics={'farmers_reached': '500'}, client_type='state')
+        response = self.client.get('/portfolio/')
+        self.assertContains(response, '2,500')
+        self.assertContains(response, 'Across 3 projects')
+        self.assertContains(response, 'Average energy saved')
+        self.assertContains(response, '30%')
+        response = self.client.get('/portfolio/', {'client_type': 'state'})
+        self.assertContains(response, 'Across 1 project<')
+        self.assertNotContains(response, 'Average energy saved')
+
+    def test_rebuild_command_and_data_migration(self):
+        case_study = create_case_study('Solar', impact_metrics={'energy_saved': '40%'})
+        CaseStudy.objects.filter(pk=case_study.pk).update(impact_metrics={'energy_saved': '45%', 'homes': '300'})
+        call_command('rebuild_case_study_metrics', stdout=StringIO())
+        self.assertEqual(CaseStudyMetric.objects.count(), 2)
+        self.assertEqual(CaseStudyMetric.objects.get(name='energy_saved').value, Decimal('45'))
+
+        CaseStudyMetric.objects.all().delete()
+        import_module('portfolio.migrations.0006_populate_case_study_metrics').populate_metrics(apps, None)
+        self.assertEqual(CaseStudyMetric.objects.count(), 2)
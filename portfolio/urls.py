@@ -9,5 +9,7 @@ app_name = 'portfolio'
 
 urlpatterns = [
     path('', views.CaseStudyListView.as_view(), name='case_study_list'),
+    # Two segments, so it can't shadow a detail page's slug
+    path('cards/more/', views.CaseStudyListMoreView.as_view(), name='case_study_list_more'),
     path('<slug:slug>/', views.CaseStudyDetailView.as_view(), name='case_study_detail'),
 ]
@@ -4,36 +4,44 @@ Views for portfolio app.
 This module contains views for listing and displaying case studies.
 """
 
-from django.views.generic import ListView, DetailView
-from django.db.models import Q
-from .models import CaseStudy, CLIENT_TYPES
+from django.views.generic import ListView
+from django.db.models import Q, Prefetch
+from core.facets import Facet, FacetSet
+from core.generic import PublicDetailView
+from core.page_cache import AnonymousPageCacheMixin
+from core.pagination import CursorPaginationMixin
+from .models import CaseStudy, CaseStudyImage, CaseStudyTestimonial, CLIENT_TYPES
 
 
-class CaseStudyListView(ListView):
+# Metrics summed in the portfolio's impact summary: (metric name, label)
+HEADLINE_METRICS = [
+    ('energy_saved', 'Energy Saved'),
+    ('cost_reduction', 'Cost Reduction'),
+    ('farmers_reached', 'Farmers Reached'),
+]
+
+
+class CaseStudyListView(CursorPaginationMixin, AnonymousPageCacheMixin, ListView):
     """
     List view for all published case studies.
     
-    Supports filtering by client_type, service, and search.
+    Supports filtering by client_type, service, and search. Pages are
+    addressed by cursor (newest first); search results use numbered pages.
+    Client type and service filters show facet counts (see core.facets).
     """
     model = CaseStudy
     template_name = 'portfolio/list.html'
     context_object_name = 'case_studies'
     paginate_by = 9
+    page_cache_tags = ['casestudy:list']
+    cursor_pagination = True
+    # Render only the case study cards (HTMX "load more" requests)
+    fragment = False
     
     def get_queryset(self):
         """Filter case studies based on query parameters."""
         queryset = CaseStudy.objects.filter(published=True).order_by('-published_date', '-created_at')
         
-        # Filter by client type
-        client_type = self.request.GET.get('client_type')
-        if client_type:
-            queryset = queryset.filter(client_type=client_type)
-        
-        # Filter by service
-        service_slug = self.request.GET.get('service')
-        if service_slug:
-            queryset = queryset.filter(service__slug=service_slug)
-        
         # Filter by featured
         featured = self.request.GET.get('featured')
         if featured == 'true':
@@ -51,7 +59,22 @@ class CaseStudyListView(ListView):
                 Q(client_name__icontains=search_query)
             )
         
-        return queryset
+        # Filter by client type and service (counted before filtering)
+        self.facets = self.get_facets(queryset)
+        return self.facets.apply(queryset)
+    
+    def get_facets(self, queryset):
+        """Client type and service facets over the other active filters."""
+        return FacetSet(
+            queryset,
+            [
+                Facet('client_type', 'client_type', choices=CLIENT_TYPES),
+                Facet('service', 'service__slug', label_field='service__title'),
+            ],
+            self.request.GET,
+            cache_key='portfolio:case_study_list',
+            tags=self.page_cache_tags,
+        )
     
     def get_context_data(self, **kwargs):
         """Add additional context for template."""
@@ -63,6 +86,16 @@ class CaseStudyListView(ListView):
         context['selected_service'] = self.request.GET.get('service', '')
         context['search_query'] = self.request.GET.get('search', '')
         
+        if self.fragment:
+            return context
+        
+        # Result counts for each filter option (one grouped query, cached)
+        context['facets'] = self.facets.counts()
+        context['facet_clear_queries'] = self.facets.clear_queries()
+        
+        # Impact summary rolled up from the typed metric table
+        context['headline_metrics'] = HEADLINE_METRICS
+        
         # Get featured case studies for sidebar or header
         context['featured_case_studies'] = CaseStudy.objects.filter(
             published=True,
@@ -78,7 +111,13 @@ class CaseStudyListView(ListView):
         return context
 
 
-class CaseStudyDetailView(DetailView):
+class CaseStudyListMoreView(CaseStudyListView):
+    """Next page of case study cards for the portfolio's "load more" button."""
+    template_name = 'portfolio/partials/case_study_cards.html'
+    fragment = True
+
+
+class CaseStudyDetailView(PublicDetailView):
     """
     Detail view for individual case studies.
     
@@ -87,8 +126,14 @@ class CaseStudyDetailView(DetailView):
     model = CaseStudy
     template_name = 'portfolio/detail.html'
     context_object_name = 'case_study'
-    slug_field = 'slug'
-    slug_url_kwarg = 'slug'
+    page_cache_tags = ['casestudy:list']
+    select_related = ['service']
+    prefetch_related = [
+        Prefetch('images', queryset=CaseStudyImage.objects.order_by('display_order')),
+        Prefetch('testimonials', queryset=CaseStudyTestimonial.objects.order_by('display_order')),
+    ]
+    # Case study, images, testimonials, same-service and same-client-type case studies
+    query_budget = 5
     
     def get_queryset(self):
         """Only show published case studies."""
@@ -97,13 +142,13 @@ class CaseStudyDetailView(DetailView):
     def get_context_data(self, **kwargs):
         """Add additional context for template."""
         context = super().get_context_data(**kwargs)
-        case_study = self.get_object()
+        case_study = self.object
         
-        # Get related images
-        context['images'] = case_study.images.all().order_by('display_order')
+        # Get related images (prefetched)
+        context['images'] = case_study.images.all()
         
-        # Get testimonials
-        context['testimonials'] = case_study.testimonials.all().order_by('display_order')
+        # Get testimonials (prefetched)
+        context['testimonials'] = case_study.testimonials.all()
         
         # Get related case studies (same service or client type)
         related_queryset = CaseStudy.objects.filter(
@@ -2,9 +2,15 @@
 Admin configuration for Project Management app
 """
 
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.auth.models import User
+from django.utils import timezone
 from django.utils.html import format_html
 from django.urls import reverse
+from core.bulk import bulk_update
+from core.exports import export_action
 from .models import Organization, Contact, ContactInteraction, OrganizationType, ContactCategory
 
 
@@ -35,8 +41,21 @@ class ContactInteractionInline(admin.TabularInline):
     show_change_link = True
 
 
+class OrganizationActionForm(ActionForm):
+    """Values for the organization bulk actions, shown next to the action menu."""
+    status = forms.ChoiceField(choices=[('', 'Status...')] + Organization.STATUS_CHOICES, required=False)
+    priority = forms.ChoiceField(choices=[('', 'Priority...')] + Organization.PRIORITY_CHOICES, required=False)
+    assigned_to = forms.ModelChoiceField(
+        queryset=User.objects.filter(is_staff=True).order_by('username'),
+        required=False,
+        empty_label='Unassigned',
+    )
+
+
 @admin.register(Organization)
 class OrganizationAdmin(admin.ModelAdmin):
+    action_form = OrganizationActionForm
+    actions = ['set_status', 'set_priority', 'reassign', export_action('csv'), export_action('jsonl', compress=True)]
     list_display = ['name', 'type', 'category', 'priority', 'status', 'location', 'contact_count_display', 'assigned_to', 'last_contacted']
     list_filter = ['type', 'category', 'priority', 'status', 'assigned_to']
     search_fields = ['name', 'description', 'location', 'tags']
@@ -67,6 +86,52 @@ class OrganizationAdmin(admin.ModelAdmin):
         return format_html('<a href="{}">{} contacts</a>', url, count)
     contact_count_display.short_description = 'Contacts'
     
+    def _bulk_change(self, request, queryset, field):
+        """
+        Set ``field`` on the selected organizations to the value chosen in
+        the action form, with one UPDATE. Rows already holding the value are
+        left alone, so the count (and updated_at) only covers real changes.
+        """
+        form = self.action_form(request.POST)
+        form.fields['action'].choices = self.get_action_choices(request)
+        if not form.is_valid():
+            self.message_user(request, 'Invalid value for the bulk action.', messages.ERROR)
+            return None
+        value = form.cleaned_data[field]
+        if value in ('', None) and field != 'assigned_to':
+            self.message_user(request, f'Choose a {field} to apply.', messages.WARNING)
+            return None
+        count = bulk_update(
+            queryset.exclude(**{field: value}),
+            **{field: value, 'updated_at': timezone.now()}
+        )
+        return count, value
+    
+    def set_status(self, request, queryset):
+        """Set the status chosen in the action form on the selected organizations."""
+        result = self._bulk_change(request, queryset, 'status')
+        if result:
+            count, status = result
+            self.message_user(request, f'{count} organizations set to {dict(Organization.STATUS_CHOICES)[status]}.')
+    set_status.short_description = 'Set status of selected organizations'
+    
+    def set_priority(self, request, queryset):
+        """Set the priority chosen in the action form on the selected organizations."""
+        result = self._bulk_change(request, queryset, 'priority')
+        if result:
+            count, priority = result
+            self.message_user(request, f'{count} organizations set to {dict(Organization.PRIORITY_CHOICES)[priority]} priority.')
+    set_priority.short_description = 'Set priority of selected organizations'
+    
+    def reassign(self, request, queryset):
+        """Assign the selected organizations to the user chosen in the action form."""
+        result = self._bulk_change(request, queryset, 'assigned_to')
+        if result:
+            count, user = result
+            assignee = (user.get_full_name() or user.username) if user else 'nobody'
+            self.message_user(request, f'{count} organizations assigned to {assignee}.')
+    reassign.short_description = 'Assign selected organizations to user'
+    
     def save_model(self, request, obj, form, change):
         if not change:  # Only set created_by on creation
             obj.created_by = request.user
@@ -75,6 +140,7 @@ class OrganizationAdmin(admin.ModelAdmin):
 
 @admin.register(Contact)
 class ContactAdmin(admin.ModelAdmin):
+    actions = ['mark_active', 'mark_inactive', export_action('csv'), export_action('jsonl', compress=True)]
     list_display = ['get_full_name', 'organization', 'title', 'role', 'email', 'phone', 'is_primary', 'is_active', 'last_contacted']
     list_filter = ['organization', 'role', 'is_primary', 'is_active', 'organization__type', 'organization__category']
     search_fields = ['first_name', 'last_name', 'email', 'phone', 'title', 'organization__name']
@@ -103,6 +169,18 @@ class ContactAdmin(admin.ModelAdmin):
     get_full_name.short_description = 'Name'
     get_full_name.admin_order_field = 'last_name'
     
+    def mark_active(self, request, queryset):
+        """Mark selected contacts as active."""
+        count = bulk_update(queryset.filter(is_active=False), is_active=True, updated_at=timezone.now())
+        self.message_user(request, f'{count} contacts marked as active.')
+    mark_active.short_description = 'Mark selected as active'
+    
+    def mark_inactive(self, request, queryset):
+        """Mark selected contacts as inactive."""
+        count = bulk_update(queryset.filter(is_active=True), is_active=False, updated_at=timezone.now())
+        self.message_user(request, f'{count} contacts marked as inactive.')
+    mark_inactive.short_description = 'Mark selected as inactive'
+    
     def save_model(self, request, obj, form, change):
         if not change:  # Only set created_by on creation
             obj.created_by = request.user
@@ -111,6 +189,7 @@ class ContactAdmin(admin.ModelAdmin):
 
 @admin.register(ContactInteraction)
 class ContactInteractionAdmin(admin.ModelAdmin):
+    actions = [export_action('csv'), export_action('jsonl', compress=True)]
     list_display = ['interaction_type', 'organization', 'contact', 'subject', 'interaction_date', 'next_action', 'created_by']
     list_filter = ['interaction_type', 'interaction_date', 'organization', 'created_by']
     search_fields = ['subject', 'notes', 'organization__name', 'contact__first_name', 'contact__last_name']
@@ -0,0 +1,393 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:39
+
+import django.core.validators
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContactCategory",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+                (
+                    "color",
+                    models.CharField(
+                        default="blue", help_text="CSS color for display", max_length=20
+                    ),
+                ),
+                ("description", models.TextField(blank=True)),
+                ("display_order", models.IntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Contact Category",
+                "verbose_name_plural": "Contact Categories",
+                "ordering": ["display_order", "name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="OrganizationType",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("description", models.TextField(blank=True)),
+                ("display_order", models.IntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Organization Type",
+                "verbose_name_plural": "Organization Types",
+                "ordering": ["display_order", "name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="Contact",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("first_name", models.CharField(max_length=100)),
+                ("last_name", models.CharField(max_length=100)),
+                (
+                    "title",
+                    models.CharField(
+                        blank=True, help_text="Job title or position", max_length=200
+                    ),
+                ),
+                (
+                    "role",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("chairman", "Chairman"),
+                            ("director", "Director"),
+                            ("manager", "Manager"),
+                            ("supervisor", "Supervisor"),
+                            ("coordinator", "Coordinator"),
+                            ("researcher", "Researcher"),
+                            ("officer", "Officer"),
+                            ("representative", "Representative"),
+                            ("other", "Other"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "is_primary",
+                    models.BooleanField(
+                        default=False, help_text="Primary contact for the organization"
+                    ),
+                ),
+                (
+                    "email",
+                    models.EmailField(
+                        blank=True,
+                        max_length=254,
+                        validators=[django.core.validators.EmailValidator()],
+                    ),
+                ),
+                ("phone", models.CharField(blank=True, max_length=50)),
+                ("mobile", models.CharField(blank=True, max_length=50)),
+                ("office_location", models.CharField(blank=True, max_length=200)),
+                (
+                    "notes",
+                    models.TextField(
+                        blank=True,
+                        help_text="Additional information about this contact",
+                    ),
+                ),
+                (
+                    "key_info",
+                    models.TextField(
+                        blank=True,
+                        help_text="Important details, background, connections",
+                    ),
+                ),
+                ("is_active", models.BooleanField(default=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("last_contacted", models.DateTimeField(blank=True, null=True)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="created_contacts",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Contact",
+                "verbose_name_plural": "Contacts",
+                "ordering": ["organization", "is_primary", "last_name", "first_name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="Organization",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=200)),
+                (
+                    "website",
+                    models.URLField(
+                        blank=True, validators=[django.core.validators.URLValidator()]
+                    ),
+                ),
+                (
+                    "email",
+                    models.EmailField(
+                        blank=True,
+                        max_length=254,
+                        validators=[django.core.validators.EmailValidator()],
+                    ),
+                ),
+                ("phone", models.CharField(blank=True, max_length=50)),
+                ("address", models.TextField(blank=True)),
+                (
+                    "location",
+                    models.CharField(
+                        blank=True, help_text="City, County, Country", max_length=200
+                    ),
+                ),
+                (
+                    "description",
+                    models.TextField(blank=True, help_text="Overview and background"),
+                ),
+                (
+                    "key_notes",
+                    models.TextField(
+                        blank=True, help_text="Why contact, key needs, opportunities"
+                    ),
+                ),
+                (
+                    "contact_strategy",
+                    models.TextField(
+                        blank=True, help_text="Recommended approach for engagement"
+                    ),
+                ),
+                (
+                    "priority",
+                    models.CharField(
+                        choices=[
+                            ("critical", "Critical"),
+                            ("high", "High"),
+                            ("medium", "Medium"),
+                            ("low", "Low"),
+                        ],
+                        default="medium",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("active", "Active"),
+                            ("inactive", "Inactive"),
+                            ("prospect", "Prospect"),
+                            ("partner", "Partner"),
+                            ("competitor", "Competitor"),
+                        ],
+                        default="prospect",
+                        max_length=20,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("last_contacted", models.DateTimeField(blank=True, null=True)),
+                (
+                    "tags",
+                    models.CharField(
+                        blank=True,
+                        help_text="Comma-separated tags for filtering",
+                        max_length=500,
+                    ),
+                ),
+                (
+                    "assigned_to",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="assigned_organizations",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="organizations",
+                        to="project_management.contactcategory",
+                    ),
+                ),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="created_organizations",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "type",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="organizations",
+                        to="project_management.organizationtype",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Organization",
+                "verbose_name_plural": "Organizations",
+                "ordering": ["-priority", "name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ContactInteraction",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "interaction_type",
+                    models.CharField(
+                        choices=[
+                            ("email", "Email"),
+                            ("phone", "Phone Call"),
+                            ("meeting", "Meeting"),
+                            ("note", "Note"),
+                            ("proposal", "Proposal Sent"),
+                            ("follow_up", "Follow-up"),
+                            ("other", "Other"),
+                        ],
+                        default="note",
+                        max_length=50,
+                    ),
+                ),
+                ("subject", models.CharField(blank=True, max_length=200)),
+                ("notes", models.TextField(help_text="Details of the interaction")),
+                (
+                    "interaction_date",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "next_action",
+                    models.CharField(
+                        blank=True,
+                        help_text="Next step or follow-up action",
+                        max_length=200,
+                    ),
+                ),
+                ("next_action_date", models.DateField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "contact",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="interactions",
+                        to="project_management.contact",
+                    ),
+                ),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="created_interactions",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "organization",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="interactions",
+                        to="project_management.organization",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Contact Interaction",
+                "verbose_name_plural": "Contact Interactions",
+                "ordering": ["-interaction_date", "-created_at"],
+            },
+        ),
+        migrations.AddField(
+            model_name="contact",
+            name="organization",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="contacts",
+                to="project_management.organization",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="contact",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(
+                    ("email__isnull", False), models.Q(("email", ""), _negated=True)
+                ),
+                fields=("organization", "email"),
+                name="unique_contact_email_per_org",
+            ),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_tag"),
+        ("project_management", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OrganizationTag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "organization",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="organization_tags",
+                        to="project_management.organization",
+                    ),
+                ),
+                (
+                    "tag",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="organization_tags",
+                        to="core.tag",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Organization Tag",
+                "verbose_name_plural": "Organization Tags",
+            },
+        ),
+        migrations.AddField(
+            model_name="organization",
+            name="normalized_tags",
+            field=models.ManyToManyField(
+                blank=True,
+                help_text="Tags parsed from the tags field (kept in sync on save)",
+                related_name="organizations",
+                through="project_management.OrganizationTag",
+                to="core.tag",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="organizationtag",
+            index=models.Index(
+                fields=["tag", "organization"], name="project_man_tag_id_a69d14_idx"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="organizationtag",
+            unique_together={("organization", "tag")},
+        ),
+    ]
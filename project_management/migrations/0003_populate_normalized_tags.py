@@ -0,0 +1,28 @@
+# Parse existing comma-separated tags into normalized Tag rows
+
+from django.db import migrations
+
+
+def populate_tags(apps, schema_editor):
+    from core.tags import parse_tags, get_or_create_tags
+    Tag = apps.get_model('core', 'Tag')
+    Organization = apps.get_model('project_management', 'Organization')
+    OrganizationTag = apps.get_model('project_management', 'OrganizationTag')
+
+    links = []
+    for organization in Organization.objects.exclude(tags='').only('id', 'tags'):
+        for tag in get_or_create_tags(Tag, parse_tags(organization.tags)):
+            links.append(OrganizationTag(organization_id=organization.id, tag_id=tag.id))
+    OrganizationTag.objects.bulk_create(links, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("project_management", "0002_organizationtag"),
+        ("core", "0002_tag"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_tags, migrations.RunPython.noop),
+    ]
@@ -14,6 +14,7 @@ from django.contrib.auth.models import User
 from django.core.validators import URLValidator, EmailValidator
 from django.urls import reverse
 from django.utils import timezone
+from core.tags import sync_tags
 
 
 class OrganizationType(models.Model):
@@ -99,6 +100,13 @@ class Organization(models.Model):
     
     # Additional fields
     tags = models.CharField(max_length=500, blank=True, help_text='Comma-separated tags for filtering')
+    normalized_tags = models.ManyToManyField(
+        'core.Tag',
+        through='OrganizationTag',
+        related_name='organizations',
+        blank=True,
+        help_text='Tags parsed from the tags field (kept in sync on save)'
+    )
     
     class Meta:
         verbose_name = 'Organization'
@@ -111,6 +119,13 @@ class Organization(models.Model):
     def get_absolute_url(self):
         return reverse('project_management:organization_detail', kwargs={'pk': self.pk})
     
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Keep normalized tags in sync with the tags field
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'tags' in update_fields:
+            sync_tags(self, self.tags)
+    
     @property
     def primary_contact(self):
         """Get the primary contact for this organization"""
@@ -122,6 +137,25 @@ class Organization(models.Model):
         return self.contacts.count()
 
 
+class OrganizationTag(models.Model):
+    """
+    Through-table linking organizations to normalized tags
+    """
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='organization_tags')
+    tag = models.ForeignKey('core.Tag', on_delete=models.CASCADE, related_name='organization_tags')
+    
+    class Meta:
+        verbose_name = 'Organization Tag'
+        verbose_name_plural = 'Organization Tags'
+        unique_together = ['organization', 'tag']
+        indexes = [
+            models.Index(fields=['tag', 'organization']),
+        ]
+    
+    def __str__(self):
+        return f"{self.organization.name} - {self.tag.name}"
+
+
 class Contact(models.Model):
     """
     Individual contacts (people) associated with organizations
@@ -1,3 +1,107 @@
+"""
+Tests for the project management app.
+"""
+
+from datetime import timedelta
+from importlib import import_module
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .models import Contact, Organization, OrganizationTag
+
+
+class OrganizationTagTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('staff', password='password')
+        self.client.force_login(self.user)
+        self.ai = Organization.objects.create(name='Data Lab', tags='AI, Research')
+        self.airline = Organization.objects.create(name='Carrier', tags='Kenya Air')
+
+    def list_names(self, **params):
+        response = self.client.get('/project-management/organizations/', params)
+        return [organization.name for organization in response.context['page_obj']]
+
+    def test_tag_filter_matches_whole_tags(self):
+        self.assertEqual(self.list_names(tag='AI'), ['Data Lab'])
+        self.assertEqual(self.list_names(tag='kenya air'), ['Carrier'])
+
+    def test_search_matches_tags_exactly(self):
+        self.assertEqual(self.list_names(search='ai'), ['Data Lab'])
+
+    def test_data_migration_links_existing_tags(self):
+        OrganizationTag.objects.all().delete()
+        migration = import_module('project_management.migrations.0003_populate_normalized_tags')
+        migration.populate_tags(apps, None)
+        self.assertEqual(sorted(self.ai.normalized_tags.values_list('slug', flat=True)), ['ai', 'research'])
+        self.assertEqual(OrganizationTag.objects.count(), 3)
+
+
+class OrganizationBulkActionTests(TestCase):
+    url = '/admin/project_management/organization/'
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(self.admin)
+        self.organizations = [Organization.objects.create(name=f'Organization {index}') for index in range(3)]
+        Organization.objects.filter(pk=self.organizations[0].pk).update(
+            status='active', updated_at=timezone.now() - timedelta(days=1),
+        )
+
+    def run_action(self, action, organizations, **values):
+        data = {'action': action, '_selected_action': [organization.pk for organization in organizations], **values}
+        response = self.client.post(self.url, data, follow=True)
+        return [str(message) for message in response.context['messages']]
+
+    def test_set_status_updates_only_changed_rows(self):
+        before = Organization.objects.get(pk=self.organizations[0].pk).updated_at
+        messages = self.run_action('set_status', self.organizations, status='active')
+        self.assertEqual(messages, ['2 organizations set to Active.'])
+        self.assertEqual(set(Organization.objects.values_list('status', flat=True)), {'active'})
+        # Rows already active keep their timestamp
+        self.assertEqual(Organization.objects.get(pk=self.organizations[0].pk).updated_at, before)
+        self.assertGreater(Organization.objects.get(pk=self.organizations[1].pk).updated_at, before)
+
+    def test_set_priority_requires_a_value(self):
+        messages = self.run_action('set_priority', self.organizations, priority='')
+        self.assertEqual(messages, ['Choose a priority to apply.'])
+        self.assertEqual(set(Organization.objects.values_list('priority', flat=True)), {'medium'})
+        self.assertEqual(self.run_action('set_priority', self.organizations[:2], priority='high'), [
+            '2 organizations set to High priority.',
+        ])
+
+    def test_reassign_and_unassign(self):
+        staff = User.objects.create_user('ada', password='password', is_staff=True)
+        self.assertEqual(self.run_action('reassign', self.organizations, assigned_to=staff.pk), [
+            '3 organizations assigned to ada.',
+        ])
+        self.assertEqual(staff.assigned_organizations.count(), 3)
+        self.assertEqual(self.run_action('reassign', self.organizations[:1], assigned_to=''), [
+            '1 organizations assigned to nobody.',
+        ])
+        self.assertEqual(staff.assigned_organizations.count(), 2)
+
+    def test_action_runs_one_update(self):
+        data = {
+            'action': 'set_status',
+            '_selected_action': [organization.pk for organization in self.organizations],
+            'status': 'partner',
+        }
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.url, data)
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "project_management_organization"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(Organization.objects.filter(status='partner').count(), 3)
 
-# Create your tests here.
+    def test_contact_activation(self):
+        contact = Contact.objects.create(first_name='Ada', last_name='Lovelace', organization=self.organizations[0])
+        response = self.client.post('/admin/project_management/contact/', {
+            'action': 'mark_inactive', '_selected_action': [contact.pk],
+        }, follow=True)
+        self.assertEqual(response.status_code, 200)
+        contact.refresh_from_db()
+        self.assertFalse(contact.is_active)
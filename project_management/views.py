@@ -10,11 +10,14 @@ from django.core.paginator import Paginator
 from django.utils import timezone
 from datetime import timedelta
 from django.contrib import messages
-from .models import Organization, Contact, ContactInteraction, OrganizationType, ContactCategory
+from core.ratelimit import rate_limit
+from core.tags import tag_slug
+from .models import Organization, OrganizationTag, Contact, ContactInteraction, OrganizationType, ContactCategory
 
 
+@rate_limit('login', '10/15m', method='POST')
 def login_view(request):
-    """User login view"""
+    """User login view (10 attempts per 15 minutes per IP)"""
     if request.user.is_authenticated:
         return redirect('project_management:dashboard')
     
@@ -113,13 +116,21 @@ def organizations_list(request):
     if assigned_filter:
         organizations = organizations.filter(assigned_to_id=assigned_filter)
     
+    # Tag matches use the indexed (tag, organization) through-table; a subquery
+    # keeps the contact count annotation from being multiplied by the join
+    tag_filter = request.GET.get('tag')
+    if tag_filter:
+        organizations = organizations.filter(
+            pk__in=OrganizationTag.objects.filter(tag__slug=tag_slug(tag_filter)).values('organization')
+        )
+    
     search_query = request.GET.get('search')
     if search_query:
         organizations = organizations.filter(
             Q(name__icontains=search_query) |
             Q(description__icontains=search_query) |
             Q(location__icontains=search_query) |
-            Q(tags__icontains=search_query)
+            Q(pk__in=OrganizationTag.objects.filter(tag__slug=tag_slug(search_query)).values('organization'))
         )
     
     # Pagination
@@ -147,6 +158,7 @@ def organizations_list(request):
             'priority': priority_filter,
             'status': status_filter,
             'assigned': assigned_filter,
+            'tag': tag_filter,
             'search': search_query,
         }
     }
@@ -32,7 +32,7 @@ class ServiceAdmin(admin.ModelAdmin):
     search_fields = ['title', 'short_description', 'full_description']
     list_editable = ['is_active', 'is_featured', 'display_order']
     prepopulated_fields = {'slug': ('title',)}
-    readonly_fields = ['created_at', 'updated_at', 'preview_image']
+    readonly_fields = ['created_at', 'updated_at', 'view_count', 'preview_image']
     
     fieldsets = (
         ('Basic Information', {
@@ -48,6 +48,10 @@ class ServiceAdmin(admin.ModelAdmin):
             'fields': ('meta_title', 'meta_description'),
             'classes': ('collapse',)
         }),
+        ('Engagement', {
+            'fields': ('view_count',),
+            'classes': ('collapse',)
+        }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
@@ -80,8 +84,9 @@ class ServiceFeatureAdmin(admin.ModelAdmin):
 @admin.register(ServiceCaseStudy)
 class ServiceCaseStudyAdmin(admin.ModelAdmin):
     """Admin interface for service-case study relationships."""
-    list_display = ['service', 'case_study_id', 'display_order']
+    list_display = ['service', 'case_study', 'display_order']
     list_filter = ['service']
-    search_fields = ['service__title']
+    search_fields = ['service__title', 'case_study__title']
     list_editable = ['display_order']
-    raw_id_fields = ['service']
+    list_select_related = ['service', 'case_study']
+    raw_id_fields = ['service', 'case_study']
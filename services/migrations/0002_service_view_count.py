@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("services", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="service",
+            name="view_count",
+            field=models.IntegerField(
+                default=0, help_text="Number of times service page has been viewed"
+            ),
+        ),
+    ]
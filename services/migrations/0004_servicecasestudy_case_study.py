@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0004_image_renditions"),
+        ("services", "0003_image_renditions"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="servicecasestudy",
+            unique_together=set(),
+        ),
+        migrations.RenameField(
+            model_name="servicecasestudy",
+            old_name="case_study_id",
+            new_name="legacy_case_study_id",
+        ),
+        migrations.AlterField(
+            model_name="servicecasestudy",
+            name="legacy_case_study_id",
+            field=models.IntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name="servicecasestudy",
+            name="case_study",
+            field=models.ForeignKey(
+                help_text="Related case study",
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="service_case_studies",
+                to="portfolio.casestudy",
+            ),
+        ),
+    ]
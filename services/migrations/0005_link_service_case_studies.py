@@ -0,0 +1,31 @@
+# Point existing service-case study links at their case study; drop links
+# to case studies that no longer exist
+
+from django.db import migrations
+from django.db.models import F
+
+
+def link_case_studies(apps, schema_editor):
+    CaseStudy = apps.get_model('portfolio', 'CaseStudy')
+    ServiceCaseStudy = apps.get_model('services', 'ServiceCaseStudy')
+
+    ServiceCaseStudy.objects.filter(
+        legacy_case_study_id__in=CaseStudy.objects.values('pk')
+    ).update(case_study_id=F('legacy_case_study_id'))
+    ServiceCaseStudy.objects.filter(case_study__isnull=True).delete()
+
+
+def unlink_case_studies(apps, schema_editor):
+    ServiceCaseStudy = apps.get_model('services', 'ServiceCaseStudy')
+    ServiceCaseStudy.objects.update(legacy_case_study_id=F('case_study_id'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("services", "0004_servicecasestudy_case_study"),
+    ]
+
+    operations = [
+        migrations.RunPython(link_case_studies, unlink_case_studies),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0004_image_renditions"),
+        ("services", "0005_link_service_case_studies"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="servicecasestudy",
+            name="legacy_case_study_id",
+        ),
+        migrations.AlterField(
+            model_name="servicecasestudy",
+            name="case_study",
+            field=models.ForeignKey(
+                help_text="Related case study",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="service_case_studies",
+                to="portfolio.casestudy",
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="servicecasestudy",
+            unique_together={("service", "case_study")},
+        ),
+    ]
@@ -43,6 +43,12 @@ class Service(models.Model):
         null=True,
         help_text='Featured image for service page'
     )
+    renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text='Responsive image derivatives by image field (maintained by core.images)'
+    )
     
     # Organization
     display_order = models.IntegerField(
@@ -70,6 +76,12 @@ class Service(models.Model):
         help_text='SEO description (defaults to short_description if not set)'
     )
     
+    # Engagement Metrics
+    view_count = models.IntegerField(
+        default=0,
+        help_text='Number of times service page has been viewed'
+    )
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -144,15 +156,19 @@ class ServiceCaseStudy(models.Model):
     and services to show related case studies.
     """
     service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name='service_case_studies')
-    # Will reference portfolio.CaseStudy when that app is created
-    case_study_id = models.IntegerField(help_text='ID of related case study')
+    case_study = models.ForeignKey(
+        'portfolio.CaseStudy',
+        on_delete=models.CASCADE,
+        related_name='service_case_studies',
+        help_text='Related case study'
+    )
     display_order = models.IntegerField(default=0)
 
     class Meta:
         verbose_name = 'Service Case Study'
         verbose_name_plural = 'Service Case Studies'
         ordering = ['display_order']
-        unique_together = ['service', 'case_study_id']
+        unique_together = ['service', 'case_study']
 
     def __str__(self):
-        return f'{self.service.title} - Case Study {self.case_study_id}'
+        return f'{self.service.title} - {self.case_study.title}'
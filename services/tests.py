@@ -0,0 +1,108 @@
+"""
+Tests for the services app.
+"""
+
+from datetime import date
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from core import counters
+from core.generic import QueryBudgetExceeded
+from portfolio.models import CaseStudy
+
+from .models import Service, ServiceCaseStudy, ServiceFeature
+from .views import ServiceDetailView
+
+
+def create_service(title, **kwargs):
+    kwargs.setdefault('slug', title.lower().replace(' ', '-'))
+    kwargs.setdefault('short_description', f'{title} summary')
+    kwargs.setdefault('full_description', f'{title} description')
+    return Service.objects.create(title=title, **kwargs)
+
+
+@override_settings(QUERY_BUDGET_MODE='raise', PAGE_CACHE_ENABLED=False)
+class ServiceDetailQueryTests(TestCase):
+    def setUp(self):
+        self.addCleanup(counters.take_pending_counts)
+        self.service = create_service('Engineering')
+        for order in range(4):
+            ServiceFeature.objects.create(
+                service=self.service, title=f'Feature {order}', description='Description', display_order=order,
+            )
+            case_study = CaseStudy.objects.create(
+                title=f'Project {order}', slug=f'project-{order}', client_type='federal',
+                challenge='Challenge', solution='Solution', results='Results', hero_image='case_studies/hero.jpg',
+                published=order != 0, published_date=date(2026, 1, 1),
+            )
+            ServiceCaseStudy.objects.create(service=self.service, case_study=case_study, display_order=order)
+        for index in range(4):
+            create_service(f'Other {index}')
+
+    def test_detail_stays_within_query_budget(self):
+        response = self.client.get(self.service.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['features']), 4)
+        # Unpublished case studies are left out
+        self.assertEqual(
+            [case_study.slug for case_study in response.context['related_case_studies']],
+            ['project-1', 'project-2', 'project-3'],
+        )
+        self.assertEqual(len(response.context['other_services']), 3)
+
+    def test_exceeding_budget_raises(self):
+        ServiceDetailView.query_budget = 1
+        self.addCleanup(setattr, ServiceDetailView, 'query_budget', 4)
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get(self.service.get_absolute_url())
+
+    def test_inactive_service_is_not_found(self):
+        service = create_service('Retired', is_active=False)
+        self.assertEqual(self.client.get(service.get_absolute_url()).status_code, 404)
+
+
+class CaseStudyForeignKeyMigrationTests(TransactionTestCase):
+    """0005 copies the old integer column into the foreign key."""
+
+    before = [('services', '0004_servicecasestudy_case_study')]
+    after = [('services', '0005_link_service_case_studies')]
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        self.addCleanup(self.migrate_to_latest)
+        self.apps = executor.loader.project_state(self.before).apps
+
+    def migrate_to_latest(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_links_copied_and_dangling_links_dropped(self):
+        Service = self.apps.get_model('services', 'Service')
+        ServiceCaseStudy = self.apps.get_model('services', 'ServiceCaseStudy')
+        CaseStudy = self.apps.get_model('portfolio', 'CaseStudy')
+        service = Service.objects.create(
+            title='Engineering', slug='engineering', short_description='Short', full_description='Full',
+        )
+        case_study = CaseStudy.objects.create(
+            title='Project', slug='project', client_type='federal', challenge='Challenge',
+            solution='Solution', results='Results', hero_image='case_studies/hero.jpg',
+            published=True, published_date=date(2026, 1, 1),
+        )
+        ServiceCaseStudy.objects.create(service=service, legacy_case_study_id=case_study.pk, display_order=0)
+        ServiceCaseStudy.objects.create(service=service, legacy_case_study_id=case_study.pk + 100, display_order=1)
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+        ServiceCaseStudy = executor.loader.project_state(self.after).apps.get_model('services', 'ServiceCaseStudy')
+        self.assertEqual(
+            list(ServiceCaseStudy.objects.values_list('case_study_id', 'display_order')), [(case_study.pk, 0)],
+        )
+
+        # Reversing restores the integer column
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        ServiceCaseStudy = executor.loader.project_state(self.before).apps.get_model('services', 'ServiceCaseStudy')
+        self.assertEqual(list(ServiceCaseStudy.objects.values_list('legacy_case_study_id', flat=True)), [case_study.pk])
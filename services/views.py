@@ -4,12 +4,14 @@ Views for services app.
 This module contains views for listing and displaying services.
 """
 
-from django.views.generic import ListView, DetailView
-from django.db.models import Q
-from .models import Service
+from django.views.generic import ListView
+from django.db.models import Q, Prefetch
+from core.generic import PublicDetailView
+from core.page_cache import AnonymousPageCacheMixin
+from .models import Service, ServiceFeature, ServiceCaseStudy
 
 
-class ServiceListView(ListView):
+class ServiceListView(AnonymousPageCacheMixin, ListView):
     """
     List view for all active services.
     
@@ -20,6 +22,7 @@ class ServiceListView(ListView):
     template_name = 'services/list.html'
     context_object_name = 'services'
     paginate_by = 12
+    page_cache_tags = ['service:list']
     
     def get_queryset(self):
         """Filter services based on query parameters."""
@@ -56,7 +59,7 @@ class ServiceListView(ListView):
         return context
 
 
-class ServiceDetailView(DetailView):
+class ServiceDetailView(PublicDetailView):
     """
     Detail view for individual service pages.
     
@@ -65,8 +68,18 @@ class ServiceDetailView(DetailView):
     model = Service
     template_name = 'services/detail.html'
     context_object_name = 'service'
-    slug_field = 'slug'
-    slug_url_kwarg = 'slug'
+    page_cache_tags = ['service:list', 'casestudy:list']
+    prefetch_related = [
+        Prefetch('features', queryset=ServiceFeature.objects.order_by('display_order')),
+        Prefetch(
+            'service_case_studies',
+            queryset=ServiceCaseStudy.objects.filter(
+                case_study__published=True
+            ).select_related('case_study').order_by('display_order'),
+        ),
+    ]
+    # Service, features, related case studies, other services
+    query_budget = 4
     
     def get_queryset(self):
         """Only show active services."""
@@ -75,13 +88,15 @@ class ServiceDetailView(DetailView):
     def get_context_data(self, **kwargs):
         """Add additional context for template."""
         context = super().get_context_data(**kwargs)
-        service = self.get_object()
+        service = self.object
         
-        # Get service features
-        context['features'] = service.features.all().order_by('display_order')
+        # Get service features (prefetched)
+        context['features'] = service.features.all()
         
-        # Get related case studies (will be implemented when portfolio app is ready)
-        # context['related_case_studies'] = service.case_studies.all()[:3]
+        # Get related case studies (prefetched with their case study)
+        context['related_case_studies'] = [
+            link.case_study for link in service.service_case_studies.all()
+        ][:3]
         
         # SEO metadata
         context['page_title'] = service.display_title
@@ -104,6 +104,80 @@ DATABASES = {
     )
 }
 
+# Cache
+# All gunicorn workers must share one cache so that page caches, counters
+# and invalidation tokens agree across processes. CACHE_BACKEND selects:
+#   'file'   - file-based cache in CACHE_LOCATION (default, no extra services)
+#   'redis'  - Redis-compatible server, e.g. CACHE_LOCATION=unix:///run/redis/redis.sock
+#   'locmem' - per-process memory (single-process development only)
+CACHE_BACKEND = env('CACHE_BACKEND', default='file')
+CACHE_BACKENDS = {
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+}
+CACHE_LOCATIONS = {
+    'file': str(BASE_DIR / 'cache'),
+    'redis': 'unix:///run/redis/redis.sock',
+    'locmem': 'tawimeridian',
+}
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': env('CACHE_LOCATION', default=CACHE_LOCATIONS[CACHE_BACKEND]),
+        'KEY_PREFIX': env('CACHE_KEY_PREFIX', default='tawimeridian'),
+        'TIMEOUT': 300,
+    }
+}
+if CACHE_BACKEND == 'file':
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': 10000}
+
+# Tests run against a local-memory cache instead (see core.test_runner)
+TEST_RUNNER = 'core.test_runner.TestRunner'
+
+# Default TTLs (seconds) for core.cache namespaces
+CACHE_TTLS = {
+    'short': 60,
+    'default': 300,
+    'long': 60 * 60,
+    'day': 60 * 60 * 24,
+}
+
+# Full-page cache for anonymous visitors (see core.page_cache)
+PAGE_CACHE_ENABLED = env.bool('PAGE_CACHE_ENABLED', default=not DEBUG)
+PAGE_CACHE_TIMEOUT = env.int('PAGE_CACHE_TIMEOUT', default=60 * 60)
+
+# Buffered view counters (see core.counters): seconds between each worker's
+# database flushes
+VIEW_COUNT_FLUSH_INTERVAL = env.int('VIEW_COUNT_FLUSH_INTERVAL', default=60)
+
+# Per-view query budgets (see core.generic.QueryBudgetMixin): 'off', 'warn' or 'raise'
+QUERY_BUDGET_MODE = env('QUERY_BUDGET_MODE', default='warn' if DEBUG else 'off')
+
+# Responsive image derivatives (see core.images): background processes
+# resizing uploads; 0 builds derivatives during the request instead
+IMAGE_DERIVATIVE_WORKERS = env.int('IMAGE_DERIVATIVE_WORKERS', default=2)
+
+# Capability statement PDFs (see contact.views.capability_download). Behind
+# nginx, set CAPABILITY_ACCEL_REDIRECT to the internal location aliasing
+# CAPABILITY_STATEMENTS_DIR (e.g. /internal/capabilities/) so nginx sends the
+# file; when empty, Django streams it. Statements are generated into
+# CAPABILITY_STATEMENTS_DIR/generated/ (see contact.capabilities) by the
+# build_capability_statements --watch worker, or after the saving request's
+# transaction commits when BACKGROUND is off (no worker running).
+# The directory is kept out of static/ so collectstatic doesn't publish it.
+CAPABILITY_STATEMENTS_DIR = Path(env('CAPABILITY_STATEMENTS_DIR', default=str(BASE_DIR / 'capabilities')))
+CAPABILITY_ACCEL_REDIRECT = env('CAPABILITY_ACCEL_REDIRECT', default='')
+CAPABILITY_STATEMENTS_BACKGROUND = env.bool('CAPABILITY_STATEMENTS_BACKGROUND', default=True)
+
+# Capability download tracking (see contact.tracking): each worker writes its
+# buffered downloads once it holds BATCH_SIZE of them or the oldest is
+# FLUSH_INTERVAL seconds old. prune_capability_downloads deletes raw rows
+# after RETENTION_DAYS; the daily rollup keeps the totals.
+CAPABILITY_DOWNLOAD_BATCH_SIZE = env.int('CAPABILITY_DOWNLOAD_BATCH_SIZE', default=50)
+CAPABILITY_DOWNLOAD_FLUSH_INTERVAL = env.int('CAPABILITY_DOWNLOAD_FLUSH_INTERVAL', default=60)
+CAPABILITY_DOWNLOAD_RETENTION_DAYS = env.int('CAPABILITY_DOWNLOAD_RETENTION_DAYS', default=90)
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 AUTH_PASSWORD_VALIDATORS = [
@@ -136,13 +210,24 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
 
-# WhiteNoise configuration for static files
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
-
 # Media files (user uploads)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# File storage backends
+# Uploads are stored under their content hash (see core.storage), so
+# duplicates are deduplicated and /media/cas/ can be cached as immutable.
+# WhiteNoise serves compressed, hashed static files (see
+# core.storage.StaticFilesStorage for assets missing from static/).
+STORAGES = {
+    'default': {
+        'BACKEND': env('DEFAULT_FILE_STORAGE', default='core.storage.ContentAddressedStorage'),
+    },
+    'staticfiles': {
+        'BACKEND': 'core.storage.StaticFilesStorage',
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -157,6 +242,14 @@ EMAIL_HOST_PASSWORD = env('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = env('DEFAULT_FROM_EMAIL', default='info@tawimeridian.com')
 CONTACT_EMAIL = env('CONTACT_EMAIL', default='info@tawimeridian.com')
 
+# Email outbox (see contact.outbox): transactional mail is queued and sent by
+# the send_queued_mail worker. Failed sends are retried after
+# RETRY_DELAY * 2^(attempts - 1) seconds (at most MAX_RETRY_DELAY) and marked
+# dead after MAX_ATTEMPTS.
+EMAIL_OUTBOX_MAX_ATTEMPTS = env.int('EMAIL_OUTBOX_MAX_ATTEMPTS', default=8)
+EMAIL_OUTBOX_RETRY_DELAY = env.int('EMAIL_OUTBOX_RETRY_DELAY', default=60)
+EMAIL_OUTBOX_MAX_RETRY_DELAY = env.int('EMAIL_OUTBOX_MAX_RETRY_DELAY', default=6 * 60 * 60)
+
 # Crispy Forms configuration
 CRISPY_ALLOWED_TEMPLATE_PACKS = 'bootstrap5'
 CRISPY_TEMPLATE_PACK = 'bootstrap5'
@@ -207,8 +300,13 @@ CONTENT_SECURITY_POLICY = {
 HONEYPOT_FIELD_NAME = 'website_url'
 HONEYPOT_VALUE = ''
 
-# Rate limiting (configure per view)
-RATELIMIT_ENABLE = True
+# Rate limiting (see core.ratelimit; limits are set per view and stored in
+# the database so all workers share them)
+RATELIMIT_ENABLE = env.bool('RATELIMIT_ENABLE', default=True)
+
+# Addresses of the reverse proxies (nginx) allowed to set X-Real-IP; requests
+# from anywhere else are identified by their connecting address
+TRUSTED_PROXIES = env.list('TRUSTED_PROXIES', default=['127.0.0.1', '::1'])
 
 # Site settings (used in context processor)
 SITE_NAME = 'Tawi Meridian'
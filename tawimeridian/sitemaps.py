@@ -1,16 +1,33 @@
 """
 Sitemap configuration for SEO.
 
-This module defines sitemaps for different sections of the site.
+This module defines sitemaps for different sections of the site and the
+cached view serving them at /sitemap.xml.
+
+The XML is rendered once and stored in the shared cache until a page-cache
+tag it depends on is purged: saving a service, case study or blog post
+purges its ``:list`` tag, and a scheduled post going live purges
+``sitemap``. Entries never outlive the next scheduled publish time.
 """
 
 from django.contrib.sitemaps import Sitemap
+from django.contrib.sitemaps.views import sitemap
+from django.http import HttpResponse
 from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import BlogPost
+from core.cache import CacheNamespace
+from core.page_cache import get_tag_versions, tags_are_current
+from core.publishing import cap_timeout
+from portfolio.models import CaseStudy
+from services.models import Service
+
+
+sitemap_cache = CacheNamespace('sitemaps', timeout=None)
 
-# Import models when apps are created
-# from services.models import Service
-# from portfolio.models import CaseStudy
-# from blog.models import BlogPost
+# Page-cache tags the sitemap depends on; purging any re-renders it
+SITEMAP_TAGS = ['sitemap', 'blogpost:list', 'casestudy:list', 'service:list']
 
 
 class StaticViewSitemap(Sitemap):
@@ -19,10 +36,81 @@ class StaticViewSitemap(Sitemap):
     changefreq = 'monthly'
 
     def items(self):
-        return ['home', 'about', 'services', 'portfolio', 'blog', 'contact']
+        return [
+            'core:home',
+            'core:about',
+            'services:service_list',
+            'portfolio:case_study_list',
+            'blog:blog_list',
+            'contact:contact',
+        ]
 
     def location(self, item):
         return reverse(item)
 
 
-# Additional sitemaps will be added in their respective apps
+class ServiceSitemap(Sitemap):
+    """Sitemap for active services."""
+    priority = 0.8
+    changefreq = 'monthly'
+
+    def items(self):
+        return Service.objects.filter(is_active=True).order_by('display_order', 'title')
+
+    def lastmod(self, obj):
+        return obj.updated_at
+
+
+class CaseStudySitemap(Sitemap):
+    """Sitemap for published case studies."""
+    priority = 0.7
+    changefreq = 'monthly'
+
+    def items(self):
+        return CaseStudy.objects.filter(published=True).order_by('-published_date', '-created_at')
+
+    def lastmod(self, obj):
+        return obj.updated_at
+
+
+class BlogPostSitemap(Sitemap):
+    """Sitemap for blog posts that are live."""
+    priority = 0.6
+    changefreq = 'weekly'
+
+    def items(self):
+        return BlogPost.objects.filter(
+            is_published=True,
+            published_date__lte=timezone.now()
+        ).order_by('-published_date', '-id')
+
+    def lastmod(self, obj):
+        return obj.updated_at
+
+
+sitemaps = {
+    'static': StaticViewSitemap,
+    'services': ServiceSitemap,
+    'portfolio': CaseStudySitemap,
+    'blog': BlogPostSitemap,
+}
+
+
+def cached_sitemap(request):
+    """Serve sitemap.xml from the shared cache, rendering it when a tag changes."""
+    key = (request.scheme, request.get_host())
+    entry = sitemap_cache.get(key)
+
+    if entry is None or not tags_are_current(entry['tags']):
+        # Read tag versions first so a change during rendering is not lost
+        tags = get_tag_versions(SITEMAP_TAGS)
+        response = sitemap(request, sitemaps)
+        response.render()
+        entry = {
+            'content': response.content,
+            'content_type': response['Content-Type'],
+            'tags': tags,
+        }
+        sitemap_cache.set(key, entry, cap_timeout(None))
+
+    return HttpResponse(entry['content'], content_type=entry['content_type'])
@@ -9,16 +9,8 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.views.generic import TemplateView
-from django.contrib.sitemaps.views import sitemap
 
-# Import sitemaps when created
-# from blog.sitemaps import BlogSitemap
-# from portfolio.sitemaps import PortfolioSitemap
-
-# sitemaps = {
-#     'blog': BlogSitemap,
-#     'portfolio': PortfolioSitemap,
-# }
+from .sitemaps import cached_sitemap
 
 urlpatterns = [
     # Admin
@@ -45,8 +37,8 @@ urlpatterns = [
     # Project Management
     path('project-management/', include('project_management.urls')),
     
-    # Sitemap (uncomment when sitemaps are created)
-    # path('sitemap.xml', sitemap, {'sitemaps': sitemaps}, name='django.contrib.sitemaps.views.sitemap'),
+    # Sitemap
+    path('sitemap.xml', cached_sitemap, name='sitemap'),
     
     # Robots.txt
     path('robots.txt', TemplateView.as_view(template_name='robots.txt', content_type='text/plain'), name='robots'),